@@ -0,0 +1,107 @@
+"""Throughput of OffsetTextSplitter against the original line splitter.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_text_splitter
+"""
+
+from src.helpers.text_splitter import OffsetTextSplitter
+import random
+import time
+
+TEXT_BYTES = 5_000_000
+REPEATS = 5
+
+
+def line_splitter(text: str, chunk_size: int, splitter_tag: str = "\n"):
+    # the splitter ProcessController used before OffsetTextSplitter
+    chunks = []
+    current_chunk = ""
+    for line in text.split(splitter_tag):
+        line = line.strip()
+        if line == "":
+            continue
+        current_chunk += line + splitter_tag
+        if len(current_chunk) >= chunk_size:
+            chunks.append(current_chunk.strip())
+            current_chunk = ""
+    if current_chunk:
+        chunks.append(current_chunk.strip())
+    return chunks
+
+
+def generate_text(line_words: int) -> str:
+    rng = random.Random(0)
+    words = [
+        "".join(rng.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(rng.randint(2, 10)))
+        for _ in range(5000)
+    ]
+    lines = []
+    size = 0
+    while size < TEXT_BYTES:
+        line = " ".join(rng.choice(words) for _ in range(rng.randint(1, line_words)))
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)
+
+
+def best_of(function, *args) -> tuple:
+    best = float("inf")
+    for _ in range(REPEATS):
+        started = time.perf_counter()
+        result = function(*args)
+        best = min(best, time.perf_counter() - started)
+    return best, len(result)
+
+
+def make_pages(text: str, page_size: int) -> list:
+    # whole lines per page, so feed() rejoining them with "\n" gives ``text``
+    pages = []
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start + page_size)
+        if end == -1:
+            end = len(text)
+        pages.append(text[start:end])
+        start = end + 1
+    return pages
+
+
+def split_streaming(pages: list, chunk_size: int, overlap_size: int):
+    splitter = OffsetTextSplitter(chunk_size, overlap_size=overlap_size)
+    chunks = []
+    for page in pages:
+        chunks.extend(splitter.feed(page))
+    chunks.extend(splitter.flush())
+    return chunks
+
+
+def main():
+    cases = [
+        ("short lines", generate_text(line_words=12)),
+        ("long lines", generate_text(line_words=400)),
+    ]
+    settings = [(100, 20), (1000, 200)]
+
+    print(f"{'text':<12} {'chunk/overlap':<14} {'splitter':<16} {'ms':>8} {'chunks':>8}")
+    for name, text in cases:
+        pages = make_pages(text, 4096)
+        for chunk_size, overlap_size in settings:
+            splitter = OffsetTextSplitter(chunk_size, overlap_size=overlap_size)
+            runs = [
+                ("line (old)", best_of(line_splitter, text, chunk_size)),
+                ("offset", best_of(splitter.split_text, text)),
+                (
+                    "offset, 4KB feed",
+                    best_of(split_streaming, pages, chunk_size, overlap_size),
+                ),
+            ]
+            for label, (seconds, chunks) in runs:
+                print(
+                    f"{name:<12} {f'{chunk_size}/{overlap_size}':<14} {label:<16} "
+                    f"{seconds * 1000:>8.1f} {chunks:>8}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+from .BaseController import BaseController
+from .ProcessController import ProcessController
+from src.models.ChunkModel import ChunkModel
+from src.helpers.extraction_executor import ExtractionExecutor
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import logging
+
+# marks the end of a stage's output on its queue
+_STAGE_DONE = object()
+
+
+class IngestController(BaseController):
+    """Streams a file through extract -> split -> persist stages.
+
+    Stages are connected by bounded queues, so at most ``queue_size`` pages
+    and ``queue_size`` chunk batches are in memory at any time, and inserts
+    of one batch overlap with parsing of the following pages.
+    """
+
+    def __init__(
+        self,
+        process_controller: ProcessController,
+        chunk_model: ChunkModel,
+        extraction_executor: ExtractionExecutor = None,
+        job_id: int = None,
+    ):
+        super().__init__()
+        self.process_controller = process_controller
+        self.chunk_model = chunk_model
+        self.extraction_executor = extraction_executor
+        self.job_id = job_id
+
+        self.queue_size = self.app_settings.INGEST_QUEUE_SIZE
+        self.batch_size = self.app_settings.INGEST_BATCH_SIZE
+
+        self.logger = logging.getLogger("uvicorn.error")
+
+    async def ingest_files(
+        self,
+        project_id: int,
+        project_files_ids: Dict[int, str],
+        chunk_size: int = 100,
+        overlap_size: int = 20,
+        min_chunk_size: int = 0,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+    ) -> dict:
+        no_records = 0
+        processed_files = 0
+        failed_files = []
+
+        for done, (asset_id, file_id) in enumerate(project_files_ids.items(), 1):
+            try:
+                inserted = await self.ingest_file(
+                    project_id,
+                    asset_id,
+                    file_id,
+                    chunk_size,
+                    overlap_size,
+                    min_chunk_size,
+                )
+
+                if inserted == 0:
+                    self.logger.error(
+                        f"Processing returned no chunks for file_id: {file_id}"
+                    )
+                    failed_files.append(file_id)
+                else:
+                    no_records += inserted
+                    processed_files += 1
+
+            except Exception as e:
+                self.logger.error(f"Error processing file_id {file_id}: {e}")
+                failed_files.append(file_id)
+
+            if on_progress is not None:
+                await on_progress(done, len(project_files_ids))
+
+        return {
+            "inserted_chunks": no_records,
+            "processed_files": processed_files,
+            "failed_files": failed_files,
+        }
+
+    async def ingest_file(
+        self,
+        project_id: int,
+        asset_id: int,
+        file_id: str,
+        chunk_size: int = 100,
+        overlap_size: int = 20,
+        min_chunk_size: int = 0,
+    ) -> int:
+        pages_queue = asyncio.Queue(maxsize=self.queue_size)
+        batches_queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async with asyncio.TaskGroup() as tg:
+            tg.create_task(self.extract_pages(file_id, pages_queue))
+            tg.create_task(
+                self.split_pages(
+                    pages_queue,
+                    batches_queue,
+                    project_id,
+                    asset_id,
+                    chunk_size,
+                    overlap_size,
+                    min_chunk_size,
+                )
+            )
+            persist_task = tg.create_task(self.persist_batches(batches_queue))
+
+        return persist_task.result()
+
+    async def extract_pages(self, file_id: str, pages_queue: asyncio.Queue):
+        async for page in self.process_controller.stream_file_pages(
+            file_id, self.extraction_executor
+        ):
+            await pages_queue.put(page)
+
+        await pages_queue.put(_STAGE_DONE)
+
+    async def split_pages(
+        self,
+        pages_queue: asyncio.Queue,
+        batches_queue: asyncio.Queue,
+        project_id: int,
+        asset_id: int,
+        chunk_size: int,
+        overlap_size: int,
+        min_chunk_size: int,
+    ):
+        splitter = self.process_controller.create_stream_splitter(
+            chunk_size, overlap_size, min_chunk_size
+        )
+        batch = []
+        order = 0
+
+        while True:
+            page = await pages_queue.get()
+            if page is _STAGE_DONE:
+                chunks = splitter.flush()
+            else:
+                chunks = splitter.feed(page.page_content)
+
+            for chunk_text in chunks:
+                order += 1
+                batch.append((chunk_text, {}, order, project_id, asset_id))
+                if len(batch) >= self.batch_size:
+                    await batches_queue.put(batch)
+                    batch = []
+
+            if page is _STAGE_DONE:
+                break
+
+        if batch:
+            await batches_queue.put(batch)
+
+        await batches_queue.put(_STAGE_DONE)
+
+    async def persist_batches(self, batches_queue: asyncio.Queue) -> int:
+        inserted = 0
+
+        while True:
+            batch = await batches_queue.get()
+            if batch is _STAGE_DONE:
+                break
+
+            chunk_ids = await self.chunk_model.insert_chunk_records(
+                batch, job_id=self.job_id
+            )
+            inserted += len(chunk_ids)
+
+        return inserted
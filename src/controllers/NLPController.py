@@ -1,11 +1,29 @@
 from .BaseController import BaseController
-from src.models.db_schemas import DataChunk, Project
+from src.models.db_schemas import DataChunk, Project, RetrievedDocument, SearchFilter
+from src.models.ChunkModel import ChunkModel
 from src.stores.vectorDB.VectorDBInterface import VectorDBInterface
+from src.stores.vectorDB.VectorDBEnums import SearchModeEnums
 from src.stores.LLM.LLMInterface import LLMInterface
+from src.stores.LLM.EmbeddingBatcher import EmbeddingBatcher
+from src.stores.LLM.AnswerCache import AnswerCache
+from src.stores.LLM.ContextPacker import ContextPacker
 from src.stores.LLM.LLMEnums import DocumentTypeEnums
 from src.stores.LLM.templates.template_parser import TemplateParser
-from typing import List
+from src.utils.hashing import text_hash
+from src.models import ResponseSignal
+from typing import (
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+import numpy as np
+import asyncio
 import json
+import logging
 
 
 class NLPController(BaseController):
@@ -15,6 +33,9 @@ class NLPController(BaseController):
         embedding_client: LLMInterface,
         generation_client: LLMInterface,
         template_parser: TemplateParser,
+        embedding_batcher: EmbeddingBatcher = None,
+        answer_cache: AnswerCache = None,
+        context_packer: ContextPacker = None,
     ):
         super().__init__()
 
@@ -22,6 +43,11 @@ class NLPController(BaseController):
         self.embedding_client = embedding_client
         self.generation_client = generation_client
         self.template_parser = template_parser
+        self.embedding_batcher = embedding_batcher
+        self.answer_cache = answer_cache
+        self.context_packer = context_packer
+
+        self.logger = logging.getLogger("uvicorn.error")
 
     def create_collection_name(self, project_id: int) -> str:
         return f"collection_{self.vector_db_client.default_vector_size}_{str(project_id)}".strip()
@@ -34,93 +60,659 @@ class NLPController(BaseController):
         collection_name = self.create_collection_name(str(project.id))
         return await self.vector_db_client.get_collection_info(collection_name)
 
+    async def push_project_index(
+        self,
+        project: Project,
+        chunk_model: ChunkModel,
+        do_reset: bool = False,
+        page_size: int = 500,
+        incremental: bool = False,
+        on_progress: Optional[Callable[[int, int], Awaitable[None]]] = None,
+        storage_mode: str = None,
+    ) -> Optional[dict]:
+        """Index every chunk of a project, returns None if an insert fails."""
+        collection_name = self.create_collection_name(str(project.id))
+
+        _ = await self.vector_db_client.create_collection(
+            collection_name,
+            self.embedding_client.embedding_size,
+            do_reset,
+            storage_mode=storage_mode,
+        )
+
+        chunks_count = await chunk_model.get_total_chunks_count(project.id)
+
+        inserted_count = 0
+        processed_count = 0
+        index_counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0}
+        indexed_chunk_ids = set()
+
+        async for chunks in chunk_model.iter_chunks_by_project(
+            project.id, page_size=page_size
+        ):
+            if incremental:
+                page_counts = await self.index_changed_into_vector_db(project, chunks)
+                is_inserted = page_counts is not None
+            else:
+                is_inserted = await self.index_into_vector_db(project, chunks)
+
+            if not is_inserted:
+                return None
+
+            if incremental:
+                for key, count in page_counts.items():
+                    index_counts[key] += count
+                indexed_chunk_ids.update(chunk.id for chunk in chunks)
+                inserted_count += page_counts["added"] + page_counts["updated"]
+            else:
+                inserted_count += len(chunks)
+
+            processed_count += len(chunks)
+            if on_progress is not None:
+                await on_progress(processed_count, chunks_count)
+
+        result = {"inserted_count": inserted_count}
+
+        if incremental:
+            index_counts["removed"] = await self.remove_stale_vectors(
+                project, indexed_chunk_ids
+            )
+            result["index_counts"] = index_counts
+
+        # pages are inserted with defer_index, build the index once at the end
+        _ = await self.vector_db_client.finalize_collection(collection_name)
+
+        return result
+
+    async def evaluate_recall(
+        self,
+        project: Project,
+        chunk_model: ChunkModel,
+        sample_size: int = 20,
+        k: int = 10,
+        ef_search: int = None,
+        probes: int = None,
+    ) -> Optional[dict]:
+        """Measure recall@k of the collection's search against exact search.
+
+        Query vectors are the embeddings of randomly sampled chunks, which
+        the embedding cache usually already holds from indexing.
+        """
+        collection_name = self.create_collection_name(str(project.id))
+
+        collection_info = await self.vector_db_client.get_collection_info(
+            collection_name
+        )
+        if collection_info is None:
+            return None
+
+        chunks = await chunk_model.get_random_chunks(project.id, sample_size)
+        if not chunks:
+            return None
+
+        vectors = await self.embedding_client.embed_text_async(
+            [chunk.text for chunk in chunks], DocumentTypeEnums.DOCUMENT.value
+        )
+        if not vectors:
+            return None
+
+        recalls = []
+        for vector in vectors:
+            approximate = await self.vector_db_client.search_by_vector(
+                collection_name, vector, k, ef_search=ef_search, probes=probes
+            )
+            exact = await self.vector_db_client.search_by_vector(
+                collection_name, vector, k, exact=True
+            )
+            if not exact:
+                continue
+
+            exact_ids = {document.record_id for document in exact}
+            found = sum(1 for document in approximate if document.record_id in exact_ids)
+            recalls.append(found / len(exact_ids))
+
+        return {
+            "storage_mode": collection_info.get("storage_mode"),
+            "memory": collection_info.get("memory"),
+            "k": k,
+            "queries": len(recalls),
+            "recall_at_k": round(sum(recalls) / len(recalls), 4) if recalls else None,
+        }
+
     async def index_into_vector_db(
         self,
         project: Project,
         chunks: List[DataChunk],
-        do_reset: bool = False,
     ):
         collection_name = self.create_collection_name(str(project.id))
 
+        return await self.embed_and_insert_chunks(collection_name, chunks)
+
+    async def index_changed_into_vector_db(
+        self,
+        project: Project,
+        chunks: List[DataChunk],
+    ):
+        """Embed and insert only chunks that are new or changed.
+
+        A chunk is unchanged when the collection already holds a vector for
+        its id with the same content hash and embedding model.
+        """
+        collection_name = self.create_collection_name(str(project.id))
+        embedding_model = self.embedding_client.embedding_model_id
+
+        fingerprints = await self.vector_db_client.get_record_fingerprints(
+            collection_name, [chunk.id for chunk in chunks]
+        )
+
+        index_counts = {"added": 0, "updated": 0, "unchanged": 0}
+        changed_chunks = []
+        updated_ids = []
+
+        for chunk in chunks:
+            fingerprint = fingerprints.get(chunk.id)
+            if fingerprint is None:
+                index_counts["added"] += 1
+            elif fingerprint == (self.get_chunk_hash(chunk), embedding_model):
+                index_counts["unchanged"] += 1
+                continue
+            else:
+                index_counts["updated"] += 1
+                updated_ids.append(chunk.id)
+
+            changed_chunks.append(chunk)
+
+        if not changed_chunks:
+            return index_counts
+
+        is_inserted = await self.embed_and_insert_chunks(
+            collection_name, changed_chunks, replace_ids=updated_ids
+        )
+        if not is_inserted:
+            return None
+
+        return index_counts
+
+    async def remove_stale_vectors(self, project: Project, chunk_ids: Iterable[int]):
+        collection_name = self.create_collection_name(str(project.id))
+
+        chunk_ids = set(chunk_ids)
+        indexed_ids = await self.vector_db_client.list_record_ids(collection_name)
+        stale_ids = [record_id for record_id in indexed_ids if record_id not in chunk_ids]
+
+        return await self.vector_db_client.delete_records(collection_name, stale_ids)
+
+    async def delete_vectors(self, project: Project, record_ids: List[int]) -> int:
+        collection_name = self.create_collection_name(str(project.id))
+        if not await self.vector_db_client.collection_exists(collection_name):
+            return 0
+
+        return await self.vector_db_client.delete_records(collection_name, record_ids)
+
+    async def embed_and_insert_chunks(
+        self,
+        collection_name: str,
+        chunks: List[DataChunk],
+        replace_ids: List[int] = None,
+    ):
         texts = [chunk.text for chunk in chunks]
         metadatas = [chunk.meta for chunk in chunks]
-        vectors = self.embedding_client.embed_text(
+        vectors = await self.embedding_client.embed_text_async(
             texts, DocumentTypeEnums.DOCUMENT.value
         )
 
-        _ = await self.vector_db_client.create_collection(
-            collection_name, self.embedding_client.embedding_size, do_reset
-        )
+        if not vectors:
+            return False
+
+        # old vectors are only dropped once their replacements exist
+        if replace_ids:
+            _ = await self.vector_db_client.delete_records(
+                collection_name, replace_ids
+            )
 
         record_ids = [(chunk.id) for chunk in chunks]
 
-        _ = await self.vector_db_client.insert_many(
+        return await self.vector_db_client.insert_many(
             collection_name,
             texts,
             vectors,
             metadatas,
             record_ids=record_ids,
             batch_size=100,
+            content_hashes=[self.get_chunk_hash(chunk) for chunk in chunks],
+            embedding_model=self.embedding_client.embedding_model_id,
+            defer_index=True,
+            asset_ids=[chunk.asset_id for chunk in chunks],
+            chunk_orders=[chunk.order for chunk in chunks],
         )
 
-        return True
+    def get_chunk_hash(self, chunk: DataChunk) -> str:
+        # chunks stored before content hashes existed have none
+        return chunk.content_hash or text_hash(chunk.text)
 
     async def search_vector_db_collection(
-        self, project: Project, text: str, limit: int = 5
+        self,
+        project: Project,
+        text: str,
+        limit: int = 5,
+        ef_search: int = None,
+        probes: int = None,
+        search_filter: SearchFilter = None,
+        mode: str = None,
+        query_vector: list = None,
+        mmr_lambda: float = None,
     ):
         collection_name = self.create_collection_name(str(project.id))
+        mode = mode or self.app_settings.VECTOR_DB_SEARCH_MODE
+        if mmr_lambda is None:
+            mmr_lambda = self.app_settings.VECTOR_DB_MMR_LAMBDA
 
-        vectors = self.embedding_client.embed_text(text, DocumentTypeEnums.QUERY.value)
+        # lexical hits carry no vectors to compare
+        diversify = mmr_lambda < 1 and mode != SearchModeEnums.LEXICAL.value
+        fetch_limit = limit
+        if diversify:
+            fetch_limit = limit * max(self.app_settings.VECTOR_DB_MMR_CANDIDATES, 1)
+            # MMR measures relevance against the query vector too
+            query_vector = query_vector or await self.embed_query(text)
+            if not query_vector:
+                return False
 
-        if not vectors:
+        if mode == SearchModeEnums.LEXICAL.value:
+            results = await self.vector_db_client.search_by_text(
+                collection_name, text, limit=limit, search_filter=search_filter
+            )
+        elif mode == SearchModeEnums.HYBRID.value:
+            # both sides over-fetch, so documents ranked just below the
+            # cut-off on one side can still be lifted by the other
+            candidates = fetch_limit * max(
+                self.app_settings.VECTOR_DB_HYBRID_CANDIDATES, 1
+            )
+            vector_results, text_results = await asyncio.gather(
+                self.search_by_query_vector(
+                    collection_name,
+                    text,
+                    candidates,
+                    ef_search=ef_search,
+                    probes=probes,
+                    search_filter=search_filter,
+                    query_vector=query_vector,
+                    with_vectors=diversify,
+                ),
+                self.vector_db_client.search_by_text(
+                    collection_name,
+                    text,
+                    limit=candidates,
+                    search_filter=search_filter,
+                ),
+            )
+            if vector_results is None:
+                return False
+            # vector hits come first, so fused documents keep their vectors
+            results = self.fuse_rankings(
+                [vector_results, text_results], fetch_limit
+            )
+        else:
+            results = await self.search_by_query_vector(
+                collection_name,
+                text,
+                fetch_limit,
+                ef_search=ef_search,
+                probes=probes,
+                search_filter=search_filter,
+                query_vector=query_vector,
+                with_vectors=diversify,
+            )
+
+        if not results:
             return False
 
-        query_vector = None
+        if diversify:
+            results = self.diversify_results(results, query_vector, limit, mmr_lambda)
 
-        if isinstance(vectors, list) and len(vectors) > 0:
-            query_vector = vectors[0]
+        return results
+
+    async def search_by_query_vector(
+        self,
+        collection_name: str,
+        text: str,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        search_filter: SearchFilter = None,
+        query_vector: list = None,
+        with_vectors: bool = False,
+    ) -> Optional[List[RetrievedDocument]]:
+        query_vector = query_vector or await self.embed_query(text)
 
         if not query_vector:
+            return None
+
+        return await self.vector_db_client.search_by_vector(
+            collection_name,
+            query_vector,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            search_filter=search_filter,
+            with_vectors=with_vectors,
+        )
+
+    def fuse_rankings(
+        self, rankings: List[List[RetrievedDocument]], limit: int
+    ) -> List[RetrievedDocument]:
+        """Reciprocal rank fusion: each ranking adds 1 / (k + rank) per document.
+
+        Only ranks are used, so cosine similarities and BM25 scores never
+        have to be put on a common scale.
+        """
+        rrf_k = self.app_settings.VECTOR_DB_RRF_K
+        fused = {}
+        for ranking in rankings:
+            for rank, document in enumerate(ranking, start=1):
+                key = document.record_id
+                if key is None:
+                    key = document.text
+                # the first ranking's copy is kept, with its vector if any
+                score, document = fused.get(key, (0.0, document))
+                fused[key] = (score + 1.0 / (rrf_k + rank), document)
+
+        ranked = sorted(fused.values(), key=lambda item: item[0], reverse=True)
+        return [
+            document.model_copy(update={"score": score})
+            for score, document in ranked[:limit]
+        ]
+
+    @staticmethod
+    def diversify_results(
+        documents: List[RetrievedDocument],
+        query_vector: list,
+        limit: int,
+        mmr_lambda: float,
+    ) -> List[RetrievedDocument]:
+        """Maximal marginal relevance: pick ``limit`` relevant, dissimilar documents.
+
+        Each pick maximizes ``mmr_lambda * relevance - (1 - mmr_lambda) *
+        redundancy``: the cosine similarity to the query minus the highest
+        one to an already picked document. Documents without a vector
+        (lexical-only hybrid hits) are left out of MMR and keep the places
+        they hold in the top ``limit`` of the input ranking; MMR fills the
+        others. Vectors are dropped from the results.
+        """
+        dimension = len(query_vector)
+        has_vector = [
+            bool(doc.vector) and len(doc.vector) == dimension for doc in documents
+        ]
+        ranked = [doc.model_copy(update={"vector": None}) for doc in documents]
+
+        candidates = [row for row, flag in enumerate(has_vector) if flag]
+        free_slots = sum(has_vector[:limit])
+        if len(candidates) <= 1 or not free_slots:
+            return ranked[:limit]
+
+        matrix = np.asarray(
+            [query_vector] + [documents[row].vector for row in candidates],
+            dtype=np.float32,
+        )
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+        relevance = matrix[1:] @ matrix[0]
+        similarity = matrix[1:] @ matrix[1:].T
+
+        redundancy = np.zeros(len(candidates), dtype=np.float32)
+        available = np.ones(len(candidates), dtype=bool)
+        selected = []
+        for _ in range(min(free_slots, len(candidates))):
+            gains = mmr_lambda * relevance - (1 - mmr_lambda) * redundancy
+            gains[~available] = -np.inf
+            best = int(np.argmax(gains))
+            selected.append(candidates[best])
+            available[best] = False
+            redundancy = np.maximum(redundancy, similarity[best])
+
+        # lexical-only hits stay at their ranks, MMR picks fill the rest
+        picks = iter(selected)
+        return [
+            ranked[next(picks)] if flag else ranked[row]
+            for row, flag in enumerate(has_vector[:limit])
+        ]
+
+    async def search_vector_db_collection_batch(
+        self,
+        project: Project,
+        texts: List[str],
+        limit: int = 5,
+        ef_search: int = None,
+        probes: int = None,
+        search_filter: SearchFilter = None,
+    ):
+        """Search many queries with one embedding call and one vector DB query."""
+        collection_name = self.create_collection_name(str(project.id))
+
+        query_vectors = await self.embedding_client.embed_text_async(
+            texts, DocumentTypeEnums.QUERY.value
+        )
+        if not query_vectors or len(query_vectors) != len(texts):
             return False
 
-        results = await self.vector_db_client.search_by_vector(
-            collection_name, query_vector, limit=limit
+        results = await self.vector_db_client.search_by_vectors(
+            collection_name,
+            query_vectors,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            search_filter=search_filter,
         )
-        if not results:
+        if len(results) != len(texts):
             return False
 
         return results
 
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 5):
+    async def embed_query(self, text: str):
+        if self.embedding_batcher:
+            return await self.embedding_batcher.embed(
+                text, DocumentTypeEnums.QUERY.value
+            )
+
+        vectors = await self.embedding_client.embed_text_async(
+            text, DocumentTypeEnums.QUERY.value
+        )
+
+        if not vectors or not isinstance(vectors, list):
+            return None
+
+        return vectors[0]
 
-        retrieved_docs = await self.search_vector_db_collection(project, query, limit)
+    async def answer_rag_question(
+        self,
+        project: Project,
+        query: str,
+        limit: int = 5,
+        search_filter: SearchFilter = None,
+        mode: str = None,
+        mmr_lambda: float = None,
+    ):
+        if self.answer_cache is not None:
+            return await self.answer_rag_question_cached(
+                project,
+                query,
+                limit,
+                search_filter=search_filter,
+                mode=mode,
+                mmr_lambda=mmr_lambda,
+            )
+
+        return await self.generate_rag_answer(
+            project,
+            query,
+            limit,
+            search_filter=search_filter,
+            mode=mode,
+            mmr_lambda=mmr_lambda,
+        )
+
+    async def generate_rag_answer(
+        self,
+        project: Project,
+        query: str,
+        limit: int = 5,
+        search_filter: SearchFilter = None,
+        mode: str = None,
+        query_vector: list = None,
+        mmr_lambda: float = None,
+    ):
+        retrieved_docs = await self.search_vector_db_collection(
+            project,
+            query,
+            limit,
+            search_filter=search_filter,
+            mode=mode,
+            query_vector=query_vector,
+            mmr_lambda=mmr_lambda,
+        )
         if not retrieved_docs:
             return None, None, None
 
-        system_prompt = self.template_parser.get("rag", "system_prompt", {})
+        retrieved_docs = await self.pack_context(retrieved_docs)
+        full_prompt, chat_history = self.build_rag_prompt(query, retrieved_docs)
+
+        answer = await self.generation_client.generate_text_async(
+            full_prompt, chat_history, 512, 0.1
+        )
+
+        return answer, full_prompt, chat_history
+
+    async def answer_rag_question_cached(
+        self,
+        project: Project,
+        query: str,
+        limit: int = 5,
+        search_filter: SearchFilter = None,
+        mode: str = None,
+        mmr_lambda: float = None,
+    ):
+        """``answer_rag_question`` through the answer cache.
 
-        """ document_prompt = []
-        for idx, doc in enumerate(retrieved_docs):
-            document_prompt.append(
-                self.template_parser.get(
-                    "rag",
-                    "document_prompt",
-                    {"doc_num": idx + 1, "content": doc.text},
-                )
-            ) """
+        Only answers produced with the same search parameters are reused; the
+        query embedding computed for the similarity lookup is reused for
+        retrieval. Only the answer text is cached, the prompt holds the query
+        it was generated for, so cache hits return no prompt fields.
+        """
+        index_version = project.index_version or 0
+        scope = json.dumps(
+            {
+                "limit": limit,
+                "filter": search_filter.model_dump() if search_filter else None,
+                "mode": mode or self.app_settings.VECTOR_DB_SEARCH_MODE,
+                "mmr_lambda": (
+                    self.app_settings.VECTOR_DB_MMR_LAMBDA
+                    if mmr_lambda is None
+                    else mmr_lambda
+                ),
+            },
+            sort_keys=True,
+        )
+
+        # the prompt of an answer generated by this call
+        generated = {}
+
+        async def load():
+            query_vector = await self.embed_query(query)
+
+            cached = self.answer_cache.get_similar(
+                project.id, index_version, scope, query_vector
+            )
+            if cached is not None:
+                return cached, None
+
+            answer, full_prompt, chat_history = await self.generate_rag_answer(
+                project,
+                query,
+                limit,
+                search_filter=search_filter,
+                mode=mode,
+                query_vector=query_vector,
+                mmr_lambda=mmr_lambda,
+            )
+            if answer is None:
+                return None, None
+            generated["prompt"] = (full_prompt, chat_history)
+            return answer, query_vector
+
+        answer = await self.answer_cache.get_or_load(
+            project.id, index_version, scope, query, load
+        )
+        if answer is None:
+            return None, None, None
+
+        full_prompt, chat_history = generated.get("prompt", (None, None))
+        return answer, full_prompt, chat_history
+
+    async def stream_rag_answer(
+        self, query: str, retrieved_docs: List[RetrievedDocument]
+    ) -> AsyncIterator[Tuple[str, dict]]:
+        """Yield (event, data) pairs: documents, tokens, then done or error."""
+        retrieved_docs = await self.pack_context(retrieved_docs)
+        full_prompt, chat_history = self.build_rag_prompt(query, retrieved_docs)
+
+        # sent before generation starts, so clients can show sources at once
+        yield "documents", {
+            "documents": [
+                {"record_id": doc.record_id, "score": doc.score}
+                for doc in retrieved_docs
+            ]
+        }
+
+        generated = False
+        try:
+            async for piece in self.generation_client.generate_text_stream(
+                full_prompt, chat_history, 512, 0.1
+            ):
+                generated = True
+                yield "token", {"text": piece}
+        except Exception as e:
+            # headers are sent already, a timeout or API error mid-answer can
+            # only be reported as an event; the tokens so far are incomplete
+            self.logger.error(f"Error streaming the answer: {e!r}")
+            generated = False
+
+        if not generated:
+            signal = ResponseSignal.RAG_ANSWER_GENERATION_ERROR.value
+            yield "error", {"signal": signal}
+            return
+
+        yield "done", {"signal": ResponseSignal.RAG_ANSWER_GENERATION_SUCCESS.value}
+
+    async def pack_context(
+        self, retrieved_docs: List[RetrievedDocument]
+    ) -> List[RetrievedDocument]:
+        """The documents that go into the prompt, trimmed to the token budget."""
+        if self.context_packer is not None:
+            return await self.context_packer.pack(retrieved_docs)
+
+        return [
+            doc.model_copy(
+                update={"text": self.generation_client.process_text(doc.text)}
+            )
+            for doc in retrieved_docs
+        ]
+
+    def build_rag_prompt(
+        self, query: str, retrieved_docs: List[RetrievedDocument]
+    ) -> Tuple[str, list]:
+        system_prompt = self.template_parser.get("rag", "system_prompt", {})
 
         document_prompt = "\n".join(
-            [
-                self.template_parser.get(
-                    "rag",
-                    "document_prompt",
+            self.template_parser.render_many(
+                "rag",
+                "document_prompt",
+                [
                     {
                         "doc_num": idx + 1,
-                        "content": self.generation_client.process_text(doc.text),
-                    },
-                )
-                for idx, doc in enumerate(retrieved_docs)
-            ]
+                        "content": doc.text,
+                    }
+                    for idx, doc in enumerate(retrieved_docs)
+                ],
+            )
         )
 
         footer_prompt = self.template_parser.get(
@@ -133,10 +725,6 @@ class NLPController(BaseController):
             )
         ]
 
-        full_prompt = "\n\n".join({document_prompt, footer_prompt})
+        full_prompt = "\n\n".join([document_prompt, footer_prompt])
 
-        answer = self.generation_client.generate_text(
-            full_prompt, chat_history, 512, 0.1
-        )
-
-        return answer, full_prompt, chat_history
+        return full_prompt, chat_history
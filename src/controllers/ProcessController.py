@@ -1,9 +1,11 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
 from src.models import ProcessingEnum
-from langchain_community.document_loaders import TextLoader
+from src.helpers.extraction_executor import ExtractionExecutor
+from src.helpers.text_splitter import OffsetTextSplitter
 from langchain_community.document_loaders import PyMuPDFLoader
-from typing import List
+from typing import AsyncIterator, Iterator
+import asyncio
 import os
 
 from dataclasses import dataclass
@@ -24,76 +26,53 @@ class ProcessController(BaseController):
     def get_file_extension(self, file_id: str) -> str:
         return os.path.splitext(file_id)[-1]
 
-    def get_file_loader(self, file_id: str):
+    def iter_file_pages(self, file_id: str) -> Iterator[Document]:
         file_extension = self.get_file_extension(file_id)
         file_path = os.path.join(self.project_path, file_id)
 
         if not os.path.exists(file_path):
-            return None
+            return
 
         if file_extension == ProcessingEnum.TXT.value:
-            return TextLoader(file_path, encoding="utf-8")
+            # read newline-aligned blocks instead of the whole file
+            block_size = self.app_settings.INGEST_TEXT_BLOCK_SIZE
+            with open(file_path, "r", encoding="utf-8") as f:
+                while lines := f.readlines(block_size):
+                    yield Document(
+                        page_content="".join(lines), metadata={"source": file_path}
+                    )
 
         elif file_extension == ProcessingEnum.PDF.value:
-            return PyMuPDFLoader(file_path)
+            yield from PyMuPDFLoader(file_path).lazy_load()
 
-        else:
-            return None
-
-    def get_file_content(self, file_id: str):
-        loader = self.get_file_loader(file_id)
-        if loader:
-            documents = loader.load()
-            return documents
-        else:
-            return None
-
-    def process_file_content(
-        self,
-        file_content: list,
-        file_id: str,
-        chunk_size: int = 100,
-        overlap_size: int = 20,
-    ):
-
-        file_content_texts = [rec.page_content for rec in file_content]
-
-        file_content_metadata = [rec.metadata for rec in file_content]
-
-        """ chunks = text_splitter.create_documents(
-            file_content_texts, metadatas=file_content_metadata
-        ) """
+    async def stream_file_pages(
+        self, file_id: str, extraction_executor: ExtractionExecutor = None
+    ) -> AsyncIterator[Document]:
+        file_extension = self.get_file_extension(file_id)
+        file_path = os.path.join(self.project_path, file_id)
 
-        chunks = self.process_simpler_splitter(
-            file_content_texts, file_content_metadata, chunk_size
+        if (
+            extraction_executor is not None
+            and file_extension == ProcessingEnum.PDF.value
+            and os.path.exists(file_path)
+        ):
+            async for page_content, metadata in extraction_executor.iter_pdf_pages(
+                file_path
+            ):
+                yield Document(page_content=page_content, metadata=metadata)
+            return
+
+        pages = self.iter_file_pages(file_id)
+        while True:
+            # the loaders are blocking, pull each page from a worker thread
+            page = await asyncio.to_thread(next, pages, None)
+            if page is None:
+                break
+            yield page
+
+    def create_stream_splitter(
+        self, chunk_size: int = 100, overlap_size: int = 20, min_chunk_size: int = 0
+    ) -> OffsetTextSplitter:
+        return OffsetTextSplitter(
+            chunk_size, overlap_size=overlap_size, min_chunk_size=min_chunk_size
         )
-
-        return chunks
-
-    def process_simpler_splitter(
-        self,
-        texts: List[str],
-        metadatas: List[dict],
-        chunk_size: int,
-        splitter_tag: str = "\n",
-    ):
-        full_text = " ".join(texts)
-
-        lines = [
-            doc.strip() for doc in full_text.split(splitter_tag) if doc.strip() != ""
-        ]
-
-        chunks = []
-        current_chunk = ""
-
-        for line in lines:
-            current_chunk += line + splitter_tag
-            if len(current_chunk) >= chunk_size:
-                chunks.append(Document(page_content=current_chunk.strip(), metadata={}))
-                current_chunk = ""
-
-        if len(current_chunk) > 0:
-            chunks.append(Document(page_content=current_chunk.strip(), metadata={}))
-            current_chunk = ""
-
-        return chunks
@@ -2,3 +2,4 @@ from .dataController import DataController
 from .ProjectController import ProjectController
 from .ProcessController import ProcessController
 from .NLPController import NLPController
+from .IngestController import IngestController
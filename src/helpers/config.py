@@ -25,6 +25,13 @@ class Settings(BaseSettings):
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
 
+    INGEST_QUEUE_SIZE: int = 8
+    INGEST_BATCH_SIZE: int = 2000
+    INGEST_TEXT_BLOCK_SIZE: int = 1048576
+
+    EXTRACTION_MAX_WORKERS: int = 4
+    EXTRACTION_PAGES_PER_TASK: int = 16
+
     GENERATION_BACKEND: str = None
     EMBEDDING_BACKEND: str = None
 
@@ -36,6 +43,31 @@ class Settings(BaseSettings):
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
 
+    GENERATION_CONTEXT_MAX_TOKENS: int = 2000
+    GENERATION_CONTEXT_DEDUP_SIMILARITY: float = 0.85
+
+    LLM_MAX_CONCURRENCY: int = 16
+    LLM_REQUEST_TIMEOUT: float = 60
+
+    EMBEDDING_CACHE_ENABLED: bool = True
+    EMBEDDING_CACHE_PATH: str = "embedding_cache"
+    EMBEDDING_CACHE_MAX_MEMORY_ENTRIES: int = 50000
+
+    EMBEDDING_BATCH_ENABLED: bool = True
+    EMBEDDING_BATCH_MAX_WAIT_MS: float = 5
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_TTL_SECONDS: float = 3600
+    ANSWER_CACHE_MAX_ENTRIES: int = 256
+    ANSWER_CACHE_SIMILARITY: float = 0.95
+
+    JOB_WORKER_CONCURRENCY: int = 1
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_HEARTBEAT_INTERVAL: float = 15
+    JOB_STALE_AFTER: int = 120
+    JOB_MAX_ATTEMPTS: int = 3
+
     OPENAI_API_KEY: str = None
     OPENAI_API_URL: str = None
     COHERE_API_KEY: str = None
@@ -44,6 +76,27 @@ class Settings(BaseSettings):
     VECTOR_DB_PATH: str = None
     VECTOR_DB_DISTANCE_METHOD: str = None
     VECTOR_DB_PGVEC_INDEX_THRSHOLD: int = None
+    VECTOR_DB_REGISTRY_TTL: float = 30
+    VECTOR_DB_STORAGE_MODE: str = "float32"
+    VECTOR_DB_RESCORE_OVERSAMPLING: float = 4
+    VECTOR_DB_PGVEC_HNSW_EF_SEARCH: int = 40
+    VECTOR_DB_PGVEC_IVFFLAT_PROBES: int = 10
+    VECTOR_DB_QDRANT_URL: str = ""
+    VECTOR_DB_QDRANT_HNSW_EF: int = 128
+    VECTOR_DB_QDRANT_UPLOAD_PARALLEL: int = 4
+    VECTOR_DB_EMBEDDED_PROBES: int = 10
+    VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG: str = "simple"
+    VECTOR_DB_PGVEC_HNSW_THRESHOLD: int = 50000
+    VECTOR_DB_PGVEC_HNSW_M: int = 16
+    VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_PGVEC_REBUILD_GROWTH: float = 2
+    VECTOR_DB_PGVEC_MAINTENANCE_WORKERS: int = 2
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: str = "512MB"
+    VECTOR_DB_SEARCH_MODE: str = "vector"
+    VECTOR_DB_HYBRID_CANDIDATES: int = 4
+    VECTOR_DB_RRF_K: int = 60
+    VECTOR_DB_MMR_LAMBDA: float = 0.7
+    VECTOR_DB_MMR_CANDIDATES: int = 4
 
     PRIMARY_LANGUAGE: str = "en"
     DEFAULT_LANGUAGE: str = "en"
@@ -0,0 +1,99 @@
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from typing import AsyncIterator, List, Tuple
+import asyncio
+import multiprocessing
+import pymupdf
+
+
+def count_pdf_pages(file_path: str) -> int:
+    with pymupdf.open(file_path) as document:
+        return document.page_count
+
+
+def extract_pdf_page_range(
+    file_path: str, start: int, end: int
+) -> List[Tuple[str, dict]]:
+    # runs inside a pool worker, returns plain tuples so results pickle cheaply
+    pages = []
+    with pymupdf.open(file_path) as document:
+        total_pages = document.page_count
+        for page_number in range(start, end):
+            pages.append(
+                (
+                    document[page_number].get_text(),
+                    {
+                        "source": file_path,
+                        "page": page_number,
+                        "total_pages": total_pages,
+                    },
+                )
+            )
+    return pages
+
+
+class ExtractionExecutor:
+    """Parses documents in a process pool so the event loop stays free.
+
+    PDFs are split into ranges of ``pages_per_task`` pages that are parsed in
+    parallel; at most ``max_pending_tasks`` ranges are in flight per file and
+    pages are yielded back in document order.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        pages_per_task: int = 16,
+        max_pending_tasks: int = None,
+    ):
+        self.max_workers = max_workers
+        self.pages_per_task = pages_per_task
+        self.max_pending_tasks = max_pending_tasks or max_workers * 2
+
+        # spawn instead of fork, the API process already runs threads
+        self.pool = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    async def iter_pdf_pages(self, file_path: str) -> AsyncIterator[Tuple[str, dict]]:
+        loop = asyncio.get_running_loop()
+
+        total_pages = await loop.run_in_executor(self.pool, count_pdf_pages, file_path)
+
+        page_ranges = iter(
+            [
+                (start, min(start + self.pages_per_task, total_pages))
+                for start in range(0, total_pages, self.pages_per_task)
+            ]
+        )
+
+        pending = deque()
+
+        def submit_next() -> bool:
+            page_range = next(page_ranges, None)
+            if page_range is None:
+                return False
+            pending.append(
+                loop.run_in_executor(
+                    self.pool, extract_pdf_page_range, file_path, *page_range
+                )
+            )
+            return True
+
+        try:
+            while len(pending) < self.max_pending_tasks and submit_next():
+                pass
+
+            while pending:
+                pages = await pending.popleft()
+                submit_next()
+
+                for page in pages:
+                    yield page
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,91 @@
+from src.helpers.config import Settings
+from src.controllers.BaseController import BaseController
+from src.stores.LLM.LLMProviderFactory import LLMProviderFactory
+from src.stores.vectorDB.VectorDBProviderFactory import VectorDBProviderFactory
+from src.stores.LLM.templates.template_parser import TemplateParser
+from src.stores.LLM.EmbeddingBatcher import EmbeddingBatcher
+from src.stores.LLM.AnswerCache import AnswerCache
+from src.stores.LLM.ContextPacker import ContextPacker
+from src.models.ChunkModel import ChunkModel
+from src.utils.tokens import TokenCounter
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+
+async def setup_resources(container, settings: Settings):
+    """Attach db, vector db and LLM clients to ``container``.
+
+    Shared by the API app and the job workers so both talk to the same
+    backends with the same configuration.
+    """
+    postgres_url = f"postgresql+asyncpg://{settings.POSGRES_USERNAME}:{settings.POSGRES_PASSWORD}@{settings.POSGRES_HOST}:{settings.POSGRES_PORT}/{settings.POSGRES_MAIN_DB}"
+
+    container.db_engine = create_async_engine(postgres_url)
+
+    container.db_client = sessionmaker(
+        container.db_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    print("Connected to the PostgreSQL database!")
+
+    llm_provider_factory = LLMProviderFactory(settings)
+    vector_db_provider_factory = VectorDBProviderFactory(
+        settings, db_client=container.db_client
+    )
+
+    container.generation_client = llm_provider_factory.create(
+        settings.GENERATION_BACKEND
+    )
+    container.generation_client.set_generation_model(settings.GENERATION_MODEL_ID)
+
+    container.embedding_client = llm_provider_factory.create(settings.EMBEDDING_BACKEND)
+    container.embedding_client.set_embedding_model(
+        settings.EMBEDDING_MODEL_ID, settings.EMBEDDING_MODEL_SIZE
+    )
+    if settings.EMBEDDING_CACHE_ENABLED:
+        container.embedding_client = llm_provider_factory.with_embedding_cache(
+            container.embedding_client,
+            BaseController().get_database_path(settings.EMBEDDING_CACHE_PATH),
+        )
+
+    container.embedding_batcher = None
+    if settings.EMBEDDING_BATCH_ENABLED:
+        container.embedding_batcher = EmbeddingBatcher(
+            container.embedding_client,
+            max_wait_ms=settings.EMBEDDING_BATCH_MAX_WAIT_MS,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+        )
+
+    container.answer_cache = None
+    if settings.ANSWER_CACHE_ENABLED:
+        container.answer_cache = AnswerCache(
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            max_entries_per_project=settings.ANSWER_CACHE_MAX_ENTRIES,
+            similarity_threshold=settings.ANSWER_CACHE_SIMILARITY,
+        )
+
+    container.context_packer = None
+    if settings.GENERATION_CONTEXT_MAX_TOKENS > 0:
+        container.context_packer = ContextPacker(
+            TokenCounter(settings.GENERATION_MODEL_ID),
+            chunk_model=ChunkModel(container.db_client),
+            max_tokens=settings.GENERATION_CONTEXT_MAX_TOKENS,
+            dedup_similarity=settings.GENERATION_CONTEXT_DEDUP_SIMILARITY,
+        )
+
+    # vector db client
+    container.vector_db_client = vector_db_provider_factory.create(
+        settings.VECTOR_DB_BACKEND
+    )
+    print("Vector DB Client created!" + settings.VECTOR_DB_BACKEND)
+
+    await container.vector_db_client.connect()
+
+    container.template_parser = TemplateParser(
+        language=settings.PRIMARY_LANGUAGE, default_language=settings.DEFAULT_LANGUAGE
+    )
+
+
+async def close_resources(container):
+    await container.db_engine.dispose()
+    print("PostgreSQL connection closed!")
+    await container.vector_db_client.disconnect()
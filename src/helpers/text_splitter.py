@@ -0,0 +1,127 @@
+from typing import List, Tuple
+
+
+class OffsetTextSplitter:
+    """Splits text by computing (start, end) offsets instead of concatenating.
+
+    A chunk ends at the last ``splitter_tag`` (or space) between half of
+    ``chunk_size`` and ``chunk_size`` characters. The next chunk starts about
+    ``overlap_size`` characters before the previous end, on a word boundary,
+    and each chunk is sliced out of the source text exactly once.
+
+    ``feed`` / ``flush`` let callers stream text page by page, joined by
+    ``splitter_tag``, with the same chunks ``split_text`` gives for the joined
+    text; only the tail that has not been emitted yet is kept between calls.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        overlap_size: int = 0,
+        min_chunk_size: int = 0,
+        splitter_tag: str = "\n",
+    ):
+        self.chunk_size = max(chunk_size, 1)
+        self.overlap_size = min(max(overlap_size, 0), self.chunk_size - 1)
+        self.min_chunk_size = max(min_chunk_size, 0)
+        self.splitter_tag = splitter_tag
+
+        self.buffer = None
+
+    def compute_boundaries(
+        self, text: str, final: bool = True
+    ) -> List[Tuple[int, int]]:
+        boundaries = []
+        text_length = len(text)
+
+        chunk_size = self.chunk_size
+        overlap_size = self.overlap_size
+        splitter_tag = self.splitter_tag
+        # breaks are only taken past half a chunk and past the overlap, so a
+        # chunk never ends up made of little more than the previous one's tail
+        min_break = max(chunk_size // 2, overlap_size + 1)
+        rfind = text.rfind
+        find = text.find
+
+        # helpers are inlined, this loop runs once per chunk on multi-MB text
+        start = 0
+        while start < text_length and text[start].isspace():
+            start += 1
+
+        while start < text_length:
+            end = start + chunk_size
+
+            if end >= text_length:
+                if not final:
+                    # the last window may still grow with the next feed
+                    break
+                end = text_length
+            else:
+                # prefer a line break, then a word break, before cutting mid-word
+                position = rfind(splitter_tag, start + min_break, end)
+                if position == -1:
+                    position = rfind(" ", start + min_break, end)
+                if position != -1:
+                    end = position + 1
+
+            chunk_end = end
+            while chunk_end > start and text[chunk_end - 1].isspace():
+                chunk_end -= 1
+            if chunk_end > start:
+                boundaries.append((start, chunk_end))
+
+            if end >= text_length:
+                break
+
+            next_start = end
+            if overlap_size:
+                next_start = max(end - overlap_size, start + 1)
+
+                if not text[next_start - 1].isspace():
+                    # mid-word: move on to the next word of the overlap, or
+                    # back to the start of this one when it runs to ``end``
+                    position = find(" ", next_start, end - 1)
+                    if position == -1:
+                        position = rfind(
+                            " ", max(start + 1, end - 2 * overlap_size), next_start
+                        )
+                    next_start = position + 1 if position != -1 else end
+
+            start = next_start
+            while start < text_length and text[start].isspace():
+                start += 1
+
+        if final and self.min_chunk_size and len(boundaries) > 1:
+            last_start, last_end = boundaries[-1]
+            previous_start, previous_end = boundaries[-2]
+            if last_end - previous_end < self.min_chunk_size:
+                boundaries[-2:] = [(previous_start, last_end)]
+
+        return boundaries
+
+    def split_text(self, text: str) -> List[str]:
+        return [text[start:end] for start, end in self.compute_boundaries(text)]
+
+    def feed(self, text: str) -> List[str]:
+        buffer = text if self.buffer is None else self.buffer + self.splitter_tag + text
+
+        boundaries = self.compute_boundaries(buffer, final=False)
+        if len(boundaries) < 2:
+            self.buffer = buffer
+            return []
+
+        # hold the last two chunks back, so flush() sees the same final pair
+        # split_text() would merge a tiny tail into
+        held_start, _ = boundaries[-2]
+        self.buffer = buffer[held_start:]
+
+        return [buffer[start:end] for start, end in boundaries[:-2]]
+
+    def flush(self) -> List[str]:
+        buffer = self.buffer
+        self.buffer = None
+
+        if buffer is None:
+            return []
+
+        return self.split_text(buffer)
@@ -6,7 +6,11 @@ from pymongo import InsertOne
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.future import select
 from sqlalchemy import func, delete
-from typing import List
+from sqlalchemy.sql import text as sql_text
+from typing import AsyncIterator, Dict, List, Tuple
+from src.utils.hashing import text_hash
+import json
+import uuid
 
 
 class ChunkModel(BaseDataModel):
@@ -35,16 +39,65 @@ class ChunkModel(BaseDataModel):
 
         return chunk
 
-    async def insert_many_chunks(self, chunks: List[DataChunk], batch_size: int = 100):
+    async def insert_chunk_records(
+        self, records: List[Tuple[str, dict, int, int, int]], job_id: int = None
+    ) -> List[int]:
+        """Bulk insert (text, meta, order, project_id, asset_id) tuples.
+
+        Ids are reserved from the chunks sequence up front and the rows are
+        streamed with a binary COPY, skipping ORM objects entirely. Rows are
+        tagged with ``job_id`` when a job writes them.
+        """
+        if not records:
+            return []
 
         async with self.db_client() as session:
             async with session.begin():
-                for i in range(0, len(chunks), batch_size):
-                    batch = chunks[i : i + batch_size]
-                    session.add_all(batch)
+                ids_sql = sql_text(
+                    "SELECT nextval(pg_get_serial_sequence(:table_name, 'id')) "
+                    "FROM generate_series(1, :count)"
+                )
+                result = await session.execute(
+                    ids_sql,
+                    {"table_name": DataChunk.__tablename__, "count": len(records)},
+                )
+                chunk_ids = result.scalars().all()
 
-            await session.commit()
-        return len(chunks)
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+
+                await raw_connection.driver_connection.copy_records_to_table(
+                    DataChunk.__tablename__,
+                    records=[
+                        (
+                            chunk_id,
+                            uuid.uuid4(),
+                            text,
+                            json.dumps(meta),
+                            order,
+                            text_hash(text),
+                            project_id,
+                            asset_id,
+                            job_id,
+                        )
+                        for chunk_id, (text, meta, order, project_id, asset_id) in zip(
+                            chunk_ids, records
+                        )
+                    ],
+                    columns=[
+                        "id",
+                        "uuid",
+                        "text",
+                        "meta",
+                        "order",
+                        "content_hash",
+                        "project_id",
+                        "asset_id",
+                        "job_id",
+                    ],
+                )
+
+        return chunk_ids
 
     async def delete_chunks_by_project(self, project_id: int):
         async with self.db_client() as session:
@@ -54,16 +107,74 @@ class ChunkModel(BaseDataModel):
                 await session.commit()
         return result.rowcount
 
-    async def get_chunks_by_project(
-        self, project_id: int, page: int = 1, page_size: int = 50
-    ):
+    async def get_chunk_ids_by_job(self, project_id: int, job_id: int) -> List[int]:
+        async with self.db_client() as session:
+            async with session.begin():
+                query = select(DataChunk.id).where(
+                    DataChunk.project_id == project_id, DataChunk.job_id == job_id
+                )
+                result = await session.execute(query)
+                chunk_ids = result.scalars().all()
+        return chunk_ids
+
+    async def delete_chunks_by_job(self, project_id: int, job_id: int) -> int:
+        async with self.db_client() as session:
+            async with session.begin():
+                query = delete(DataChunk).where(
+                    DataChunk.project_id == project_id, DataChunk.job_id == job_id
+                )
+                result = await session.execute(query)
+                await session.commit()
+        return result.rowcount
+
+    async def iter_chunks_by_project(
+        self, project_id: int, page_size: int = 500
+    ) -> AsyncIterator[list]:
+        """Yield pages of (id, text, meta, content_hash) rows ordered by id.
+
+        Pages are fetched by keyset (id > last seen id) on the
+        (project_id, id) index, so the whole scan stays linear.
+        """
+        last_id = 0
+
+        while True:
+            async with self.db_client() as session:
+                async with session.begin():
+                    query = (
+                        select(
+                            DataChunk.id,
+                            DataChunk.text,
+                            DataChunk.meta,
+                            DataChunk.content_hash,
+                        )
+                        .where(
+                            DataChunk.project_id == project_id,
+                            DataChunk.id > last_id,
+                        )
+                        .order_by(DataChunk.id)
+                        .limit(page_size)
+                    )
+                    result = await session.execute(query)
+                    records = result.all()
+
+            if not records:
+                break
+
+            yield records
+
+            if len(records) < page_size:
+                break
+
+            last_id = records[-1].id
+
+    async def get_random_chunks(self, project_id: int, count: int) -> List[DataChunk]:
         async with self.db_client() as session:
             async with session.begin():
                 query = (
                     select(DataChunk)
                     .where(DataChunk.project_id == project_id)
-                    .offset((page - 1) * page_size)
-                    .limit(page_size)
+                    .order_by(func.random())
+                    .limit(count)
                 )
                 result = await session.execute(query)
                 records = result.scalars().all()
@@ -79,3 +190,45 @@ class ChunkModel(BaseDataModel):
                 result = await session.execute(query)
                 count = result.scalar_one()
         return count
+
+    async def get_token_counts(
+        self, chunk_ids: List[int], token_counter: str
+    ) -> Dict[int, int]:
+        """Stored token counts of the chunks, for ``token_counter`` only."""
+        if not chunk_ids:
+            return {}
+
+        async with self.db_client() as session:
+            async with session.begin():
+                query = select(DataChunk.id, DataChunk.token_count).where(
+                    DataChunk.id.in_(chunk_ids),
+                    DataChunk.token_counter == token_counter,
+                    DataChunk.token_count.is_not(None),
+                )
+                result = await session.execute(query)
+                records = result.all()
+
+        return {record.id: record.token_count for record in records}
+
+    async def set_token_counts(self, token_counts: Dict[int, int], token_counter: str):
+        if not token_counts:
+            return
+
+        async with self.db_client() as session:
+            async with session.begin():
+                # one statement for all rows, and updated_at left alone
+                update_sql = sql_text(
+                    f"UPDATE {DataChunk.__tablename__} "
+                    "SET token_count = counts.token_count, token_counter = :token_counter "
+                    "FROM unnest(CAST(:ids AS integer[]), CAST(:counts AS integer[])) "
+                    "AS counts(id, token_count) "
+                    f"WHERE {DataChunk.__tablename__}.id = counts.id"
+                )
+                await session.execute(
+                    update_sql,
+                    {
+                        "token_counter": token_counter,
+                        "ids": list(token_counts.keys()),
+                        "counts": list(token_counts.values()),
+                    },
+                )
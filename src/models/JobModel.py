@@ -0,0 +1,133 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemas import Job
+from .enums.JobEnums import JobStatusEnums
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.future import select
+from sqlalchemy import update, func
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+
+class JobModel(BaseDataModel):
+    def __init__(self, db_client: sessionmaker):
+        super().__init__(db_client)
+
+    @classmethod
+    async def create_instance(cls, db_client: sessionmaker):
+        instance = cls(db_client)
+        return instance
+
+    async def create_job(self, job: Job):
+        async with self.db_client() as session:
+            async with session.begin():
+                session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        return job
+
+    async def get_job(self, job_id: int) -> Optional[Job]:
+        async with self.db_client() as session:
+            async with session.begin():
+                query = select(Job).where(Job.id == job_id)
+                result = await session.execute(query)
+                job = result.scalar_one_or_none()
+
+        return job
+
+    async def claim_next_job(self, worker_id: str) -> Optional[Job]:
+        # SKIP LOCKED lets any number of workers poll the same table without
+        # blocking on, or double-claiming, a row another worker holds
+        async with self.db_client() as session:
+            async with session.begin():
+                query = (
+                    select(Job)
+                    .where(Job.status == JobStatusEnums.QUEUED.value)
+                    .order_by(Job.id)
+                    .limit(1)
+                    .with_for_update(skip_locked=True)
+                )
+                result = await session.execute(query)
+                job = result.scalar_one_or_none()
+
+                if job is not None:
+                    now = datetime.now(timezone.utc)
+                    job.status = JobStatusEnums.RUNNING.value
+                    job.worker_id = worker_id
+                    job.attempts = job.attempts + 1
+                    job.processed = 0
+                    job.started_at = now
+                    job.updated_at = now
+
+        return job
+
+    async def update_job_progress(
+        self, job_id: int, processed: int, total: Optional[int] = None
+    ):
+        values = {"processed": processed, "updated_at": func.now()}
+        if total is not None:
+            values["total"] = total
+
+        await self._update_job(job_id, **values)
+
+    async def touch_job(self, job_id: int):
+        await self._update_job(job_id, updated_at=func.now())
+
+    async def complete_job(self, job_id: int, result: dict):
+        await self._update_job(
+            job_id,
+            status=JobStatusEnums.SUCCEEDED.value,
+            result=result,
+            finished_at=func.now(),
+            updated_at=func.now(),
+        )
+
+    async def fail_job(self, job_id: int, error: str):
+        await self._update_job(
+            job_id,
+            status=JobStatusEnums.FAILED.value,
+            error=error,
+            finished_at=func.now(),
+            updated_at=func.now(),
+        )
+
+    async def requeue_stale_jobs(self, stale_after_seconds: int, max_attempts: int):
+        """Hand jobs of workers that stopped heartbeating back to the queue.
+
+        Jobs that already used ``max_attempts`` claims are failed instead.
+        Returns the number of requeued and failed jobs.
+        """
+        stale_filter = (
+            Job.status == JobStatusEnums.RUNNING.value,
+            Job.updated_at < func.now() - timedelta(seconds=stale_after_seconds),
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                failed = await session.execute(
+                    update(Job)
+                    .where(*stale_filter, Job.attempts >= max_attempts)
+                    .values(
+                        status=JobStatusEnums.FAILED.value,
+                        error="worker stopped responding",
+                        finished_at=func.now(),
+                        updated_at=func.now(),
+                    )
+                )
+                requeued = await session.execute(
+                    update(Job)
+                    .where(*stale_filter, Job.attempts < max_attempts)
+                    .values(
+                        status=JobStatusEnums.QUEUED.value,
+                        worker_id=None,
+                        updated_at=func.now(),
+                    )
+                )
+
+        return requeued.rowcount, failed.rowcount
+
+    async def _update_job(self, job_id: int, **values):
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    update(Job).where(Job.id == job_id).values(**values)
+                )
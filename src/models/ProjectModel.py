@@ -3,7 +3,7 @@ from .db_schemas import Project
 from .enums.DataBaseEnums import DataBaseEnums
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import update, func
 
 
 class ProjectModel(BaseDataModel):
@@ -35,6 +35,20 @@ class ProjectModel(BaseDataModel):
 
             return project
 
+    async def bump_index_version(self, project_id: int) -> int:
+        """Mark the project's vector index as changed, returns the new version."""
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(Project)
+                    .where(Project.id == project_id)
+                    .values(index_version=Project.index_version + 1)
+                    .returning(Project.index_version)
+                )
+                index_version = result.scalar_one_or_none()
+
+        return index_version
+
     async def get_all_projects(self, page: int = 1, page_size: int = 10):
 
         async with self.db_client() as session:
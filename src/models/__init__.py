@@ -2,9 +2,11 @@ from .enums.ResponseEnums import ResponseSignal
 from .enums.ProcessingEnums import ProcessingEnum
 from .enums.DataBaseEnums import DataBaseEnums
 from .enums.AssetTypeEnums import AssetTypeEnums
+from .enums.JobEnums import JobTypeEnums, JobStatusEnums
 
 from .ProjectModel import ProjectModel
 from .ChunkModel import ChunkModel
 from .AssetModel import AssetModel
+from .JobModel import JobModel
 
-from .db_schemas import Project, Asset, DataChunk, RetrievedDocument
+from .db_schemas import Project, Asset, DataChunk, Job, RetrievedDocument
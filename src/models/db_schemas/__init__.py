@@ -1,2 +1,3 @@
 from .retrieved_document import RetrievedDocument
-from .minirag.schemas import Asset, Project, DataChunk, SQL_alchemy_base
+from .search_filter import SearchFilter, MetadataCondition
+from .minirag.schemas import Asset, Project, DataChunk, Job, SQL_alchemy_base
@@ -1,10 +1,17 @@
 from logging.config import fileConfig
+import os
+import sys
 
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 
 from alembic import context
 
+# the schemas import shared helpers from the src package
+sys.path.insert(
+    0, os.path.abspath(os.path.join(os.path.dirname(__file__), *[".."] * 5))
+)
+
 from schemas import SQL_alchemy_base
 
 # this is the Alembic Config object, which provides
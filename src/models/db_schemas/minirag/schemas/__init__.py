@@ -2,3 +2,4 @@ from .asset import Asset
 from .minirag_base import SQL_alchemy_base
 from .project import Project
 from .data_chunk import DataChunk
+from .job import Job
@@ -5,10 +5,15 @@ from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
+from src.utils.hashing import text_hash
 import uuid
 from pydantic import BaseModel
 
 
+def default_content_hash(context):
+    return text_hash(context.get_current_parameters()["text"])
+
+
 class DataChunk(SQL_alchemy_base):
     __tablename__ = "chunks"
 
@@ -18,12 +23,18 @@ class DataChunk(SQL_alchemy_base):
     text = Column(String, nullable=False)
     meta = Column(JSONB, nullable=False)
     order = Column(Integer, nullable=False)
+    content_hash = Column(String, nullable=True, default=default_content_hash)
+    # filled on first use in a prompt, for the tokenizer named alongside
+    token_count = Column(Integer, nullable=True)
+    token_counter = Column(String, nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
     asset_id = Column(Integer, ForeignKey("assets.id"), nullable=False)
+    # the process job that wrote the chunk, so a retry only removes its own
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="SET NULL"), nullable=True)
 
     project = relationship("Project", back_populates="chunks")
     asset = relationship("Asset", back_populates="chunks")
@@ -31,4 +42,6 @@ class DataChunk(SQL_alchemy_base):
     __table_args__ = (
         Index("ix_chunks_project_id", project_id),
         Index("ix_chunks_asset_id", asset_id),
+        Index("ix_chunks_project_id_id", project_id, id),
+        Index("ix_chunks_job_id", job_id),
     )
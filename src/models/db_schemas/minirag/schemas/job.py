@@ -0,0 +1,36 @@
+from .minirag_base import SQL_alchemy_base
+from .project import Project
+from sqlalchemy import Column, Integer, String, DateTime, func, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from sqlalchemy import Index
+import uuid
+
+
+class Job(SQL_alchemy_base):
+    __tablename__ = "jobs"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+
+    type = Column(String, nullable=False)  # e.g., 'process', 'index'
+    status = Column(String, nullable=False)  # e.g., 'queued', 'running'
+    payload = Column(JSONB, nullable=False)  # request parameters
+    result = Column(JSONB, nullable=True)
+    error = Column(String, nullable=True)
+
+    total = Column(Integer, nullable=True)
+    processed = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
+
+    __table_args__ = (
+        Index("ix_jobs_status_id", status, id),
+        Index("ix_jobs_project_id", project_id),
+    )
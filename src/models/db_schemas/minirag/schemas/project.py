@@ -12,6 +12,9 @@ class Project(SQL_alchemy_base):
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
 
+    # bumped on every re-index or reset, invalidates cached answers
+    index_version = Column(Integer, default=0, server_default="0", nullable=False)
+
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
@@ -1,6 +1,10 @@
 from pydantic import BaseModel
+from typing import List, Optional
 
 
 class RetrievedDocument(BaseModel):
     text: str
     score: float
+    record_id: Optional[int] = None
+    # only set when the search asked for vectors
+    vector: Optional[List[float]] = None
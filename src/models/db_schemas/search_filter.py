@@ -0,0 +1,52 @@
+from pydantic import BaseModel, Field
+from typing import List, Optional, Union
+
+
+class MetadataCondition(BaseModel):
+    """Equality or range condition on one top-level chunk metadata key."""
+
+    key: str = Field(pattern=r"^[A-Za-z0-9_]+$")
+    eq: Optional[Union[bool, int, float, str]] = None
+    gt: Optional[float] = None
+    gte: Optional[float] = None
+    lt: Optional[float] = None
+    lte: Optional[float] = None
+
+    def range_bounds(self) -> dict:
+        return {
+            name: value
+            for name, value in (
+                ("gt", self.gt),
+                ("gte", self.gte),
+                ("lt", self.lt),
+                ("lte", self.lte),
+            )
+            if value is not None
+        }
+
+
+class SearchFilter(BaseModel):
+    """Conditions a record must all match to be returned by a vector search."""
+
+    asset_ids: Optional[List[int]] = None
+    chunk_order_gte: Optional[int] = None
+    chunk_order_lte: Optional[int] = None
+    metadata: List[MetadataCondition] = Field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return (
+            self.asset_ids is None
+            and self.chunk_order_gte is None
+            and self.chunk_order_lte is None
+            and not self.metadata
+        )
+
+    def metadata_equals(self) -> dict:
+        return {
+            condition.key: condition.eq
+            for condition in self.metadata
+            if condition.eq is not None
+        }
+
+    def metadata_ranges(self) -> List[MetadataCondition]:
+        return [condition for condition in self.metadata if condition.range_bounds()]
@@ -0,0 +1,13 @@
+from enum import Enum
+
+
+class JobTypeEnums(Enum):
+    PROCESS = "process"
+    INDEX = "index"
+
+
+class JobStatusEnums(Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
@@ -16,7 +16,12 @@ class ResponseSignal(Enum):
     INSERT_INTO_VECTOR_DB_SUCCESS = "data inserted into vector database successfully"
     GET_INDEX_INFO_ERROR = "failed to get index information"
     GET_INDEX_INFO_SUCCESS = "index information retrieved successfully"
+    EVALUATE_INDEX_ERROR = "failed to evaluate index recall"
+    EVALUATE_INDEX_SUCCESS = "index recall evaluated successfully"
     SEARCH_IN_VECTOR_DB_ERROR = "failed to search in vector database"
     SEARCH_IN_VECTOR_DB_SUCCESS = "search in vector database successful"
     RAG_ANSWER_GENERATION_ERROR = "failed to generate answer for the query"
     RAG_ANSWER_GENERATION_SUCCESS = "answer generated successfully"
+    JOB_QUEUED = "job queued successfully"
+    JOB_NOT_FOUND = "job not found"
+    GET_JOB_STATUS_SUCCESS = "job status retrieved successfully"
@@ -1,11 +1,25 @@
 from fastapi import FastAPI, APIRouter, status, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from src.controllers import NLPController
-from src.models import ProjectModel, ChunkModel, AssetModel
-from .schemas.NLP import PushRequest, SearchRequest
+from src.models import (
+    ProjectModel,
+    ChunkModel,
+    AssetModel,
+    JobModel,
+    JobTypeEnums,
+    JobStatusEnums,
+)
+from src.models.db_schemas import Job
+from .schemas.NLP import (
+    PushRequest,
+    SearchRequest,
+    BatchSearchRequest,
+    EvaluateRequest,
+)
 from src.models.enums.ResponseEnums import ResponseSignal
+from typing import AsyncIterator, Tuple
 import logging
-from tqdm.auto import tqdm
+import json
 
 logger = logging.getLogger("uvicorn.error")
 
@@ -17,8 +31,6 @@ async def index_project(request: Request, project_id: int, push_reqeust: PushReq
 
     project_model = await ProjectModel.create_instance(request.app.db_client)
 
-    chunk_model = await ChunkModel.create_instance(request.app.db_client)
-
     project = await project_model.get_project_or_create_one(project_id)
 
     if not project:
@@ -27,62 +39,74 @@ async def index_project(request: Request, project_id: int, push_reqeust: PushReq
             content={"signal": ResponseSignal.PROJECT_NOT_FOUND.value},
         )
 
-    nlp_controller = NLPController(
-        vector_db_client=request.app.vector_db_client,
-        embedding_client=request.app.embedding_client,
-        generation_client=request.app.generation_client,
-        template_parser=request.app.template_parser,
+    job_model = await JobModel.create_instance(request.app.db_client)
+
+    # embedding runs on a worker, see `python -m src.workers`
+    job = await job_model.create_job(
+        Job(
+            project_id=project.id,
+            type=JobTypeEnums.INDEX.value,
+            status=JobStatusEnums.QUEUED.value,
+            payload={
+                "do_reset": push_reqeust.do_reset,
+                "page_size": push_reqeust.page_size,
+                "incremental": push_reqeust.incremental,
+                "storage_mode": push_reqeust.storage_mode,
+            },
+        )
     )
 
-    has_records = True
-    page = 1
-    inserted_count = 0
-
-    collection_name = nlp_controller.create_collection_name(project.id)
-
-    _ = await request.app.vector_db_client.create_collection(
-        collection_name,
-        request.app.embedding_client.embedding_size,
-        push_reqeust.do_reset,
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignal.JOB_QUEUED.value,
+            "job_id": job.id,
+        },
     )
 
-    chunks_count = await chunk_model.get_total_chunks_count(project.id)
 
-    progress_bar = tqdm(
-        total=chunks_count, desc="Indexing Chunks", position=0, unit="chunk"
-    )
+@nlp_router.get("/index/info/{project_id}")
+async def get_project_index_info(request: Request, project_id: int):
+    project_model = await ProjectModel.create_instance(request.app.db_client)
+
+    project = await project_model.get_project_or_create_one(project_id)
 
-    while has_records:
-        chunks = await chunk_model.get_chunks_by_project(project.id, page=page)
-        if len(chunks):
-            page += 1
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND.value},
+        )
 
-        if not chunks or len(chunks) == 0:
-            has_records = False
-            break
+    nlp_controller = NLPController(
+        vector_db_client=request.app.vector_db_client,
+        embedding_client=request.app.embedding_client,
+        generation_client=request.app.generation_client,
+        template_parser=request.app.template_parser,
+    )
 
-        is_inserted = await nlp_controller.index_into_vector_db(project, chunks)
+    index_info = await nlp_controller.get_vector_db_collection_info(project)
 
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                content={"signal": ResponseSignal.INSERT_INTO_VECTOR_DB_ERROR.value},
-            )
-        inserted_count += len(chunks)
-        progress_bar.update(len(chunks))
+    if index_info is None:
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"signal": ResponseSignal.GET_INDEX_INFO_ERROR.value},
+        )
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "signal": ResponseSignal.INSERT_INTO_VECTOR_DB_SUCCESS.value,
-            "inserted_count": inserted_count,
+            "signal": ResponseSignal.GET_INDEX_INFO_SUCCESS.value,
+            "index_info": index_info,
         },
     )
 
 
-@nlp_router.get("/index/info/{project_id}")
-async def get_project_index_info(request: Request, project_id: int):
+@nlp_router.post("/index/evaluate/{project_id}")
+async def evaluate_index(
+    request: Request, project_id: int, evaluate_request: EvaluateRequest
+):
     project_model = await ProjectModel.create_instance(request.app.db_client)
+    chunk_model = await ChunkModel.create_instance(request.app.db_client)
 
     project = await project_model.get_project_or_create_one(project_id)
 
@@ -99,19 +123,26 @@ async def get_project_index_info(request: Request, project_id: int):
         template_parser=request.app.template_parser,
     )
 
-    index_info = await nlp_controller.get_vector_db_collection_info(project)
+    evaluation = await nlp_controller.evaluate_recall(
+        project,
+        chunk_model,
+        sample_size=evaluate_request.sample_size,
+        k=evaluate_request.k,
+        ef_search=evaluate_request.ef_search,
+        probes=evaluate_request.probes,
+    )
 
-    if index_info is None:
+    if evaluation is None:
         return JSONResponse(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            content={"signal": ResponseSignal.GET_INDEX_INFO_ERROR.value},
+            content={"signal": ResponseSignal.EVALUATE_INDEX_ERROR.value},
         )
 
     return JSONResponse(
         status_code=status.HTTP_200_OK,
         content={
-            "signal": ResponseSignal.GET_INDEX_INFO_SUCCESS.value,
-            "index_info": index_info,
+            "signal": ResponseSignal.EVALUATE_INDEX_SUCCESS.value,
+            "evaluation": evaluation,
         },
     )
 
@@ -129,6 +160,7 @@ async def search_index(
         embedding_client=request.app.embedding_client,
         generation_client=request.app.generation_client,
         template_parser=request.app.template_parser,
+        embedding_batcher=request.app.embedding_batcher,
     )
 
     if not project:
@@ -138,7 +170,14 @@ async def search_index(
         )
 
     search_results = await nlp_controller.search_vector_db_collection(
-        project, search_request.text, limit=search_request.limit
+        project,
+        search_request.text,
+        limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
+        search_filter=search_request.filter,
+        mode=search_request.mode,
+        mmr_lambda=search_request.mmr_lambda,
     )
 
     if search_results is False:
@@ -151,12 +190,73 @@ async def search_index(
         status_code=status.HTTP_200_OK,
         content={
             "signal": ResponseSignal.SEARCH_IN_VECTOR_DB_SUCCESS.value,
-            "results": [result.model_dump() for result in search_results],
+            "results": [
+                result.model_dump(exclude={"vector"}) for result in search_results
+            ],
         },
     )
 
 
-@nlp_router.post("/index/answer/{project_id}")
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(
+    request: Request, project_id: int, search_request: BatchSearchRequest
+):
+    project_model = await ProjectModel.create_instance(request.app.db_client)
+
+    project = await project_model.get_project_or_create_one(project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND.value},
+        )
+
+    nlp_controller = NLPController(
+        vector_db_client=request.app.vector_db_client,
+        embedding_client=request.app.embedding_client,
+        generation_client=request.app.generation_client,
+        template_parser=request.app.template_parser,
+    )
+
+    search_results = await nlp_controller.search_vector_db_collection_batch(
+        project,
+        search_request.texts,
+        limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
+        search_filter=search_request.filter,
+    )
+
+    if search_results is False:
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"signal": ResponseSignal.SEARCH_IN_VECTOR_DB_ERROR.value},
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.SEARCH_IN_VECTOR_DB_SUCCESS.value,
+            "results": [
+                [result.model_dump(exclude={"vector"}) for result in query_results]
+                for query_results in search_results
+            ],
+        },
+    )
+
+
+@nlp_router.post(
+    "/index/answer/{project_id}",
+    responses={
+        200: {
+            "description": (
+                "The answer, with the full_prompt and chat_history it was "
+                "generated from. Both are null when the answer is served from "
+                "the answer cache."
+            )
+        }
+    },
+)
 async def generate_rag_answer(
     request: Request, project_id: int, search_request: SearchRequest
 ):
@@ -169,6 +269,9 @@ async def generate_rag_answer(
         embedding_client=request.app.embedding_client,
         generation_client=request.app.generation_client,
         template_parser=request.app.template_parser,
+        embedding_batcher=request.app.embedding_batcher,
+        answer_cache=request.app.answer_cache,
+        context_packer=request.app.context_packer,
     )
 
     if not project:
@@ -178,7 +281,12 @@ async def generate_rag_answer(
         )
 
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
-        project, search_request.text, limit=search_request.limit
+        project,
+        search_request.text,
+        limit=search_request.limit,
+        search_filter=search_request.filter,
+        mode=search_request.mode,
+        mmr_lambda=search_request.mmr_lambda,
     )
 
     if answer is None:
@@ -196,3 +304,59 @@ async def generate_rag_answer(
             "chat_history": chat_history,
         },
     )
+
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def stream_rag_answer(
+    request: Request, project_id: int, search_request: SearchRequest
+):
+    project_model = await ProjectModel.create_instance(request.app.db_client)
+
+    project = await project_model.get_project_or_create_one(project_id)
+
+    if not project:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.PROJECT_NOT_FOUND.value},
+        )
+
+    nlp_controller = NLPController(
+        vector_db_client=request.app.vector_db_client,
+        embedding_client=request.app.embedding_client,
+        generation_client=request.app.generation_client,
+        template_parser=request.app.template_parser,
+        embedding_batcher=request.app.embedding_batcher,
+        context_packer=request.app.context_packer,
+    )
+
+    # retrieval failures still get a status code, streaming starts after it
+    retrieved_docs = await nlp_controller.search_vector_db_collection(
+        project,
+        search_request.text,
+        limit=search_request.limit,
+        search_filter=search_request.filter,
+        mode=search_request.mode,
+        mmr_lambda=search_request.mmr_lambda,
+    )
+
+    if not retrieved_docs:
+        return JSONResponse(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            content={"signal": ResponseSignal.RAG_ANSWER_GENERATION_ERROR.value},
+        )
+
+    return StreamingResponse(
+        server_sent_events(
+            nlp_controller.stream_rag_answer(search_request.text, retrieved_docs)
+        ),
+        media_type="text/event-stream",
+        # nginx would otherwise buffer the whole answer before relaying it
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def server_sent_events(
+    events: AsyncIterator[Tuple[str, dict]],
+) -> AsyncIterator[str]:
+    async for event, data in events:
+        yield f"event: {event}\ndata: {json.dumps(data)}\n\n"
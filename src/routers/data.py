@@ -1,12 +1,17 @@
 from fastapi import APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
 from src.helpers.config import get_settings, Settings
-from src.controllers import DataController, ProcessController, NLPController
-from src.models import ResponseSignal, DataBaseEnums, AssetTypeEnums
+from src.controllers import DataController
+from src.models import (
+    ResponseSignal,
+    AssetTypeEnums,
+    JobTypeEnums,
+    JobStatusEnums,
+)
 from src.models.ProjectModel import ProjectModel
-from src.models.ChunkModel import ChunkModel
 from src.models.AssetModel import AssetModel
-from src.models.db_schemas import DataChunk, Project, Asset
+from src.models.JobModel import JobModel
+from src.models.db_schemas import Project, Asset, Job
 from .schemas.data import ProcessRequest
 import aiofiles
 import logging
@@ -75,10 +80,10 @@ async def process_data(
     file_id = process_request.file_id
     chunk_size = process_request.chunk_size
     overlap_size = process_request.overlap_size
+    min_chunk_size = process_request.min_chunk_size
     do_reset = process_request.do_reset
 
     project_model = await ProjectModel.create_instance(request.app.db_client)
-    chunk_model = await ChunkModel.create_instance(request.app.db_client)
     asset_model = await AssetModel.create_instance(request.app.db_client)
 
     project = await project_model.get_project_or_create_one(project_id)
@@ -107,72 +112,29 @@ async def process_data(
             content={"message": ResponseSignal.NO_FILES_TO_PROCESS.value},
         )
 
-    process_controller = ProcessController(project_id)
-    nlp_controller = NLPController(
-        vector_db_client=request.app.vector_db_client,
-        embedding_client=request.app.embedding_client,
-        generation_client=request.app.generation_client,
-        template_parser=request.app.template_parser,
-    )
-
-    no_records = 0
-    processed_files = 0
-    failed_files = []
-
-    if do_reset:
-        collection_name = nlp_controller.create_collection_name(project.id)
-
-        _ = await request.app.vector_db_client.delete_collection(collection_name)
-
-        deleted_count = await chunk_model.delete_chunks_by_project(project.id)
-        logger.info(
-            f"Reset: Deleted {deleted_count} chunks for project_id: {project_id}"
+    job_model = await JobModel.create_instance(request.app.db_client)
+
+    # chunking runs on a worker, see `python -m src.workers`
+    job = await job_model.create_job(
+        Job(
+            project_id=project.id,
+            type=JobTypeEnums.PROCESS.value,
+            status=JobStatusEnums.QUEUED.value,
+            payload={
+                "project_files_ids": project_files_ids,
+                "chunk_size": chunk_size,
+                "overlap_size": overlap_size,
+                "min_chunk_size": min_chunk_size,
+                "do_reset": do_reset,
+            },
         )
-
-    for asset_id, file_id in project_files_ids.items():
-        try:
-            file_content = process_controller.get_file_content(file_id)
-
-            if file_content is None or len(file_content) == 0:
-                logger.error(f"No content loaded for file_id: {file_id}")
-                failed_files.append(file_id)
-                continue
-
-            file_chunks = process_controller.process_file_content(
-                file_content, file_id, chunk_size, overlap_size
-            )
-
-            if file_chunks is None or len(file_chunks) == 0:
-                logger.error(f"Processing returned no chunks for file_id: {file_id}")
-                failed_files.append(file_id)
-                continue
-
-            file_chunks_records = [
-                DataChunk(
-                    text=chunk.page_content,
-                    meta=chunk.metadata,
-                    order=i + 1,
-                    project_id=project.id,
-                    asset_id=asset_id,
-                )
-                for i, chunk in enumerate(file_chunks)
-            ]
-
-            inserted = await chunk_model.insert_many_chunks(file_chunks_records)
-            no_records += inserted
-            processed_files += 1
-
-        except Exception as e:
-            logger.error(f"Error processing file_id {file_id}: {e}")
-            failed_files.append(file_id)
-            continue
+    )
 
     return JSONResponse(
-        status_code=status.HTTP_200_OK,
+        status_code=status.HTTP_202_ACCEPTED,
         content={
-            "message": ResponseSignal.PROCESSING_SUCCESS.value,
-            "inserted_chunks": no_records,
-            "processed_files": processed_files,
-            "failed_files": failed_files,
+            "message": ResponseSignal.JOB_QUEUED.value,
+            "job_id": job.id,
+            "files_count": len(project_files_ids),
         },
     )
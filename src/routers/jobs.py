@@ -0,0 +1,77 @@
+from fastapi import APIRouter, status, Request
+from fastapi.responses import JSONResponse
+from src.models import JobModel, JobTypeEnums, JobStatusEnums
+from src.models.db_schemas import Job
+from src.models.enums.ResponseEnums import ResponseSignal
+from datetime import datetime, timezone
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+jobs_router = APIRouter(prefix="/api/v1/jobs", tags=["jobs"])
+
+# what `processed` / `total` count for each job type
+JOB_PROGRESS_UNITS = {
+    JobTypeEnums.PROCESS.value: "file",
+    JobTypeEnums.INDEX.value: "chunk",
+}
+
+
+def isoformat(value: datetime):
+    return value.isoformat() if value else None
+
+
+def job_status_content(job: Job) -> dict:
+    progress = None
+    if job.total:
+        progress = round(job.processed / job.total, 4)
+
+    throughput = None
+    if job.started_at:
+        if job.status == JobStatusEnums.RUNNING.value:
+            finished_at = datetime.now(timezone.utc)
+        else:
+            finished_at = job.finished_at or job.updated_at
+        elapsed = (finished_at - job.started_at).total_seconds() if finished_at else 0
+        if elapsed > 0:
+            throughput = round(job.processed / elapsed, 2)
+
+    return {
+        "job_id": job.id,
+        "project_id": job.project_id,
+        "type": job.type,
+        "status": job.status,
+        "unit": JOB_PROGRESS_UNITS.get(job.type),
+        "processed": job.processed,
+        "total": job.total,
+        "progress": progress,
+        "throughput_per_second": throughput,
+        "attempts": job.attempts,
+        "worker_id": job.worker_id,
+        "result": job.result,
+        "error": job.error,
+        "created_at": isoformat(job.created_at),
+        "started_at": isoformat(job.started_at),
+        "finished_at": isoformat(job.finished_at),
+    }
+
+
+@jobs_router.get("/{job_id}")
+async def get_job_status(request: Request, job_id: int):
+    job_model = await JobModel.create_instance(request.app.db_client)
+
+    job = await job_model.get_job(job_id)
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={"signal": ResponseSignal.JOB_NOT_FOUND.value},
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_200_OK,
+        content={
+            "signal": ResponseSignal.GET_JOB_STATUS_SUCCESS.value,
+            "job": job_status_content(job),
+        },
+    )
@@ -1,11 +1,46 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
+from src.models.db_schemas import SearchFilter
 
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    page_size: Optional[int] = 500
+    incremental: Optional[int] = 0
+    storage_mode: Optional[str] = Field(
+        default=None,
+        description=(
+            "float32, halfvec, scalar (Qdrant only) or binary; "
+            "VECTOR_DB_STORAGE_MODE when unset. On pgvector the table always "
+            "stores full float32 vectors for re-scoring, halfvec and binary "
+            "only shrink the ANN index."
+        ),
+    )
 
 
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    filter: Optional[SearchFilter] = None
+    # vector, lexical or hybrid; VECTOR_DB_SEARCH_MODE when unset
+    mode: Optional[str] = None
+    # MMR trade-off, 1 turns diversification off; VECTOR_DB_MMR_LAMBDA when unset
+    mmr_lambda: Optional[float] = Field(default=None, ge=0, le=1)
+
+
+class BatchSearchRequest(BaseModel):
+    # embedded in a single provider call
+    texts: List[str] = Field(min_length=1, max_length=1000)
+    limit: Optional[int] = 5
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    filter: Optional[SearchFilter] = None
+
+
+class EvaluateRequest(BaseModel):
+    k: Optional[int] = 10
+    sample_size: Optional[int] = 20
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
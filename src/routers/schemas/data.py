@@ -6,4 +6,5 @@ class ProcessRequest(BaseModel):
     file_id: Optional[str] = None
     chunk_size: Optional[int] = 100
     overlap_size: Optional[int] = 20
+    min_chunk_size: Optional[int] = 0
     do_reset: Optional[int] = 0
@@ -0,0 +1,203 @@
+from src.utils.metrics import ANSWER_CACHE_HITS, ANSWER_CACHE_MISSES
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+import numpy as np
+import asyncio
+import time
+
+
+@dataclass
+class _Entry:
+    value: Any
+    vector: Optional[np.ndarray]  # unit length, None when the query was not embedded
+    stored_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _ProjectAnswers:
+    index_version: int
+    # (scope, normalized query) -> entry, least recently used first
+    entries: OrderedDict = field(default_factory=OrderedDict)
+
+
+class AnswerCache:
+    """Per-project RAG answer cache with an exact and a semantic level.
+
+    Answers are keyed by the normalized query within a ``scope`` (the search
+    parameters that shaped them); a query whose embedding is within
+    ``similarity_threshold`` cosine of a cached one in the same scope reuses
+    its answer too. Every entry belongs to the project's ``index_version``,
+    so a re-index or reset, which bumps the version, drops them all.
+    Concurrent loads of the same exact key share a single generation.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600,
+        max_entries_per_project: int = 256,
+        similarity_threshold: float = 0.95,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries_per_project = max(max_entries_per_project, 1)
+        self.similarity_threshold = similarity_threshold
+
+        self.projects: Dict[int, _ProjectAnswers] = {}
+        self.in_flight: Dict[Tuple, asyncio.Future] = {}
+
+    @staticmethod
+    def normalize_query(query: str) -> str:
+        return " ".join(query.lower().split())
+
+    async def get_or_load(
+        self,
+        project_id: int,
+        index_version: int,
+        scope: str,
+        query: str,
+        loader: Callable[[], Awaitable[Tuple[Any, Optional[list]]]],
+    ) -> Any:
+        """Return a cached answer or run ``loader`` once for all callers.
+
+        ``loader`` returns ``(value, query_vector)``; the vector makes the
+        answer reachable by similar queries and is None for answers that
+        came from the semantic level, so matches never drift. None values
+        are not cached, failed generations are retried.
+        """
+        key = (scope, self.normalize_query(query))
+        flight_key = (project_id, index_version, *key)
+
+        while True:
+            value = self.get_exact(project_id, index_version, key)
+            if value is not None:
+                ANSWER_CACHE_HITS.labels(level="exact").inc()
+                return value
+
+            future = self.in_flight.get(flight_key)
+            if future is None:
+                break
+
+            ANSWER_CACHE_HITS.labels(level="in_flight").inc()
+            try:
+                # shielded, so one cancelled caller does not cancel the others
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    raise
+                # the loading request went away, the next waiter takes over
+
+        future = asyncio.get_running_loop().create_future()
+        self.in_flight[flight_key] = future
+        try:
+            value, vector = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # marks it retrieved when nobody was waiting
+            future.exception()
+            raise
+        finally:
+            self.in_flight.pop(flight_key, None)
+
+        if value is not None:
+            self.put(project_id, index_version, key, value, vector)
+        future.set_result(value)
+        return value
+
+    def get_exact(self, project_id: int, index_version: int, key: Tuple) -> Any:
+        answers = self._project(project_id, index_version)
+        if answers is None:
+            return None
+
+        entry = answers.entries.get(key)
+        if entry is None or self._expired(entry):
+            return None
+
+        answers.entries.move_to_end(key)
+        return entry.value
+
+    def get_similar(
+        self, project_id: int, index_version: int, scope: str, vector: list
+    ) -> Any:
+        if not vector or self.similarity_threshold > 1:
+            ANSWER_CACHE_MISSES.inc()
+            return None
+
+        answers = self._project(project_id, index_version)
+        candidates = []
+        if answers is not None:
+            candidates = [
+                (key, entry)
+                for key, entry in answers.entries.items()
+                if key[0] == scope
+                and entry.vector is not None
+                and not self._expired(entry)
+            ]
+        if not candidates:
+            ANSWER_CACHE_MISSES.inc()
+            return None
+
+        query = _unit(vector)
+        matrix = np.stack([entry.vector for _, entry in candidates])
+        if matrix.shape[1] != query.shape[0]:
+            # embedding model changed since these were cached
+            ANSWER_CACHE_MISSES.inc()
+            return None
+
+        similarities = matrix @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            ANSWER_CACHE_MISSES.inc()
+            return None
+
+        key, entry = candidates[best]
+        answers.entries.move_to_end(key)
+        ANSWER_CACHE_HITS.labels(level="semantic").inc()
+        return entry.value
+
+    def put(
+        self,
+        project_id: int,
+        index_version: int,
+        key: Tuple,
+        value: Any,
+        vector: list = None,
+    ):
+        answers = self._project(project_id, index_version, create=True)
+        if answers is None:
+            return
+
+        answers.entries[key] = _Entry(
+            value=value, vector=_unit(vector) if vector else None
+        )
+        answers.entries.move_to_end(key)
+        while len(answers.entries) > self.max_entries_per_project:
+            answers.entries.popitem(last=False)
+
+    def _project(
+        self, project_id: int, index_version: int, create: bool = False
+    ) -> Optional[_ProjectAnswers]:
+        answers = self.projects.get(project_id)
+
+        if answers is not None and answers.index_version > index_version:
+            # read before a re-index committed, neither served nor stored
+            return None
+
+        if answers is None or answers.index_version < index_version:
+            if not create:
+                return None
+            answers = _ProjectAnswers(index_version=index_version)
+            self.projects[project_id] = answers
+
+        return answers
+
+    def _expired(self, entry: _Entry) -> bool:
+        return time.monotonic() - entry.stored_at > self.ttl_seconds
+
+
+def _unit(vector: list) -> np.ndarray:
+    vector = np.asarray(vector, dtype=np.float32)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
@@ -0,0 +1,121 @@
+from src.models.ChunkModel import ChunkModel
+from src.models.db_schemas import RetrievedDocument
+from src.utils.lexical import unique_lexical_tokens
+from src.utils.metrics import RAG_CONTEXT_DROPPED, RAG_CONTEXT_TOKENS
+from src.utils.tokens import TokenCounter
+from typing import Dict, List
+import asyncio
+import logging
+
+
+class ContextPacker:
+    """Selects the retrieved documents that go into an answer prompt.
+
+    Documents are taken in the order retrieval ranked them (MMR or rank
+    fusion, whose scores are not comparable across modes) until their text
+    fills ``max_tokens`` of the generation model's tokens; the first one that
+    does not fit is cut to the remaining budget when at least
+    ``min_fragment_tokens`` are left. A document whose terms overlap an
+    earlier one's by ``dedup_similarity`` (Jaccard) or more is dropped. Token counts are stored on the chunks, so
+    each chunk is tokenized once per tokenizer.
+    """
+
+    def __init__(
+        self,
+        token_counter: TokenCounter,
+        chunk_model: ChunkModel = None,
+        max_tokens: int = 2000,
+        dedup_similarity: float = 0.85,
+        min_fragment_tokens: int = 64,
+    ):
+        self.token_counter = token_counter
+        self.chunk_model = chunk_model
+        self.max_tokens = max_tokens
+        self.dedup_similarity = dedup_similarity
+        self.min_fragment_tokens = min_fragment_tokens
+
+        # stored counts are written after the answer, tracked until done
+        self.store_tasks = set()
+
+        self.logger = logging.getLogger("uvicorn")
+
+    async def pack(self, documents: List[RetrievedDocument]) -> List[RetrievedDocument]:
+        documents = [
+            document.model_copy(update={"text": document.text.strip()})
+            for document in documents
+        ]
+        documents = self.drop_duplicates(documents)
+        token_counts = await self.get_token_counts(documents)
+
+        packed = []
+        remaining = self.max_tokens
+        for document, token_count in zip(documents, token_counts):
+            if token_count <= remaining:
+                packed.append(document)
+                remaining -= token_count
+                continue
+
+            if remaining >= self.min_fragment_tokens:
+                text = self.token_counter.truncate(document.text, remaining)
+                packed.append(document.model_copy(update={"text": text}))
+                remaining -= self.token_counter.count(text)
+            else:
+                RAG_CONTEXT_DROPPED.labels(reason="budget").inc()
+
+        RAG_CONTEXT_TOKENS.observe(self.max_tokens - remaining)
+        return packed
+
+    def drop_duplicates(
+        self, documents: List[RetrievedDocument]
+    ) -> List[RetrievedDocument]:
+        kept = []
+        kept_terms = []
+        for document in documents:
+            terms = set(unique_lexical_tokens(document.text))
+            if any(self._is_duplicate(terms, other) for other in kept_terms):
+                RAG_CONTEXT_DROPPED.labels(reason="duplicate").inc()
+                continue
+            kept.append(document)
+            kept_terms.append(terms)
+        return kept
+
+    def _is_duplicate(self, terms: set, other: set) -> bool:
+        if not terms or not other:
+            return terms == other
+        return len(terms & other) / len(terms | other) >= self.dedup_similarity
+
+    async def get_token_counts(self, documents: List[RetrievedDocument]) -> List[int]:
+        record_ids = [doc.record_id for doc in documents if doc.record_id is not None]
+        stored = {}
+        if self.chunk_model is not None and record_ids:
+            try:
+                stored = await self.chunk_model.get_token_counts(
+                    record_ids, self.token_counter.name
+                )
+            except Exception as e:
+                self.logger.error("Error reading chunk token counts: %s", e)
+
+        token_counts = []
+        counted = {}
+        for document in documents:
+            token_count = stored.get(document.record_id)
+            if token_count is None:
+                token_count = self.token_counter.count(document.text)
+                if document.record_id is not None:
+                    counted[document.record_id] = token_count
+            token_counts.append(token_count)
+
+        if counted and self.chunk_model is not None:
+            task = asyncio.create_task(self._store_token_counts(counted))
+            self.store_tasks.add(task)
+            task.add_done_callback(self.store_tasks.discard)
+
+        return token_counts
+
+    async def _store_token_counts(self, token_counts: Dict[int, int]):
+        try:
+            await self.chunk_model.set_token_counts(
+                token_counts, self.token_counter.name
+            )
+        except Exception as e:
+            self.logger.error("Error storing chunk token counts: %s", e)
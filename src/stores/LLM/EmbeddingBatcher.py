@@ -0,0 +1,82 @@
+from .LLMInterface import LLMInterface
+from src.utils.metrics import EMBEDDING_BATCH_SIZE, EMBEDDING_BATCH_QUEUE_DELAY
+import asyncio
+import logging
+import time
+
+
+class EmbeddingBatcher:
+    """Coalesces single-text embedding requests into batched provider calls.
+
+    Texts that arrive within ``max_wait_ms`` of the first pending one (or
+    until ``max_batch_size`` are pending) are sent in one ``embed_text_async``
+    call and each caller gets its own vector back.
+    """
+
+    def __init__(
+        self,
+        embedding_client: LLMInterface,
+        max_wait_ms: float = 5,
+        max_batch_size: int = 64,
+    ):
+        self.embedding_client = embedding_client
+        self.max_wait = max_wait_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        # pending (text, future, enqueued_at) entries per document type
+        self.pending = {}
+        self.flush_handles = {}
+        self.batch_tasks = set()
+
+        self.logger = logging.getLogger(__name__)
+
+    async def embed(self, text: str, document_type: str):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        batch = self.pending.setdefault(document_type, [])
+        batch.append((text, future, time.perf_counter()))
+
+        if len(batch) >= self.max_batch_size:
+            self.flush(document_type)
+        elif len(batch) == 1:
+            self.flush_handles[document_type] = loop.call_later(
+                self.max_wait, self.flush, document_type
+            )
+
+        return await future
+
+    def flush(self, document_type: str):
+        handle = self.flush_handles.pop(document_type, None)
+        if handle:
+            handle.cancel()
+
+        batch = self.pending.pop(document_type, None)
+        if not batch:
+            return
+
+        task = asyncio.create_task(self.send_batch(document_type, batch))
+        self.batch_tasks.add(task)
+        task.add_done_callback(self.batch_tasks.discard)
+
+    async def send_batch(self, document_type: str, batch: list):
+        sent_at = time.perf_counter()
+        for _, _, enqueued_at in batch:
+            EMBEDDING_BATCH_QUEUE_DELAY.observe(sent_at - enqueued_at)
+        EMBEDDING_BATCH_SIZE.observe(len(batch))
+
+        try:
+            vectors = await self.embedding_client.embed_text_async(
+                [text for text, _, _ in batch], document_type
+            )
+        except Exception as e:
+            self.logger.error("Batched embedding call failed: %s", e)
+            vectors = None
+
+        if not vectors or len(vectors) != len(batch):
+            vectors = [None] * len(batch)
+
+        for (_, future, _), vector in zip(batch, vectors):
+            # callers that were cancelled while waiting are skipped
+            if not future.done():
+                future.set_result(vector)
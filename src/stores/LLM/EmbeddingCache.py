@@ -0,0 +1,105 @@
+from src.utils.hashing import text_hash
+from src.utils.metrics import EMBEDDING_CACHE_HITS, EMBEDDING_CACHE_MISSES
+from collections import OrderedDict
+from array import array
+from typing import Dict, List
+import sqlite3
+import threading
+
+
+class EmbeddingCache:
+    """Two-tier embedding cache: a bounded in-memory LRU in front of SQLite.
+
+    Vectors are persisted as float32 blobs, so they survive restarts and are
+    shared by every worker on the same host.
+    """
+
+    def __init__(self, db_path: str, max_memory_entries: int = 50000):
+        self.max_memory_entries = max_memory_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+
+        self.connection = sqlite3.connect(db_path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings "
+            "(key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self.connection.commit()
+
+    @staticmethod
+    def make_key(provider: str, model_id: str, document_type: str, text: str) -> str:
+        return f"{provider}:{model_id}:{document_type}:{text_hash(text)}"
+
+    def get_many(self, keys: List[str]) -> Dict[str, list]:
+        found = {}
+        missing = []
+
+        with self.lock:
+            for key in keys:
+                vector = self.memory.get(key)
+                if vector is None:
+                    missing.append(key)
+                    continue
+                self.memory.move_to_end(key)
+                found[key] = vector
+
+        EMBEDDING_CACHE_HITS.labels(tier="memory").inc(len(found))
+
+        if missing:
+            stored = self._read_disk(missing)
+            self._remember(stored)
+            found.update(stored)
+
+            EMBEDDING_CACHE_HITS.labels(tier="disk").inc(len(stored))
+            EMBEDDING_CACHE_MISSES.inc(len(missing) - len(stored))
+
+        return found
+
+    def put_many(self, vectors: Dict[str, list]):
+        if not vectors:
+            return
+
+        self._remember(vectors)
+
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [
+                    (key, array("f", vector).tobytes())
+                    for key, vector in vectors.items()
+                ],
+            )
+            self.connection.commit()
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+
+    def _remember(self, vectors: Dict[str, list]):
+        with self.lock:
+            for key, vector in vectors.items():
+                self.memory[key] = vector
+                self.memory.move_to_end(key)
+
+            while len(self.memory) > self.max_memory_entries:
+                self.memory.popitem(last=False)
+
+    def _read_disk(self, keys: List[str], batch_size: int = 500) -> Dict[str, list]:
+        stored = {}
+
+        with self.lock:
+            for i in range(0, len(keys), batch_size):
+                batch_keys = keys[i : i + batch_size]
+                placeholders = ",".join("?" * len(batch_keys))
+                rows = self.connection.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})",
+                    batch_keys,
+                ).fetchall()
+
+                for key, blob in rows:
+                    vector = array("f")
+                    vector.frombytes(blob)
+                    stored[key] = vector.tolist()
+
+        return stored
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import AsyncIterator, List, Union
 
 
 class LLMInterface(ABC):
@@ -26,6 +26,31 @@ class LLMInterface(ABC):
     def embed_text(self, text: Union[List[str], str], document_type: str):
         pass
 
+    @abstractmethod
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int,
+        temperature: float,
+    ):
+        pass
+
+    @abstractmethod
+    def generate_text_stream(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int,
+        temperature: float,
+    ) -> AsyncIterator[str]:
+        """Yield the completion in pieces as the model produces them."""
+        pass
+
+    @abstractmethod
+    async def embed_text_async(self, text: Union[List[str], str], document_type: str):
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
@@ -1,5 +1,8 @@
 from .LLMEnums import LLMEnums
-from .providers import CoHereProvider, OpenAIProvider
+from .LLMInterface import LLMInterface
+from .EmbeddingCache import EmbeddingCache
+from .providers import CoHereProvider, OpenAIProvider, CachedEmbeddingProvider
+import os
 
 
 class LLMProviderFactory:
@@ -14,6 +17,8 @@ class LLMProviderFactory:
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_output_max_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                max_concurrency=self.config.LLM_MAX_CONCURRENCY,
+                request_timeout=self.config.LLM_REQUEST_TIMEOUT,
             )
         elif provider == LLMEnums.OPENAI.value:
             return OpenAIProvider(
@@ -22,6 +27,19 @@ class LLMProviderFactory:
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_output_max_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                max_concurrency=self.config.LLM_MAX_CONCURRENCY,
+                request_timeout=self.config.LLM_REQUEST_TIMEOUT,
             )
 
         return None
+
+    def with_embedding_cache(self, provider: LLMInterface, cache_dir: str):
+        if not provider:
+            return provider
+
+        cache = EmbeddingCache(
+            db_path=os.path.join(cache_dir, "embeddings.sqlite3"),
+            max_memory_entries=self.config.EMBEDDING_CACHE_MAX_MEMORY_ENTRIES,
+        )
+
+        return CachedEmbeddingProvider(provider, cache)
@@ -0,0 +1,140 @@
+from ..LLMInterface import LLMInterface
+from ..EmbeddingCache import EmbeddingCache
+from typing import AsyncIterator, List, Union
+import asyncio
+
+
+class CachedEmbeddingProvider(LLMInterface):
+    """Wraps any LLMInterface and serves repeated embeddings from a cache.
+
+    Texts are deduplicated within a batch and only cache misses are sent to
+    the wrapped provider; every other call is forwarded unchanged.
+    """
+
+    def __init__(self, provider: LLMInterface, cache: EmbeddingCache):
+        self.provider = provider
+        self.cache = cache
+        self.provider_name = provider.__class__.__name__
+
+    @property
+    def generation_model_id(self):
+        return self.provider.generation_model_id
+
+    @property
+    def embedding_model_id(self):
+        return self.provider.embedding_model_id
+
+    @property
+    def embedding_size(self):
+        return self.provider.embedding_size
+
+    @property
+    def enums(self):
+        return self.provider.enums
+
+    def process_text(self, text: str):
+        return self.provider.process_text(text)
+
+    def set_generation_model(self, model_id: str):
+        self.provider.set_generation_model(model_id)
+
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.provider.set_embedding_model(model_id, embedding_size)
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int,
+        temperature: float,
+    ):
+        return self.provider.generate_text(
+            prompt, chat_history, max_output_token, temperature
+        )
+
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int,
+        temperature: float,
+    ):
+        return await self.provider.generate_text_async(
+            prompt, chat_history, max_output_token, temperature
+        )
+
+    def generate_text_stream(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int,
+        temperature: float,
+    ) -> AsyncIterator[str]:
+        return self.provider.generate_text_stream(
+            prompt, chat_history, max_output_token, temperature
+        )
+
+    def embed_text(self, text: Union[List[str], str], document_type: str = None):
+        keys, unique_texts = self.get_cache_keys(text, document_type)
+
+        vectors = self.cache.get_many(list(unique_texts.keys()))
+
+        missing_keys = [key for key in unique_texts if key not in vectors]
+        if missing_keys:
+            embedded = self.provider.embed_text(
+                [unique_texts[key] for key in missing_keys], document_type
+            )
+            if not embedded or len(embedded) != len(missing_keys):
+                return None
+
+            new_vectors = dict(zip(missing_keys, embedded))
+            self.cache.put_many(new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    async def embed_text_async(
+        self, text: Union[List[str], str], document_type: str = None
+    ):
+        keys, unique_texts = self.get_cache_keys(text, document_type)
+
+        # SQLite lookups and writes stay off the event loop
+        vectors = await asyncio.to_thread(
+            self.cache.get_many, list(unique_texts.keys())
+        )
+
+        missing_keys = [key for key in unique_texts if key not in vectors]
+        if missing_keys:
+            embedded = await self.provider.embed_text_async(
+                [unique_texts[key] for key in missing_keys], document_type
+            )
+            if not embedded or len(embedded) != len(missing_keys):
+                return None
+
+            new_vectors = dict(zip(missing_keys, embedded))
+            await asyncio.to_thread(self.cache.put_many, new_vectors)
+            vectors.update(new_vectors)
+
+        return [vectors[key] for key in keys]
+
+    def get_cache_keys(self, text: Union[List[str], str], document_type: str):
+        if isinstance(text, str):
+            text = [text]
+
+        keys = [
+            self.cache.make_key(
+                self.provider_name,
+                self.provider.embedding_model_id,
+                document_type,
+                t,
+            )
+            for t in text
+        ]
+
+        # one entry per distinct text, in first-seen order
+        unique_texts = dict(zip(keys, text))
+
+        return keys, unique_texts
+
+    def construct_prompt(self, prompt: str, role: str):
+        return self.provider.construct_prompt(prompt, role)
@@ -1,8 +1,14 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import CohereEnums, DocumentTypeEnums
-from cohere import Client
+from cohere import Client, AsyncClient
+from cohere.core.api_error import ApiError
+import asyncio
+import httpx
 import logging
-from typing import List, Union
+from typing import AsyncIterator, List, Union
+
+# texts the embed endpoint accepts per request
+_EMBED_BATCH_LIMIT = 96
 
 
 class CoHereProvider(LLMInterface):
@@ -13,6 +19,8 @@ class CoHereProvider(LLMInterface):
         default_input_max_characters: int = 1000,
         default_output_max_tokens: int = 1000,
         default_temperature: float = 0.1,
+        max_concurrency: int = 16,
+        request_timeout: float = 60,
     ):
         self.api_key = api_key
         self.default_input_max_characters = default_input_max_characters
@@ -24,6 +32,11 @@ class CoHereProvider(LLMInterface):
         self.embedding_size = None
 
         self.client = Client(api_key=self.api_key)
+        self.async_client = AsyncClient(api_key=self.api_key)
+
+        # bounds in-flight async requests made through this provider
+        self.request_semaphore = asyncio.Semaphore(max_concurrency)
+        self.request_timeout = request_timeout
 
         self.logger = logging.getLogger(__name__)
 
@@ -42,14 +55,12 @@ class CoHereProvider(LLMInterface):
             text = text[: self.default_input_max_characters]
         return text
 
-    def generate_text(
-        self,
-        prompt: str,
-        chat_history: list,
-        max_output_token: int,
-        temperature: float,
-    ):
-        if not self.client:
+    def generation_args(
+        self, client, max_output_token: int = None, temperature: float = None
+    ) -> dict:
+        """Request arguments shared by every generation call, ``None`` when
+        the provider cannot generate."""
+        if not client:
             self.logger.error("Cohere client is not initialized properly.")
             return None
 
@@ -57,58 +68,193 @@ class CoHereProvider(LLMInterface):
             self.logger.error("Generation model ID is not set.")
             return None
 
-        max_output_token = (
-            max_output_token
-            if max_output_token is not None
-            else self.default_output_max_tokens
-        )
-        temperature = (
-            temperature if temperature is not None else self.default_temperature
+        return {
+            "model": self.generation_model_id,
+            "max_tokens": (
+                max_output_token
+                if max_output_token is not None
+                else self.default_output_max_tokens
+            ),
+            "temperature": (
+                temperature if temperature is not None else self.default_temperature
+            ),
+        }
+
+    def can_embed(self, client) -> bool:
+        if not client:
+            self.logger.error("Cohere client is not initialized properly.")
+            return False
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model ID is not set.")
+            return False
+
+        return True
+
+    def embed_args(self, text: Union[List[str], str], document_type: str) -> dict:
+        if isinstance(text, str):
+            text = [text]
+
+        return {
+            "model": self.embedding_model_id,
+            "texts": [self.process_text(t) for t in text],
+            "input_type": self.get_input_type(document_type),
+            "embedding_types": ["float"],
+        }
+
+    def response_text(self, response):
+        if not response or not response.text:
+            self.logger.error("No response from Cohere API.")
+            return None
+
+        return response.text
+
+    def response_embeddings(self, response):
+        if not response or not response.embeddings or not response.embeddings.float:
+            self.logger.error("No embedding returned from Cohere API.")
+            return None
+        return [f for f in response.embeddings.float]
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int,
+        temperature: float,
+    ):
+        generation_args = self.generation_args(
+            self.client, max_output_token, temperature
         )
+        if generation_args is None:
+            return None
 
         response = self.client.chat(
-            model=self.generation_model_id,
             chat_history=chat_history,
             message=self.process_text(prompt),
-            max_tokens=max_output_token,
-            temperature=temperature,
+            **generation_args,
         )
+        return self.response_text(response)
 
-        if not response or not response.text:
-            self.logger.error("No response from Cohere API.")
+    def embed_text(self, text: Union[List[str], str], document_type: str):
+        if not self.can_embed(self.client):
             return None
 
-        return response.text
+        response = self.client.embed(**self.embed_args(text, document_type))
+        return self.response_embeddings(response)
 
-    def embed_text(self, text: Union[List[str], str], document_type: str):
-        if not self.client:
-            self.logger.error("Cohere client is not initialized properly.")
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int,
+        temperature: float,
+    ):
+        generation_args = self.generation_args(
+            self.async_client, max_output_token, temperature
+        )
+        if generation_args is None:
+            return None
+
+        try:
+            async with self.request_semaphore:
+                response = await asyncio.wait_for(
+                    self.async_client.chat(
+                        chat_history=chat_history,
+                        message=self.process_text(prompt),
+                        **generation_args,
+                    ),
+                    timeout=self.request_timeout,
+                )
+        except asyncio.TimeoutError:
+            self.logger.error("Cohere generation timed out.")
+            return None
+        except (ApiError, httpx.HTTPError) as e:
+            self.logger.error("Cohere generation failed: %s", e)
+            return None
+
+        return self.response_text(response)
+
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int,
+        temperature: float,
+    ) -> AsyncIterator[str]:
+        generation_args = self.generation_args(
+            self.async_client, max_output_token, temperature
+        )
+        if generation_args is None:
+            return
+
+        # the timeout bounds each wait for the next event, not the whole answer
+        try:
+            async with self.request_semaphore:
+                events = aiter(
+                    self.async_client.chat_stream(
+                        chat_history=chat_history,
+                        message=self.process_text(prompt),
+                        **generation_args,
+                    )
+                )
+                while True:
+                    try:
+                        event = await asyncio.wait_for(
+                            anext(events), timeout=self.request_timeout
+                        )
+                    except StopAsyncIteration:
+                        break
+
+                    if event.event_type == "text-generation" and event.text:
+                        yield event.text
+        except asyncio.TimeoutError:
+            # raised on, so a cut-off answer is never taken for a complete one
+            self.logger.error("Cohere generation timed out.")
+            raise
+
+    async def embed_text_async(self, text: Union[List[str], str], document_type: str):
+        if not self.can_embed(self.async_client):
             return None
 
         if isinstance(text, str):
             text = [text]
 
-        if not self.embedding_model_id:
-            self.logger.error("Embedding model ID is not set.")
+        # provider-sized slices sent concurrently, within request_semaphore
+        embedded = await asyncio.gather(
+            *(
+                self.embed_slice_async(
+                    text[start : start + _EMBED_BATCH_LIMIT], document_type
+                )
+                for start in range(0, len(text), _EMBED_BATCH_LIMIT)
+            )
+        )
+        if any(vectors is None for vectors in embedded):
+            return None
+
+        return [vector for vectors in embedded for vector in vectors]
+
+    async def embed_slice_async(self, texts: List[str], document_type: str):
+        try:
+            async with self.request_semaphore:
+                response = await asyncio.wait_for(
+                    self.async_client.embed(**self.embed_args(texts, document_type)),
+                    timeout=self.request_timeout,
+                )
+        except asyncio.TimeoutError:
+            self.logger.error("Cohere embedding timed out.")
+            return None
+        except (ApiError, httpx.HTTPError) as e:
+            self.logger.error("Cohere embedding failed: %s", e)
             return None
 
-        input_type = (
+        return self.response_embeddings(response)
+
+    def get_input_type(self, document_type: str) -> str:
+        return (
             self.enums.DOCUMENT.value
             if document_type == DocumentTypeEnums.DOCUMENT.value
             else self.enums.QUERY.value
         )
 
-        response = self.client.embed(
-            model=self.embedding_model_id,
-            texts=[self.process_text(t) for t in text],
-            input_type=input_type,
-            embedding_types=["float"],
-        )
-
-        if not response or not response.embeddings or not response.embeddings.float:
-            self.logger.error("No embedding returned from Cohere API.")
-            return None
-        return [f for f in response.embeddings.float]
-
     def construct_prompt(self, prompt: str, role: str):
         return {"role": role, "text": prompt}
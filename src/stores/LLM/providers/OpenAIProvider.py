@@ -1,8 +1,12 @@
 from ..LLMInterface import LLMInterface
 from ..LLMEnums import OpenAIEnums
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI, OpenAIError
+import asyncio
 import logging
-from typing import List, Union
+from typing import AsyncIterator, List, Union
+
+# inputs the embeddings endpoint accepts per request
+_EMBED_BATCH_LIMIT = 2048
 
 
 class OpenAIProvider(LLMInterface):
@@ -14,6 +18,8 @@ class OpenAIProvider(LLMInterface):
         default_input_max_characters: int = 1000,
         default_output_max_tokens: int = 1000,
         default_temperature: float = 0.1,
+        max_concurrency: int = 16,
+        request_timeout: float = 60,
     ):
         self.api_key = api_key
         self.api_url = api_url
@@ -26,6 +32,12 @@ class OpenAIProvider(LLMInterface):
         self.embedding_size = None
 
         self.client = OpenAI(api_key=self.api_key, base_url=self.api_url)
+        self.async_client = AsyncOpenAI(api_key=self.api_key, base_url=self.api_url)
+
+        # bounds in-flight async requests made through this provider
+        self.request_semaphore = asyncio.Semaphore(max_concurrency)
+        self.request_timeout = request_timeout
+
         self.logger = logging.getLogger(__name__)
 
         self.enums = OpenAIEnums
@@ -37,14 +49,12 @@ class OpenAIProvider(LLMInterface):
         self.embedding_model_id = model_id
         self.embedding_size = embedding_size
 
-    def generate_text(
-        self,
-        prompt: str,
-        chat_history: list = [],
-        max_output_token: int = None,
-        temperature: float = None,
-    ):
-        if not self.client:
+    def generation_args(
+        self, client, max_output_token: int = None, temperature: float = None
+    ) -> dict:
+        """Request arguments shared by every generation call, ``None`` when
+        the provider cannot generate."""
+        if not client:
             self.logger.error("OpenAI client is not initialized properly.")
             return None
 
@@ -52,24 +62,30 @@ class OpenAIProvider(LLMInterface):
             self.logger.error("Generation model ID is not set.")
             return None
 
-        max_output_token = (
-            max_output_token
-            if max_output_token is not None
-            else self.default_output_max_tokens
-        )
-        temperature = (
-            temperature if temperature is not None else self.default_temperature
-        )
+        return {
+            "model": self.generation_model_id,
+            "max_tokens": (
+                max_output_token
+                if max_output_token is not None
+                else self.default_output_max_tokens
+            ),
+            "temperature": (
+                temperature if temperature is not None else self.default_temperature
+            ),
+        }
 
-        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+    def can_embed(self, client) -> bool:
+        if not client:
+            self.logger.error("OpenAI client is not initialized properly.")
+            return False
 
-        response = self.client.chat.completions.create(
-            model=self.generation_model_id,
-            messages=chat_history,
-            max_tokens=max_output_token,
-            temperature=temperature,
-        )
+        if not self.embedding_model_id or not self.embedding_size:
+            self.logger.error("Embedding model ID or size is not set.")
+            return False
 
+        return True
+
+    def response_text(self, response):
         if (
             not response
             or not response.choices
@@ -81,13 +97,40 @@ class OpenAIProvider(LLMInterface):
 
         return response.choices[0].message.content
 
-    def embed_text(self, text: Union[List[str], str], document_type: str = None):
-        if not self.client:
-            self.logger.error("OpenAI client is not initialized properly.")
+    def response_embeddings(self, response):
+        if (
+            not response
+            or not response.data
+            or len(response.data) == 0
+            or not response.data[0].embedding
+        ):
+            self.logger.error("Failed to get embedding from OpenAI.")
             return None
 
-        if not self.embedding_model_id or not self.embedding_size:
-            self.logger.error("Embedding model ID or size is not set.")
+        return [f.embedding for f in response.data]
+
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_token: int = None,
+        temperature: float = None,
+    ):
+        generation_args = self.generation_args(
+            self.client, max_output_token, temperature
+        )
+        if generation_args is None:
+            return None
+
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+
+        response = self.client.chat.completions.create(
+            messages=chat_history, **generation_args
+        )
+        return self.response_text(response)
+
+    def embed_text(self, text: Union[List[str], str], document_type: str = None):
+        if not self.can_embed(self.client):
             return None
 
         if isinstance(text, str):
@@ -96,17 +139,118 @@ class OpenAIProvider(LLMInterface):
         response = self.client.embeddings.create(
             input=text, model=self.embedding_model_id
         )
+        return self.response_embeddings(response)
 
-        if (
-            not response
-            or not response.data
-            or len(response.data) == 0
-            or not response.data[0].embedding
-        ):
-            self.logger.error("Failed to get embedding from OpenAI.")
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int = None,
+        temperature: float = None,
+    ):
+        generation_args = self.generation_args(
+            self.async_client, max_output_token, temperature
+        )
+        if generation_args is None:
             return None
 
-        return [f.embedding for f in response.data]
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+
+        try:
+            async with self.request_semaphore:
+                response = await asyncio.wait_for(
+                    self.async_client.chat.completions.create(
+                        messages=chat_history, **generation_args
+                    ),
+                    timeout=self.request_timeout,
+                )
+        except asyncio.TimeoutError:
+            self.logger.error("OpenAI generation timed out.")
+            return None
+        except OpenAIError as e:
+            self.logger.error("OpenAI generation failed: %s", e)
+            return None
+
+        return self.response_text(response)
+
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        chat_history: list,
+        max_output_token: int = None,
+        temperature: float = None,
+    ) -> AsyncIterator[str]:
+        generation_args = self.generation_args(
+            self.async_client, max_output_token, temperature
+        )
+        if generation_args is None:
+            return
+
+        chat_history.append(self.construct_prompt(prompt, self.enums.USER.value))
+
+        # the timeout bounds each wait for the next piece, not the whole answer
+        try:
+            async with self.request_semaphore:
+                stream = await asyncio.wait_for(
+                    self.async_client.chat.completions.create(
+                        messages=chat_history, stream=True, **generation_args
+                    ),
+                    timeout=self.request_timeout,
+                )
+                chunks = aiter(stream)
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(
+                            anext(chunks), timeout=self.request_timeout
+                        )
+                    except StopAsyncIteration:
+                        break
+
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+        except asyncio.TimeoutError:
+            # raised on, so a cut-off answer is never taken for a complete one
+            self.logger.error("OpenAI generation timed out.")
+            raise
+
+    async def embed_text_async(
+        self, text: Union[List[str], str], document_type: str = None
+    ):
+        if not self.can_embed(self.async_client):
+            return None
+
+        if isinstance(text, str):
+            text = [text]
+
+        # provider-sized slices sent concurrently, within request_semaphore
+        embedded = await asyncio.gather(
+            *(
+                self.embed_slice_async(text[start : start + _EMBED_BATCH_LIMIT])
+                for start in range(0, len(text), _EMBED_BATCH_LIMIT)
+            )
+        )
+        if any(vectors is None for vectors in embedded):
+            return None
+
+        return [vector for vectors in embedded for vector in vectors]
+
+    async def embed_slice_async(self, texts: List[str]):
+        try:
+            async with self.request_semaphore:
+                response = await asyncio.wait_for(
+                    self.async_client.embeddings.create(
+                        input=texts, model=self.embedding_model_id
+                    ),
+                    timeout=self.request_timeout,
+                )
+        except asyncio.TimeoutError:
+            self.logger.error("OpenAI embedding timed out.")
+            return None
+        except OpenAIError as e:
+            self.logger.error("OpenAI embedding failed: %s", e)
+            return None
+
+        return self.response_embeddings(response)
 
     def construct_prompt(self, prompt: str, role: str):
         return {"role": role, "content": prompt}
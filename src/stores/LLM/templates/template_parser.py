@@ -1,50 +1,114 @@
+from string import Template
+from typing import Dict, List
+import importlib
+import pkgutil
 import os
 
+_LOCALES_PACKAGE = "src.stores.LLM.templates.locales"
+
+
+class CompiledTemplate:
+    """A ``string.Template`` parsed once into literal text and placeholders."""
+
+    def __init__(self, template: Template):
+        source = template.template
+        position = 0
+        # even indexes hold literal text, odd ones placeholder names
+        parts = [""]
+
+        for match in template.pattern.finditer(source):
+            parts[-1] += source[position : match.start()]
+            position = match.end()
+
+            name = match.group("named") or match.group("braced")
+            if name:
+                parts.extend([name, ""])
+            elif match.group("escaped") is not None:
+                parts[-1] += template.delimiter
+            else:
+                raise ValueError(f"Invalid placeholder in template: {source!r}")
+
+        parts[-1] += source[position:]
+        self.parts = tuple(parts)
+
+    def substitute(self, vars: dict) -> str:
+        # a missing variable raises KeyError, like Template.substitute
+        parts = list(self.parts)
+        for i in range(1, len(parts), 2):
+            parts[i] = str(vars[parts[i]])
+        return "".join(parts)
+
 
 class TemplateParser:
+    """Prompt templates of every locale, loaded and compiled once.
+
+    Each ``locales/<language>/<group>.py`` module contributes its
+    ``string.Template`` attributes. Lookups for the current language fall
+    back to the default language per key, through a view merged when the
+    language is set, so rendering never touches the filesystem.
+    """
+
     def __init__(self, language: str = "en", default_language: str = "en"):
         self.current_path = os.path.dirname(os.path.abspath(__file__))
         self.default_language = default_language
+
+        # language -> group -> key -> template
+        self.templates = self.load_templates()
+
         self.language = default_language
+        self.active = {}
         self.set_language(language)
 
-    def set_language(self, language: str):
+    def load_templates(self) -> Dict[str, Dict[str, Dict[str, CompiledTemplate]]]:
+        locales_path = os.path.join(self.current_path, "locales")
+        templates = {}
 
-        language_path = os.path.join(self.current_path, "locales", language)
+        for language in pkgutil.iter_modules([locales_path]):
+            if not language.ispkg:
+                continue
 
-        if language and os.path.exists(language_path):
-            self.language = language
-        else:
-            self.language = self.default_language
+            groups = {}
+            language_path = os.path.join(locales_path, language.name)
+            for group in pkgutil.iter_modules([language_path]):
+                module = importlib.import_module(
+                    f"{_LOCALES_PACKAGE}.{language.name}.{group.name}"
+                )
+                groups[group.name] = {
+                    key: CompiledTemplate(value)
+                    for key, value in vars(module).items()
+                    if isinstance(value, Template)
+                }
+            templates[language.name] = groups
 
-    def get(self, group: str, key: str, vars: dict = {}):
-        if not group or not key:
-            return None
+        if self.default_language not in templates:
+            raise ValueError(f"No templates for language {self.default_language}")
 
-        targeted_language = self.language
+        return templates
 
-        group_path = os.path.join(
-            self.current_path, "locales", self.language, f"{group}.py"
-        )
+    def set_language(self, language: str):
+        if language and language in self.templates:
+            self.language = language
+        else:
+            self.language = self.default_language
 
-        if not os.path.exists(group_path):
-            group_path = os.path.join(
-                self.current_path, "locales", self.default_language, f"{group}.py"
-            )
-            targeted_language = self.default_language
+        defaults = self.templates[self.default_language]
+        selected = self.templates[self.language]
+        self.active = {
+            group: {**defaults.get(group, {}), **selected.get(group, {})}
+            for group in defaults.keys() | selected.keys()
+        }
 
-        if not os.path.exists(group_path):
+    def get(self, group: str, key: str, vars: dict = {}):
+        template = self.active.get(group, {}).get(key)
+        if template is None:
             return None
 
-        # import group module
-        module = __import__(
-            f"src.stores.LLM.templates.locales.{targeted_language}.{group}",
-            fromlist=[group],
-        )
+        return template.substitute(vars)
 
-        if not module:
+    def render_many(self, group: str, key: str, vars_list: List[dict]) -> List[str]:
+        """Render one template for each dict of ``vars_list``."""
+        template = self.active.get(group, {}).get(key)
+        if template is None:
             return None
 
-        key_attribute = getattr(module, key)
-
-        return key_attribute.substitute(vars)
+        return [template.substitute(vars) for vars in vars_list]
@@ -0,0 +1,73 @@
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Optional
+import asyncio
+import time
+
+
+@dataclass
+class CollectionMetadata:
+    name: str
+    dimension: Optional[int] = None
+    row_count: Optional[int] = None  # approximate
+    has_index: Optional[bool] = None
+    storage_mode: Optional[str] = None
+    details: dict = field(default_factory=dict)
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+class CollectionRegistry:
+    """Caches collection metadata so hot paths skip catalog round trips.
+
+    Only existing collections are cached, and only for ``ttl_seconds``, so
+    a collection created or dropped by another process is picked up by the
+    next lookup or at the latest once the entry expires. Providers invalidate
+    entries on their own create/delete and whenever a query on a cached
+    collection fails.
+    """
+
+    def __init__(self, ttl_seconds: float = 30):
+        self.ttl_seconds = ttl_seconds
+
+        self.entries: Dict[str, CollectionMetadata] = {}
+        self.locks: Dict[str, asyncio.Lock] = {}
+
+    async def get(
+        self,
+        collection_name: str,
+        loader: Callable[[str], Awaitable[Optional[CollectionMetadata]]],
+    ) -> Optional[CollectionMetadata]:
+        metadata = self.get_cached(collection_name)
+        if metadata is not None:
+            return metadata
+
+        # one catalog lookup per collection even when many requests miss at once
+        lock = self.locks.setdefault(collection_name, asyncio.Lock())
+        async with lock:
+            metadata = self.get_cached(collection_name)
+            if metadata is not None:
+                return metadata
+
+            metadata = await loader(collection_name)
+            if metadata is None:
+                self.entries.pop(collection_name, None)
+            else:
+                self.entries[collection_name] = metadata
+
+        return metadata
+
+    def get_cached(self, collection_name: str) -> Optional[CollectionMetadata]:
+        metadata = self.entries.get(collection_name)
+        if metadata is None:
+            return None
+
+        if time.monotonic() - metadata.loaded_at > self.ttl_seconds:
+            self.entries.pop(collection_name, None)
+            return None
+
+        return metadata
+
+    def invalidate(self, collection_name: str = None):
+        if collection_name is None:
+            self.entries.clear()
+        else:
+            self.entries.pop(collection_name, None)
@@ -0,0 +1,871 @@
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import threading
+import sqlite3
+import fcntl
+import json
+import math
+import os
+import shutil
+
+_DB_FILE = "collection.sqlite3"
+_LOCK_FILE = ".lock"
+
+# rows scored per matrix product, bounds the temporaries on large collections
+_BLOCK_ROWS = 65536
+# scores held per block when many queries are searched at once
+_BATCH_BLOCK_SCORES = 1 << 22
+# sqlite's default limit on bound parameters is 999 on older builds
+_SQL_BATCH = 500
+
+_KMEANS_ITERATIONS = 10
+_KMEANS_POINTS_PER_LIST = 64
+
+
+@dataclass(frozen=True)
+class _State:
+    # an immutable snapshot, searches keep using it while a writer reloads
+    meta: dict
+    vectors: np.ndarray
+    deleted: np.ndarray
+    centroids: Optional[np.ndarray] = None
+    list_rows: Optional[np.ndarray] = None
+    list_offsets: Optional[np.ndarray] = None
+
+    @property
+    def count(self) -> int:
+        return self.meta["count"]
+
+    @property
+    def live_count(self) -> int:
+        return self.count - int(self.deleted.sum())
+
+
+class EmbeddedCollection:
+    """One collection of the embedded vector store, kept as files in ``path``.
+
+    Vectors live in an append-only float32 matrix that is memory-mapped on
+    open, so start-up reads nothing and the OS pages rows in on demand.
+    Payloads, tombstones and the collection metadata live in SQLite; its
+    ``count`` is the commit point of every append. Large collections get an
+    IVF index: k-means centroids plus the inverted list of every row.
+
+    Writers serialize on an flock, so several worker processes can share a
+    collection; readers reload when SQLite's ``data_version`` moves.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self.state = None
+        self.data_version = None
+
+        # readers and writers use separate connections, so a long index
+        # build never holds up searches
+        self.connection = self._connect()
+        self.writer = self._connect()
+        with self.writer:
+            self.writer.execute(
+                "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self.writer.execute(
+                "CREATE TABLE IF NOT EXISTS records ("
+                "row INTEGER PRIMARY KEY, record_id INTEGER, text TEXT, "
+                "metadata TEXT, content_hash TEXT, embedding_model TEXT, "
+                "deleted INTEGER NOT NULL DEFAULT 0, "
+                "asset_id INTEGER, chunk_order INTEGER)"
+            )
+            # collections created before filter columns were stored
+            columns = {
+                column[1]
+                for column in self.writer.execute("PRAGMA table_info(records)")
+            }
+            for column in ("asset_id", "chunk_order"):
+                if column not in columns:
+                    self.writer.execute(
+                        f"ALTER TABLE records ADD COLUMN {column} INTEGER"
+                    )
+            self.writer.execute(
+                "CREATE INDEX IF NOT EXISTS ix_records_record_id "
+                "ON records (record_id)"
+            )
+            self.writer.execute(
+                "CREATE INDEX IF NOT EXISTS ix_records_asset_order "
+                "ON records (asset_id, chunk_order)"
+            )
+            self._create_text_index()
+
+    def _create_text_index(self):
+        # an external-content FTS5 index over records.text, kept in step by
+        # triggers so appends, truncations and compaction renumbering all
+        # carry over without extra writes in the Python paths
+        has_index = self.writer.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'records_fts'"
+        ).fetchone()
+        if has_index:
+            return
+
+        self.writer.execute(
+            "CREATE VIRTUAL TABLE records_fts USING fts5("
+            "text, content='records', content_rowid='row')"
+        )
+        self.writer.execute(
+            "CREATE TRIGGER IF NOT EXISTS records_fts_insert "
+            "AFTER INSERT ON records BEGIN "
+            "INSERT INTO records_fts (rowid, text) VALUES (new.row, new.text); END"
+        )
+        self.writer.execute(
+            "CREATE TRIGGER IF NOT EXISTS records_fts_delete "
+            "AFTER DELETE ON records BEGIN "
+            "INSERT INTO records_fts (records_fts, rowid, text) "
+            "VALUES ('delete', old.row, old.text); END"
+        )
+        self.writer.execute(
+            "CREATE TRIGGER IF NOT EXISTS records_fts_update "
+            "AFTER UPDATE OF row, text ON records BEGIN "
+            "INSERT INTO records_fts (records_fts, rowid, text) "
+            "VALUES ('delete', old.row, old.text); "
+            "INSERT INTO records_fts (rowid, text) VALUES (new.row, new.text); END"
+        )
+        # collections created before lexical search was stored
+        self.writer.execute("INSERT INTO records_fts (records_fts) VALUES ('rebuild')")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(
+            os.path.join(self.path, _DB_FILE), check_same_thread=False
+        )
+        connection.execute("PRAGMA journal_mode=WAL")
+        return connection
+
+    @staticmethod
+    def exists(path: str) -> bool:
+        return os.path.exists(os.path.join(path, _DB_FILE))
+
+    @classmethod
+    def create(
+        cls, path: str, dimension: int, distance: str
+    ) -> "EmbeddedCollection":
+        os.makedirs(path, exist_ok=True)
+        collection = cls(path)
+        with collection._write_lock() as state:
+            if state is None:
+                open(collection._vectors_path(0), "wb").close()
+                collection._commit_meta(
+                    {
+                        "dimension": dimension,
+                        "distance": distance,
+                        "count": 0,
+                        "generation": 0,
+                        "index": None,
+                    }
+                )
+        return collection
+
+    @classmethod
+    def open(cls, path: str) -> "EmbeddedCollection":
+        collection = cls(path)
+        if collection.refresh() is None:
+            collection.close()
+            raise FileNotFoundError(f"No collection metadata in {path}")
+        return collection
+
+    def close(self):
+        with self.lock:
+            self.connection.close()
+            self.writer.close()
+            self.state = None
+
+    def destroy(self):
+        self.close()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def info(self) -> dict:
+        state = self.refresh()
+        index = state.meta["index"]
+        deleted_count = state.count - state.live_count
+
+        index_bytes = 0
+        if index is not None:
+            index_bytes = state.centroids.nbytes + 4 * state.count
+
+        return {
+            "record_count": state.live_count,
+            "deleted_count": deleted_count,
+            "dimension": state.meta["dimension"],
+            "distance": state.meta["distance"],
+            "has_index": index is not None,
+            "index": index,
+            "memory": {
+                "vectors_bytes": state.vectors.nbytes,
+                "index_bytes": index_bytes,
+            },
+        }
+
+    # ------------------------------------------------------------------ reads
+
+    def refresh(self) -> Optional[_State]:
+        with self.lock:
+            version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            if version != self.data_version or self.state is None:
+                try:
+                    self.state = self._load()
+                except FileNotFoundError:
+                    # a compaction replaced the files between two reads
+                    self.state = self._load()
+                self.data_version = version
+            return self.state
+
+    def _load(self) -> Optional[_State]:
+        meta = {
+            key: json.loads(value)
+            for key, value in self.connection.execute("SELECT key, value FROM meta")
+        }
+        if not meta:
+            return None
+
+        count = meta["count"]
+        dimension = meta["dimension"]
+
+        if count:
+            vectors = np.memmap(
+                self._vectors_path(meta["generation"]),
+                dtype=np.float32,
+                mode="r",
+                shape=(count, dimension),
+            )
+        else:
+            vectors = np.empty((0, dimension), dtype=np.float32)
+
+        deleted = np.zeros(count, dtype=bool)
+        deleted_rows = [
+            row
+            for (row,) in self.connection.execute(
+                "SELECT row FROM records WHERE deleted = 1 AND row < ?", (count,)
+            )
+        ]
+        deleted[deleted_rows] = True
+
+        centroids = list_rows = list_offsets = None
+        index = meta["index"]
+        if index is not None and count:
+            centroids = np.fromfile(
+                self._centroids_path(index["generation"]), dtype=np.float32
+            ).reshape(-1, dimension)
+            assignments = np.memmap(
+                self._assignments_path(index["generation"]),
+                dtype=np.int32,
+                mode="r",
+                shape=(count,),
+            )
+            # inverted lists as one row array plus per-list offsets
+            list_rows = np.argsort(assignments, kind="stable")
+            list_offsets = np.searchsorted(
+                assignments[list_rows], np.arange(len(centroids) + 1)
+            )
+
+        return _State(
+            meta=meta,
+            vectors=vectors,
+            deleted=deleted,
+            centroids=centroids,
+            list_rows=list_rows,
+            list_offsets=list_offsets,
+        )
+
+    def get_fingerprints(self, record_ids: List[int]) -> Dict[int, Tuple[str, str]]:
+        state = self.refresh()
+        fingerprints = {}
+        with self.lock:
+            for start in range(0, len(record_ids), _SQL_BATCH):
+                batch = list(record_ids[start : start + _SQL_BATCH])
+                placeholders = ",".join("?" * len(batch))
+                rows = self.connection.execute(
+                    "SELECT record_id, content_hash, embedding_model FROM records "
+                    f"WHERE deleted = 0 AND row < ? AND record_id IN ({placeholders})",
+                    [state.count, *batch],
+                )
+                for record_id, content_hash, embedding_model in rows:
+                    fingerprints[record_id] = (content_hash, embedding_model)
+        return fingerprints
+
+    def list_record_ids(self) -> List[int]:
+        state = self.refresh()
+        with self.lock:
+            return [
+                record_id
+                for (record_id,) in self.connection.execute(
+                    "SELECT record_id FROM records WHERE deleted = 0 AND row < ? "
+                    "ORDER BY row",
+                    (state.count,),
+                )
+            ]
+
+    def search(
+        self,
+        vector: list,
+        limit: int,
+        probes: int = None,
+        exact: bool = False,
+        where: str = "",
+        params: tuple = (),
+        with_vectors: bool = False,
+    ) -> List[Tuple]:
+        """Top ``limit`` rows by score; ``where`` is a SQL condition on records.
+
+        Rows are (text, record_id, score), with the stored vector appended
+        when ``with_vectors`` is set.
+        """
+        return self.search_many(
+            [vector], limit, probes, exact, where, params, with_vectors
+        )[0]
+
+    def search_many(
+        self,
+        vectors: List[list],
+        limit: int,
+        probes: int = None,
+        exact: bool = False,
+        where: str = "",
+        params: tuple = (),
+        with_vectors: bool = False,
+    ) -> List[List[Tuple]]:
+        while True:
+            state = self.refresh()
+            if state is None or not state.count or limit <= 0 or not len(vectors):
+                return [[] for _ in vectors]
+
+            results = self._search_state(
+                state, vectors, limit, probes, exact, where, params, with_vectors
+            )
+            # None when a compaction renumbered the rows mid-search
+            if results is not None:
+                return results
+
+    def _search_state(
+        self,
+        state: _State,
+        vectors: List[list],
+        limit: int,
+        probes: int = None,
+        exact: bool = False,
+        where: str = "",
+        params: tuple = (),
+        with_vectors: bool = False,
+    ) -> Optional[List[List[Tuple]]]:
+        queries = np.asarray(vectors, dtype=np.float32).reshape(len(vectors), -1)
+        if state.meta["distance"] == "cosine":
+            queries = _normalize(queries)
+
+        allowed = None
+        if where:
+            # the filter runs first on the sqlite indexes, then only matching
+            # rows are scored
+            allowed = self._filter_rows(state, where, params)
+            if allowed is None:
+                return None
+            if not len(allowed):
+                return [[] for _ in vectors]
+
+        use_index = not (
+            exact
+            or state.centroids is None
+            or (probes and probes >= len(state.centroids))
+            # selective filters match fewer rows than the probed lists hold
+            or (
+                allowed is not None
+                and len(allowed) <= (probes or 1) * state.count / len(state.centroids)
+            )
+        )
+
+        if use_index or allowed is not None:
+            hits = [
+                self._search_rows(state, query, limit, probes, use_index, allowed)
+                for query in queries
+            ]
+        else:
+            hits = _batch_top_k(state, queries, limit)
+
+        payloads = self._fetch_payloads(
+            state, sorted({row for rows, _ in hits for row in rows})
+        )
+        if payloads is None:
+            return None
+        return [
+            [
+                (*payloads[row], score)
+                + ((state.vectors[row].tolist(),) if with_vectors else ())
+                for row, score in zip(rows, scores)
+                if row in payloads
+            ]
+            for rows, scores in hits
+        ]
+
+    def search_text(
+        self,
+        tokens: List[str],
+        limit: int,
+        where: str = "",
+        params: tuple = (),
+    ) -> List[Tuple[str, int, float]]:
+        """Top ``limit`` live rows matching any token, ranked by FTS5's BM25."""
+        state = self.refresh()
+        if state is None or not state.count or limit <= 0 or not tokens:
+            return []
+
+        # quoted, so tokens are never read as FTS5 operators
+        query = " OR ".join(f'"{token}"' for token in tokens)
+        with self.lock:
+            return [
+                (text, record_id, -score)
+                for text, record_id, score in self.connection.execute(
+                    "SELECT records.text, records.record_id, "
+                    "bm25(records_fts) AS score "
+                    "FROM records_fts JOIN records ON records.row = records_fts.rowid "
+                    "WHERE records_fts MATCH ? AND records.deleted = 0 "
+                    f"AND records.row < ? {f'AND {where} ' if where else ''}"
+                    "ORDER BY score LIMIT ?",
+                    (query, state.count, *params, limit),
+                )
+            ]
+
+    def _search_rows(
+        self,
+        state: _State,
+        query: np.ndarray,
+        limit: int,
+        probes: int = None,
+        use_index: bool = True,
+        allowed: np.ndarray = None,
+    ) -> Tuple[List[int], List[float]]:
+        rows = allowed
+        if use_index:
+            rows = self._probe_lists(state, query, probes)
+            if allowed is not None:
+                rows = rows[np.isin(rows, allowed, assume_unique=True)]
+                if len(rows) < limit:
+                    # too few matches in the probed lists, score every match
+                    rows = allowed
+
+        scores = _score_rows(state.vectors, query, rows)
+
+        deleted = state.deleted if rows is None else state.deleted[rows]
+        scores[deleted] = -np.inf
+
+        top = _top_k(scores, limit)
+        top = top[np.isfinite(scores[top])]
+        top_rows = top if rows is None else rows[top]
+        return top_rows.tolist(), scores[top].tolist()
+
+    def _probe_lists(
+        self, state: _State, query: np.ndarray, probes: int = None
+    ) -> np.ndarray:
+        # score the centroids, then keep the rows of the closest lists
+        probes = min(max(probes or 1, 1), len(state.centroids))
+        lists = _top_k(state.centroids @ query, probes)
+        rows = np.concatenate(
+            [
+                state.list_rows[
+                    state.list_offsets[list_id] : state.list_offsets[list_id + 1]
+                ]
+                for list_id in lists
+            ]
+        )
+        # ascending rows keep reads from the memory map sequential
+        rows.sort()
+        return rows
+
+    @contextmanager
+    def _read_snapshot(self, state: _State):
+        """One SQLite read transaction over rows numbered as in ``state``.
+
+        Yields False when a compaction renumbered the rows after ``state``
+        was loaded, so row numbers from ``state`` no longer match the records.
+        """
+        with self.lock:
+            self.connection.execute("BEGIN")
+            try:
+                (generation,) = self.connection.execute(
+                    "SELECT value FROM meta WHERE key = 'generation'"
+                ).fetchone()
+                yield json.loads(generation) == state.meta["generation"]
+            finally:
+                self.connection.execute("COMMIT")
+
+    def _filter_rows(
+        self, state: _State, where: str, params: tuple
+    ) -> Optional[np.ndarray]:
+        with self._read_snapshot(state) as current:
+            if not current:
+                return None
+            rows = self.connection.execute(
+                "SELECT row FROM records WHERE deleted = 0 AND row < ? "
+                f"AND {where} ORDER BY row",
+                (state.count, *params),
+            ).fetchall()
+        return np.fromiter((row for (row,) in rows), dtype=np.int64, count=len(rows))
+
+    def _fetch_payloads(
+        self, state: _State, rows: List[int]
+    ) -> Optional[Dict[int, Tuple[str, int]]]:
+        payloads = {}
+        with self._read_snapshot(state) as current:
+            if not current:
+                return None
+            for start in range(0, len(rows), _SQL_BATCH):
+                batch = rows[start : start + _SQL_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                for row, text, record_id in self.connection.execute(
+                    "SELECT row, text, record_id FROM records "
+                    f"WHERE row IN ({placeholders})",
+                    batch,
+                ):
+                    payloads[row] = (text, record_id)
+        return payloads
+
+    # ----------------------------------------------------------------- writes
+
+    @contextmanager
+    def _write_lock(self):
+        with open(os.path.join(self.path, _LOCK_FILE), "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                # another process may have written since the last refresh
+                yield self.refresh()
+                self.refresh()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(
+        self,
+        vectors: List[list],
+        texts: List[str],
+        metadatas: List[dict],
+        record_ids: List[int],
+        content_hashes: List[str],
+        embedding_model: str = None,
+        asset_ids: List[int] = None,
+        chunk_orders: List[int] = None,
+    ) -> int:
+        with self._write_lock() as state:
+            dimension = state.meta["dimension"]
+            vectors = np.asarray(vectors, dtype=np.float32)
+            if vectors.ndim != 2 or vectors.shape[1] != dimension:
+                raise ValueError(
+                    f"vectors must have {dimension} dimensions, got {vectors.shape}"
+                )
+            if state.meta["distance"] == "cosine":
+                vectors = _normalize(vectors)
+
+            count = state.count
+            index = state.meta["index"]
+
+            # anything past count is left over from an append that never committed
+            _append_rows(
+                self._vectors_path(state.meta["generation"]),
+                count * dimension * 4,
+                vectors,
+            )
+            if index is not None:
+                _append_rows(
+                    self._assignments_path(index["generation"]),
+                    count * 4,
+                    _assign(vectors, state.centroids),
+                )
+
+            if asset_ids is None:
+                asset_ids = [None] * len(vectors)
+            if chunk_orders is None:
+                chunk_orders = [None] * len(vectors)
+
+            with self.writer:
+                self.writer.execute("DELETE FROM records WHERE row >= ?", (count,))
+                self._tombstone([_id for _id in record_ids if _id is not None])
+                self.writer.executemany(
+                    "INSERT INTO records (row, record_id, text, metadata, "
+                    "content_hash, embedding_model, asset_id, chunk_order) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            count + i,
+                            record_id,
+                            text,
+                            json.dumps(metadata),
+                            content_hash,
+                            embedding_model,
+                            asset_id,
+                            chunk_order,
+                        )
+                        for i, (
+                            text,
+                            metadata,
+                            record_id,
+                            content_hash,
+                            asset_id,
+                            chunk_order,
+                        ) in enumerate(
+                            zip(
+                                texts,
+                                metadatas,
+                                record_ids,
+                                content_hashes,
+                                asset_ids,
+                                chunk_orders,
+                            )
+                        )
+                    ],
+                )
+                self._set_meta("count", count + len(vectors))
+
+        return len(vectors)
+
+    def delete(self, record_ids: List[int]) -> int:
+        with self._write_lock():
+            with self.writer:
+                return self._tombstone(record_ids)
+
+    def _tombstone(self, record_ids: List[int]) -> int:
+        deleted = 0
+        for start in range(0, len(record_ids), _SQL_BATCH):
+            batch = list(record_ids[start : start + _SQL_BATCH])
+            placeholders = ",".join("?" * len(batch))
+            cursor = self.writer.execute(
+                "UPDATE records SET deleted = 1 "
+                f"WHERE deleted = 0 AND record_id IN ({placeholders})",
+                batch,
+            )
+            deleted += cursor.rowcount
+        return deleted
+
+    def finalize(
+        self,
+        index_threshold: int,
+        rebuild_growth: float = 2.0,
+        compact_ratio: float = 0.2,
+    ) -> dict:
+        """Compact tombstones and (re)build the IVF index when it is due."""
+        actions = {"compacted": False, "indexed": False}
+
+        with self._write_lock() as state:
+            if state.count and state.count - state.live_count >= max(
+                compact_ratio * state.count, 1
+            ):
+                state = self._compact(state)
+                actions["compacted"] = True
+
+            index = state.meta["index"]
+            if state.live_count < index_threshold:
+                if index is not None:
+                    # brute force beats probing lists on small collections
+                    self._commit_meta({"index": None})
+            elif index is None or state.live_count >= (
+                rebuild_growth * index["built_count"]
+            ):
+                self._build_index(state)
+                actions["indexed"] = True
+
+            self._remove_stale_files(self.refresh())
+
+        return actions
+
+    def _build_index(self, state: _State):
+        # callers hold the write lock
+        live_rows = np.flatnonzero(~state.deleted)
+        nlist = max(int(math.sqrt(len(live_rows))), 1)
+
+        centroids = self._train_centroids(state, live_rows, nlist)
+        assignments = np.empty(state.count, dtype=np.int32)
+        for start in range(0, state.count, _BLOCK_ROWS):
+            block = np.asarray(state.vectors[start : start + _BLOCK_ROWS])
+            assignments[start : start + _BLOCK_ROWS] = _assign(block, centroids)
+
+        generation = state.meta.get("index_generation", -1) + 1
+        centroids.tofile(self._centroids_path(generation))
+        assignments.tofile(self._assignments_path(generation))
+
+        self._commit_meta(
+            {
+                "index_generation": generation,
+                "index": {
+                    "generation": generation,
+                    "nlist": nlist,
+                    "built_count": len(live_rows),
+                },
+            }
+        )
+
+    def _train_centroids(
+        self, state: _State, live_rows: np.ndarray, nlist: int
+    ) -> np.ndarray:
+        rng = np.random.default_rng(0)
+        sample_size = min(len(live_rows), nlist * _KMEANS_POINTS_PER_LIST)
+        sample_rows = np.sort(rng.choice(live_rows, sample_size, replace=False))
+        sample = np.asarray(state.vectors[sample_rows], dtype=np.float32)
+
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+        for _ in range(_KMEANS_ITERATIONS):
+            assignments = _assign(sample, centroids)
+
+            # per-list sums with one sort instead of a python loop
+            order = np.argsort(assignments, kind="stable")
+            counts = np.bincount(assignments, minlength=nlist)
+            filled = np.flatnonzero(counts)
+            starts = np.concatenate(([0], np.cumsum(counts)[:-1]))[filled]
+            sums = np.add.reduceat(sample[order], starts, axis=0)
+            centroids[filled] = sums / counts[filled, None]
+
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                centroids[empty] = sample[rng.choice(sample_size, len(empty))]
+
+            if state.meta["distance"] == "cosine":
+                centroids = _normalize(centroids)
+
+        return centroids
+
+    def _compact(self, state: _State) -> _State:
+        # callers hold the write lock; the compacted rows go to a new file
+        # first, so a crash before the commit leaves the old one intact
+        live_rows = np.flatnonzero(~state.deleted)
+        generation = state.meta["generation"] + 1
+
+        with open(self._vectors_path(generation), "wb") as vectors_file:
+            for start in range(0, len(live_rows), _BLOCK_ROWS):
+                rows = live_rows[start : start + _BLOCK_ROWS]
+                vectors_file.write(np.asarray(state.vectors[rows]).tobytes())
+
+        with self.writer:
+            self.writer.execute(
+                "DELETE FROM records WHERE deleted = 1 OR row >= ?", (state.count,)
+            )
+            # ascending order never collides with a row that is still to move
+            self.writer.executemany(
+                "UPDATE records SET row = ? WHERE row = ?",
+                [
+                    (new_row, old_row)
+                    for new_row, old_row in enumerate(live_rows.tolist())
+                    if new_row != old_row
+                ],
+            )
+            self._set_meta("generation", generation)
+            self._set_meta("count", len(live_rows))
+            # row numbers moved, so the index is rebuilt over the new ones
+            self._set_meta("index", None)
+
+        return self.refresh()
+
+    def _remove_stale_files(self, state: _State):
+        # callers hold the write lock; readers that still map an old file
+        # keep its pages until they reload
+        keep = {os.path.basename(self._vectors_path(state.meta["generation"]))}
+        index = state.meta["index"]
+        if index is not None:
+            keep.add(os.path.basename(self._centroids_path(index["generation"])))
+            keep.add(os.path.basename(self._assignments_path(index["generation"])))
+
+        for name in os.listdir(self.path):
+            if name.endswith((".f32", ".i32")) and name not in keep:
+                os.remove(os.path.join(self.path, name))
+
+    def _commit_meta(self, values: dict):
+        with self.writer:
+            for key, value in values.items():
+                self._set_meta(key, value)
+
+    def _set_meta(self, key: str, value):
+        self.writer.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+            (key, json.dumps(value)),
+        )
+
+    def _vectors_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"vectors-{generation}.f32")
+
+    def _centroids_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"ivf-{generation}-centroids.f32")
+
+    def _assignments_path(self, generation: int) -> str:
+        return os.path.join(self.path, f"ivf-{generation}-assignments.i32")
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def _score_rows(
+    vectors: np.ndarray, query: np.ndarray, rows: np.ndarray = None
+) -> np.ndarray:
+    total = len(vectors) if rows is None else len(rows)
+    scores = np.empty(total, dtype=np.float32)
+    for start in range(0, total, _BLOCK_ROWS):
+        if rows is None:
+            block = vectors[start : start + _BLOCK_ROWS]
+        else:
+            block = vectors[rows[start : start + _BLOCK_ROWS]]
+        scores[start : start + _BLOCK_ROWS] = block @ query
+    return scores
+
+
+def _top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    if k < len(scores):
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    return top[np.argsort(-scores[top], kind="stable")]
+
+
+def _batch_top_k(
+    state: _State, queries: np.ndarray, limit: int
+) -> List[Tuple[List[int], List[float]]]:
+    # exact search for many queries at once: one matrix-matrix product per
+    # block of rows, merged into a running top ``limit`` per query
+    k = min(limit, state.count)
+    block_rows = max(_BATCH_BLOCK_SCORES // len(queries), 256)
+
+    best_scores = np.empty((len(queries), 0), dtype=np.float32)
+    best_rows = np.empty((len(queries), 0), dtype=np.int64)
+
+    for start in range(0, state.count, block_rows):
+        block = state.vectors[start : start + block_rows]
+        scores = queries @ block.T
+        scores[:, state.deleted[start : start + block_rows]] = -np.inf
+        rows = np.broadcast_to(
+            np.arange(start, start + len(block), dtype=np.int64), scores.shape
+        )
+
+        scores = np.concatenate([best_scores, scores], axis=1)
+        rows = np.concatenate([best_rows, rows], axis=1)
+        if scores.shape[1] > k:
+            keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            scores = np.take_along_axis(scores, keep, axis=1)
+            rows = np.take_along_axis(rows, keep, axis=1)
+        best_scores, best_rows = scores, rows
+
+    order = np.argsort(-best_scores, axis=1, kind="stable")
+    best_scores = np.take_along_axis(best_scores, order, axis=1)
+    best_rows = np.take_along_axis(best_rows, order, axis=1)
+
+    hits = []
+    for scores, rows in zip(best_scores, best_rows):
+        found = np.isfinite(scores)
+        hits.append((rows[found].tolist(), scores[found].tolist()))
+    return hits
+
+
+def _assign(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    assignments = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), _BLOCK_ROWS):
+        block = vectors[start : start + _BLOCK_ROWS]
+        assignments[start : start + _BLOCK_ROWS] = np.argmax(
+            block @ centroids.T, axis=1
+        )
+    return assignments
+
+
+def _append_rows(path: str, committed_bytes: int, rows: np.ndarray):
+    with open(path, "r+b") as data_file:
+        data_file.truncate(committed_bytes)
+        data_file.seek(committed_bytes)
+        data_file.write(np.ascontiguousarray(rows).tobytes())
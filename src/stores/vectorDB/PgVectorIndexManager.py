@@ -0,0 +1,360 @@
+from .VectorDBEnums import PgVectorIndexTypeEnums
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from sqlalchemy.sql import text as sql_text
+import asyncio
+import logging
+import json
+import math
+import re
+
+# planner estimates this close to a threshold are checked with an exact count
+_ESTIMATE_MARGIN = 0.1
+
+
+@dataclass
+class IndexPlan:
+    index_type: str
+    row_count: int
+    options: dict = field(default_factory=dict)  # the index's WITH (...) parameters
+
+
+class PgVectorIndexManager:
+    """Picks, builds and rebuilds the ANN index of pgvector collections.
+
+    The index type follows the row count: none (exact scans) below
+    ``index_threshold``, IVFFlat with ``lists`` sized to the data below
+    ``hnsw_threshold``, HNSW above it. Builds run ``CREATE INDEX
+    CONCURRENTLY`` outside a transaction, so inserts and searches carry on
+    meanwhile, and record the row count and parameters in the index comment.
+    Row counts are the planner's estimate, counted exactly only close to a
+    threshold.
+    An index of the wrong type, an IVFFlat index whose collection has grown
+    ``rebuild_growth`` times, or an HNSW index with outdated parameters is
+    re-built under a temporary name and swapped in.
+    """
+
+    def __init__(
+        self,
+        db_client,
+        index_threshold: int = 100,
+        hnsw_threshold: int = 50000,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 64,
+        rebuild_growth: float = 2,
+        maintenance_workers: int = 2,
+        maintenance_work_mem: str = "512MB",
+    ):
+        self.db_client = db_client
+        self.index_threshold = index_threshold
+        self.hnsw_threshold = hnsw_threshold
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.rebuild_growth = max(rebuild_growth, 1)
+        self.maintenance_workers = max(maintenance_workers, 0)
+
+        # sent as a SET value, so only a plain size passes
+        if not re.fullmatch(r"\d+\s*(kB|MB|GB)", maintenance_work_mem or ""):
+            raise ValueError(f"Invalid maintenance_work_mem: {maintenance_work_mem}")
+        self.maintenance_work_mem = maintenance_work_mem
+
+        # one build per collection at a time, background ones tracked for close()
+        self.locks: Dict[str, asyncio.Lock] = {}
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+        self.logger = logging.getLogger("uvicorn")
+
+    def plan(self, row_count: int, index_type: str = None) -> IndexPlan:
+        if index_type is None:
+            if row_count < self.index_threshold:
+                index_type = PgVectorIndexTypeEnums.BRUTEFORCE.value
+            elif row_count < self.hnsw_threshold:
+                index_type = PgVectorIndexTypeEnums.IVFFLAT.value
+            else:
+                index_type = PgVectorIndexTypeEnums.HNSW.value
+
+        if index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+            # pgvector's guidance: rows / 1000 lists up to 1M rows, sqrt(rows) after
+            if row_count <= 1_000_000:
+                lists = row_count // 1000
+            else:
+                lists = int(math.sqrt(row_count))
+            return IndexPlan(index_type, row_count, {"lists": max(lists, 1)})
+
+        if index_type == PgVectorIndexTypeEnums.HNSW.value:
+            return IndexPlan(
+                index_type,
+                row_count,
+                {"m": self.hnsw_m, "ef_construction": self.hnsw_ef_construction},
+            )
+
+        return IndexPlan(PgVectorIndexTypeEnums.BRUTEFORCE.value, row_count)
+
+    async def get_index_state(self, index_name: str) -> Optional[dict]:
+        """The index's access method, validity and the plan it was built from."""
+        async with self.db_client() as session:
+            async with session.begin():
+                state_sql = sql_text(
+                    """
+                    SELECT am.amname AS index_type, i.indisvalid AS is_valid,
+                        obj_description(c.oid, 'pg_class') AS comment
+                    FROM pg_class c
+                    JOIN pg_index i ON i.indexrelid = c.oid
+                    JOIN pg_am am ON am.oid = c.relam
+                    WHERE c.oid = to_regclass(:index_name)
+                    """
+                )
+                result = await session.execute(
+                    state_sql, {"index_name": f'"{index_name}"'}
+                )
+                record = result.fetchone()
+
+        if record is None:
+            return None
+
+        # indexes built before the manager existed have no comment
+        built = {}
+        if record.comment:
+            try:
+                built = json.loads(record.comment)
+            except ValueError:
+                pass
+
+        return {
+            "index_type": record.index_type,
+            "is_valid": record.is_valid,
+            "row_count": built.get("row_count"),
+            "options": built.get("options", {}),
+        }
+
+    async def ensure_index(
+        self,
+        collection_name: str,
+        index_name: str,
+        expression: str,
+        index_type: str = None,
+    ) -> str:
+        """Build, rebuild or keep the index; returns the action taken."""
+        lock = self.locks.setdefault(collection_name, asyncio.Lock())
+        async with lock:
+            state = await self.get_index_state(index_name)
+
+            if state is not None and not state["is_valid"]:
+                # left behind by an interrupted concurrent build
+                await self._execute_autocommit(
+                    f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"'
+                )
+                state = None
+
+            row_count = await self.count_rows(collection_name, state)
+            plan = self.plan(row_count, index_type)
+
+            if plan.index_type == PgVectorIndexTypeEnums.BRUTEFORCE.value:
+                # an existing index still beats a scan after rows are deleted
+                return "kept" if state is not None else "skipped"
+
+            if state is None:
+                await self._build(collection_name, index_name, expression, plan)
+                return "built"
+
+            if not self._needs_rebuild(state, plan):
+                return "kept"
+
+            rebuild_name = f"{index_name}_rebuild"
+            await self._execute_autocommit(
+                f'DROP INDEX CONCURRENTLY IF EXISTS "{rebuild_name}"'
+            )
+            await self._build(collection_name, rebuild_name, expression, plan)
+
+            # the swap is the only step that blocks the table, and only briefly
+            async with self.db_client() as session:
+                async with session.begin():
+                    await session.execute(
+                        sql_text(f'DROP INDEX IF EXISTS "{index_name}"')
+                    )
+                    await session.execute(
+                        sql_text(
+                            f'ALTER INDEX "{rebuild_name}" RENAME TO "{index_name}"'
+                        )
+                    )
+                await session.commit()
+            self.logger.info(
+                "Rebuilt index %s with %s over %d rows",
+                index_name,
+                plan.index_type,
+                row_count,
+            )
+            return "rebuilt"
+
+    async def count_rows(self, collection_name: str, state: dict = None) -> int:
+        """The planner's row estimate, or an exact count when it is unknown or
+        close enough to a threshold to change the plan."""
+        async with self.db_client() as session:
+            async with session.begin():
+                # reltuples scaled to the current size, as the planner does,
+                # so rows added since the last ANALYZE are counted too
+                estimate_sql = sql_text(
+                    """
+                    SELECT CASE WHEN c.reltuples < 0 OR c.relpages = 0 THEN NULL
+                        ELSE (c.reltuples / c.relpages * (pg_relation_size(c.oid)
+                            / current_setting('block_size')::float8))::bigint
+                        END AS row_count
+                    FROM pg_class c
+                    WHERE c.oid = to_regclass(:table_name)
+                    """
+                )
+                result = await session.execute(
+                    estimate_sql, {"table_name": f'"{collection_name}"'}
+                )
+                estimate = result.scalar_one_or_none()
+
+                if estimate is not None and not self._near_threshold(
+                    estimate, state
+                ):
+                    return estimate
+
+                result = await session.execute(
+                    sql_text(f'SELECT COUNT(*) FROM "{collection_name}"')
+                )
+                return result.scalar_one()
+
+    def _near_threshold(self, row_count: int, state: dict = None) -> bool:
+        thresholds = [self.index_threshold, self.hnsw_threshold]
+        if state is not None and state["row_count"]:
+            # where an IVFFlat index is due for a rebuild
+            thresholds.append(state["row_count"] * self.rebuild_growth)
+
+        return any(
+            abs(row_count - threshold) <= threshold * _ESTIMATE_MARGIN
+            for threshold in thresholds
+        )
+
+    async def build_secondary_indexes(
+        self, collection_name: str, definitions: Dict[str, str]
+    ) -> List[str]:
+        """Build missing or invalid indexes of ``{name: "USING ... (...)"}``
+        concurrently; returns the names built."""
+        built = []
+        for index_name, definition in definitions.items():
+            state = await self.get_index_state(index_name)
+            if state is not None and state["is_valid"]:
+                continue
+
+            statements = []
+            if state is not None:
+                # left behind by an interrupted concurrent build
+                statements.append(f'DROP INDEX CONCURRENTLY IF EXISTS "{index_name}"')
+            statements.append(
+                f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+                f'ON "{collection_name}" {definition}'
+            )
+            await self._execute_autocommit(*statements, build_settings=True)
+            built.append(index_name)
+
+        if built:
+            self.logger.info("Built indexes %s on %s", built, collection_name)
+        return built
+
+    def schedule(
+        self,
+        collection_name: str,
+        index_name: str,
+        expression: str,
+        index_type: str = None,
+    ) -> asyncio.Task:
+        """Run ``ensure_index`` in the background, once per collection at a time."""
+        task = self.tasks.get(collection_name)
+        if task is not None and not task.done():
+            return task
+
+        async def run():
+            try:
+                return await self.ensure_index(
+                    collection_name, index_name, expression, index_type
+                )
+            except Exception as e:
+                self.logger.error(
+                    "Error indexing collection %s: %s", collection_name, e
+                )
+            finally:
+                self.tasks.pop(collection_name, None)
+
+        task = asyncio.create_task(run())
+        self.tasks[collection_name] = task
+        return task
+
+    async def close(self):
+        tasks = list(self.tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.tasks = {}
+
+    def _needs_rebuild(self, state: dict, plan: IndexPlan) -> bool:
+        if state["index_type"] != plan.index_type:
+            return True
+
+        built_rows = state["row_count"]
+        if not built_rows:
+            # unknown size, the first check records it with a rebuild
+            return True
+
+        if plan.index_type == PgVectorIndexTypeEnums.HNSW.value:
+            # the graph takes inserts as they come, only new parameters matter
+            return state["options"] != plan.options
+
+        # IVFFlat centroids are trained once, so lists drift as rows arrive
+        return plan.row_count >= built_rows * self.rebuild_growth
+
+    async def _build(
+        self, collection_name: str, index_name: str, expression: str, plan: IndexPlan
+    ):
+        options = ", ".join(f"{key} = {value}" for key, value in plan.options.items())
+        comment = json.dumps({"row_count": plan.row_count, "options": plan.options})
+
+        self.logger.info(
+            "Building %s index %s over %d rows %s",
+            plan.index_type,
+            index_name,
+            plan.row_count,
+            plan.options,
+        )
+        await self._execute_autocommit(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{index_name}" '
+            f'ON "{collection_name}" USING {plan.index_type} ({expression})'
+            f"{f' WITH ({options})' if options else ''}",
+            f"COMMENT ON INDEX \"{index_name}\" IS '{comment}'",
+            build_settings=True,
+        )
+
+    async def _execute_autocommit(
+        self, *statements: str, build_settings: bool = False
+    ):
+        # CONCURRENTLY cannot run inside a transaction block
+        async with self.db_client() as session:
+            connection = await session.connection(
+                execution_options={"isolation_level": "AUTOCOMMIT"}
+            )
+            if build_settings:
+                # session-level SETs, reset below before the connection
+                # goes back to the pool
+                await connection.execute(
+                    sql_text(
+                        "SELECT set_config('max_parallel_maintenance_workers', "
+                        ":workers, false), "
+                        "set_config('maintenance_work_mem', :work_mem, false)"
+                    ),
+                    {
+                        "workers": str(self.maintenance_workers),
+                        "work_mem": self.maintenance_work_mem,
+                    },
+                )
+            try:
+                for statement in statements:
+                    await connection.execute(sql_text(statement))
+            finally:
+                if build_settings:
+                    await connection.execute(
+                        sql_text("RESET max_parallel_maintenance_workers")
+                    )
+                    await connection.execute(sql_text("RESET maintenance_work_mem"))
@@ -4,6 +4,7 @@ from enum import Enum
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
+    EMBEDDED = "EMBEDDED"
 
 
 class DistanceMethodEnums(Enum):
@@ -11,9 +12,32 @@ class DistanceMethodEnums(Enum):
     DOT = "dot"
 
 
+class SearchModeEnums(Enum):
+    VECTOR = "vector"
+    LEXICAL = "lexical"
+    HYBRID = "hybrid"  # vector and lexical, merged by reciprocal rank fusion
+
+
+class VectorStorageModeEnums(Enum):
+    FLOAT32 = "float32"
+    HALFVEC = "halfvec"  # float16, pgvector halfvec / qdrant float16 datatype
+    SCALAR = "scalar"  # int8, qdrant only
+    BINARY = "binary"  # 1 bit per dimension
+
+
 class PgVectorDistanceMethodEnums(Enum):
     COSINE = "vector_cosine_ops"
-    DOT = "vector_12_ops"
+    DOT = "vector_ip_ops"
+    HALFVEC_COSINE = "halfvec_cosine_ops"
+    HALFVEC_DOT = "halfvec_ip_ops"
+    BIT_HAMMING = "bit_hamming_ops"
+
+
+class PgVectorDistanceOperatorEnums(Enum):
+    # must match the operator class the index was built with
+    COSINE = "<=>"
+    DOT = "<#>"  # negative inner product
+    HAMMING = "<~>"
 
 
 class PgVecotrTableSchemeEnums(Enum):
@@ -22,6 +46,11 @@ class PgVecotrTableSchemeEnums(Enum):
     METADATA = "metadata"
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
+    CONTENT_HASH = "content_hash"
+    EMBEDDING_MODEL = "embedding_model"
+    ASSET_ID = "asset_id"
+    CHUNK_ORDER = "chunk_order"
+    TEXT_SEARCH = "text_search"
     _PREFIX = "pgvector"
 
 
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import List
-from src.models.db_schemas import RetrievedDocument
+from typing import Dict, List, Tuple
+from src.models.db_schemas import RetrievedDocument, SearchFilter
 
 
 class VectorDBInterface(ABC):
@@ -31,7 +31,11 @@ class VectorDBInterface(ABC):
 
     @abstractmethod
     def create_collection(
-        self, collection_name: str, embedding_size: int, do_reset: bool = False
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False,
+        storage_mode: str = None,
     ) -> bool:
         pass
 
@@ -55,11 +59,64 @@ class VectorDBInterface(ABC):
         metadatas: List[dict] = None,
         record_ids: List[int] = None,
         batch_size: int = 50,
+        content_hashes: List[str] = None,
+        embedding_model: str = None,
+        defer_index: bool = False,
+        asset_ids: List[int] = None,
+        chunk_orders: List[int] = None,
     ):
         pass
 
+    @abstractmethod
+    def finalize_collection(self, collection_name: str) -> bool:
+        pass
+
+    @abstractmethod
+    def get_record_fingerprints(
+        self, collection_name: str, record_ids: List[int]
+    ) -> Dict[int, Tuple[str, str]]:
+        pass
+
+    @abstractmethod
+    def list_record_ids(self, collection_name: str) -> List[int]:
+        pass
+
+    @abstractmethod
+    def delete_records(self, collection_name: str, record_ids: List[int]) -> int:
+        pass
+
     @abstractmethod
     def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        exact: bool = False,
+        search_filter: SearchFilter = None,
+        with_vectors: bool = False,
+    ) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        search_filter: SearchFilter = None,
+    ) -> List[List[RetrievedDocument]]:
+        pass
+
+    @abstractmethod
+    def search_by_text(
+        self,
+        collection_name: str,
+        text: str,
+        limit: int,
+        search_filter: SearchFilter = None,
     ) -> List[RetrievedDocument]:
         pass
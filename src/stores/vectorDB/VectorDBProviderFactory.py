@@ -1,4 +1,4 @@
-from .providers import QdrantDBProvider, PgVectorProvider
+from .providers import QdrantDBProvider, PgVectorProvider, EmbeddedVectorProvider
 from .VectorDBEnums import VectorDBEnums
 from src.controllers.BaseController import BaseController
 from sqlalchemy.orm import sessionmaker
@@ -12,14 +12,21 @@ class VectorDBProviderFactory:
 
     def create(self, provider: str):
         if provider == VectorDBEnums.QDRANT.value:
-            qdrant_db_client = BaseController().get_database_path(
-                self.config.VECTOR_DB_PATH
-            )
+            qdrant_db_client = self.config.VECTOR_DB_QDRANT_URL
+            if not qdrant_db_client:
+                qdrant_db_client = BaseController().get_database_path(
+                    self.config.VECTOR_DB_PATH
+                )
             return QdrantDBProvider(
                 db_client=qdrant_db_client,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRSHOLD,
+                registry_ttl=self.config.VECTOR_DB_REGISTRY_TTL,
+                hnsw_ef=self.config.VECTOR_DB_QDRANT_HNSW_EF,
+                upload_parallel=self.config.VECTOR_DB_QDRANT_UPLOAD_PARALLEL,
+                storage_mode=self.config.VECTOR_DB_STORAGE_MODE,
+                rescore_oversampling=self.config.VECTOR_DB_RESCORE_OVERSAMPLING,
             )
         elif provider == VectorDBEnums.PGVECTOR.value:
             return PgVectorProvider(
@@ -27,6 +34,29 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRSHOLD,
+                registry_ttl=self.config.VECTOR_DB_REGISTRY_TTL,
+                hnsw_ef_search=self.config.VECTOR_DB_PGVEC_HNSW_EF_SEARCH,
+                ivfflat_probes=self.config.VECTOR_DB_PGVEC_IVFFLAT_PROBES,
+                storage_mode=self.config.VECTOR_DB_STORAGE_MODE,
+                rescore_oversampling=self.config.VECTOR_DB_RESCORE_OVERSAMPLING,
+                text_search_config=self.config.VECTOR_DB_PGVEC_TEXT_SEARCH_CONFIG,
+                hnsw_threshold=self.config.VECTOR_DB_PGVEC_HNSW_THRESHOLD,
+                hnsw_m=self.config.VECTOR_DB_PGVEC_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+                rebuild_growth=self.config.VECTOR_DB_PGVEC_REBUILD_GROWTH,
+                maintenance_workers=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORKERS,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+            )
+        elif provider == VectorDBEnums.EMBEDDED.value:
+            return EmbeddedVectorProvider(
+                db_client=BaseController().get_database_path(
+                    self.config.VECTOR_DB_PATH
+                ),
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+                index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRSHOLD,
+                probes=self.config.VECTOR_DB_EMBEDDED_PROBES,
+                storage_mode=self.config.VECTOR_DB_STORAGE_MODE,
             )
 
         return None
@@ -0,0 +1,413 @@
+from ..VectorDBInterface import VectorDBInterface
+from ..EmbeddedCollection import EmbeddedCollection
+from ..VectorDBEnums import DistanceMethodEnums, VectorStorageModeEnums
+import asyncio
+import logging
+import os
+from typing import Dict, List, Tuple
+from src.models.db_schemas import RetrievedDocument, SearchFilter
+from src.utils.lexical import unique_lexical_tokens
+
+
+class EmbeddedVectorProvider(VectorDBInterface):
+    """In-process vector store, one ``EmbeddedCollection`` directory per collection.
+
+    Searches are NumPy matrix products over memory-mapped float32 vectors;
+    collections under ``index_threshold`` rows are scanned exactly, larger
+    ones probe the closest lists of an IVF index built by
+    ``finalize_collection``. Blocking file and NumPy work runs in threads.
+    """
+
+    def __init__(
+        self,
+        db_client: str,
+        default_vector_size: int = 384,
+        distance_method: str = None,
+        index_threshold: int = 100,
+        probes: int = 10,
+        storage_mode: str = VectorStorageModeEnums.FLOAT32.value,
+    ):
+        # the directory holding one sub-directory per collection
+        self.db_client = db_client
+        self.default_vector_size = default_vector_size
+        self.index_threshold = index_threshold
+        self.probes = probes
+        self.storage_mode = storage_mode
+
+        if distance_method == DistanceMethodEnums.DOT.value:
+            self.distance_method = DistanceMethodEnums.DOT.value
+        else:
+            self.distance_method = DistanceMethodEnums.COSINE.value
+
+        self.collections: Dict[str, EmbeddedCollection] = {}
+        self.lock = asyncio.Lock()
+
+        self.logger = logging.getLogger("uvicorn")
+
+    async def connect(self) -> None:
+        os.makedirs(self.db_client, exist_ok=True)
+        if self.storage_mode != VectorStorageModeEnums.FLOAT32.value:
+            self.logger.warning(
+                "The embedded vector store keeps float32 vectors, ignoring %s",
+                self.storage_mode,
+            )
+        self.logger.info("Opened embedded vector store at %s", self.db_client)
+
+    async def disconnect(self) -> None:
+        async with self.lock:
+            for collection in self.collections.values():
+                collection.close()
+            self.collections = {}
+        self.logger.info("Closed embedded vector store")
+
+    def collection_path(self, collection_name: str) -> str:
+        return os.path.join(self.db_client, collection_name)
+
+    async def get_collection(self, collection_name: str) -> EmbeddedCollection:
+        path = self.collection_path(collection_name)
+        collection = self.collections.get(collection_name)
+
+        if not EmbeddedCollection.exists(path):
+            # dropped, possibly by another process
+            if collection is not None:
+                async with self.lock:
+                    self.collections.pop(collection_name, None)
+                await asyncio.to_thread(collection.close)
+            return None
+
+        if collection is not None:
+            return collection
+
+        async with self.lock:
+            collection = self.collections.get(collection_name)
+            if collection is None:
+                # mapping the files is cheap, nothing is read until searched
+                collection = await asyncio.to_thread(EmbeddedCollection.open, path)
+                self.collections[collection_name] = collection
+        return collection
+
+    async def collection_exists(self, collection_name: str) -> bool:
+        return await self.get_collection(collection_name) is not None
+
+    async def list_all_collections(self) -> List:
+        return [
+            name
+            for name in sorted(os.listdir(self.db_client))
+            if EmbeddedCollection.exists(self.collection_path(name))
+        ]
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        info = await asyncio.to_thread(collection.info)
+        return {**info, "storage_mode": VectorStorageModeEnums.FLOAT32.value}
+
+    async def delete_collection(self, collection_name: str):
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        async with self.lock:
+            self.collections.pop(collection_name, None)
+        await asyncio.to_thread(collection.destroy)
+        self.logger.info("Deleted collection %s", collection_name)
+        return True
+
+    async def create_collection(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False,
+        storage_mode: str = None,
+    ) -> bool:
+        if do_reset:
+            await self.delete_collection(collection_name)
+
+        storage_mode = storage_mode or self.storage_mode
+        if storage_mode != VectorStorageModeEnums.FLOAT32.value:
+            self.logger.warning(
+                "Collection %s keeps float32 vectors, the embedded store has no %s mode",
+                collection_name,
+                storage_mode,
+            )
+
+        if await self.collection_exists(collection_name):
+            self.logger.info("Collection %s already exists", collection_name)
+            return False
+
+        async with self.lock:
+            collection = await asyncio.to_thread(
+                EmbeddedCollection.create,
+                self.collection_path(collection_name),
+                embedding_size,
+                self.distance_method,
+            )
+            self.collections[collection_name] = collection
+        self.logger.info("Created embedded collection %s", collection_name)
+        return True
+
+    async def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: list,
+        metadata: dict = None,
+        record_id: int = None,
+    ):
+        return await self.insert_many(
+            collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadatas=[metadata],
+            record_ids=[record_id],
+        )
+
+    async def insert_many(
+        self,
+        collection_name: str,
+        texts: List[str],
+        vectors: List[list],
+        metadatas: List[dict] = None,
+        record_ids: List[int] = None,
+        batch_size: int = 50,
+        content_hashes: List[str] = None,
+        embedding_model: str = None,
+        defer_index: bool = False,
+        asset_ids: List[int] = None,
+        chunk_orders: List[int] = None,
+    ):
+        # a whole call is appended at once, batch_size has nothing to bound here
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error("Collection %s does not exist", collection_name)
+            return False
+
+        if metadatas is None:
+            metadatas = [None] * len(texts)
+
+        if record_ids is None:
+            record_ids = [None] * len(texts)
+
+        if content_hashes is None:
+            content_hashes = [None] * len(texts)
+
+        try:
+            await asyncio.to_thread(
+                collection.append,
+                vectors,
+                texts,
+                metadatas,
+                record_ids,
+                content_hashes,
+                embedding_model,
+                asset_ids,
+                chunk_orders,
+            )
+        except Exception as e:
+            self.logger.error("Error inserting batch: %s", e)
+            return False
+
+        if not defer_index:
+            # rows appended to an indexed collection are assigned to their
+            # closest list right away, this only builds missing indexes
+            return await self.finalize_collection(collection_name)
+
+        return True
+
+    async def finalize_collection(self, collection_name: str) -> bool:
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return False
+
+        actions = await asyncio.to_thread(collection.finalize, self.index_threshold)
+        if actions["compacted"] or actions["indexed"]:
+            self.logger.info("Finalized collection %s: %s", collection_name, actions)
+        return True
+
+    async def get_record_fingerprints(
+        self, collection_name: str, record_ids: List[int]
+    ) -> Dict[int, Tuple[str, str]]:
+        if not record_ids:
+            return {}
+
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return {}
+
+        return await asyncio.to_thread(collection.get_fingerprints, list(record_ids))
+
+    async def list_record_ids(self, collection_name: str) -> List[int]:
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return []
+
+        return await asyncio.to_thread(collection.list_record_ids)
+
+    async def delete_records(self, collection_name: str, record_ids: List[int]) -> int:
+        if not record_ids:
+            return 0
+
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return 0
+
+        # tombstones only, finalize_collection compacts once enough pile up
+        return await asyncio.to_thread(collection.delete, list(record_ids))
+
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        exact: bool = False,
+        search_filter: SearchFilter = None,
+        with_vectors: bool = False,
+    ) -> List[RetrievedDocument]:
+        # ef_search only applies to HNSW, the embedded index is IVF
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return []
+
+        where, params = self._filter_sql(search_filter)
+
+        try:
+            results = await asyncio.to_thread(
+                collection.search,
+                vector,
+                limit,
+                probes or self.probes,
+                exact,
+                where,
+                params,
+                with_vectors,
+            )
+        except Exception as e:
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            return []
+
+        return [
+            RetrievedDocument(
+                text=result[0],
+                record_id=result[1],
+                score=result[2],
+                vector=result[3] if with_vectors else None,
+            )
+            for result in results
+        ]
+
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        search_filter: SearchFilter = None,
+    ) -> List[List[RetrievedDocument]]:
+        if not vectors:
+            return []
+
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return []
+
+        where, params = self._filter_sql(search_filter)
+
+        try:
+            results = await asyncio.to_thread(
+                collection.search_many,
+                vectors,
+                limit,
+                probes or self.probes,
+                False,
+                where,
+                params,
+            )
+        except Exception as e:
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            return []
+
+        return [
+            [
+                RetrievedDocument(text=text, score=score, record_id=record_id)
+                for text, record_id, score in query_results
+            ]
+            for query_results in results
+        ]
+
+    async def search_by_text(
+        self,
+        collection_name: str,
+        text: str,
+        limit: int,
+        search_filter: SearchFilter = None,
+    ) -> List[RetrievedDocument]:
+        tokens = unique_lexical_tokens(text)
+        if not tokens:
+            return []
+
+        collection = await self.get_collection(collection_name)
+        if collection is None:
+            return []
+
+        where, params = self._filter_sql(search_filter)
+
+        try:
+            results = await asyncio.to_thread(
+                collection.search_text, tokens, limit, where, params
+            )
+        except Exception as e:
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            return []
+
+        return [
+            RetrievedDocument(text=text, score=score, record_id=record_id)
+            for text, record_id, score in results
+        ]
+
+    def _filter_sql(self, search_filter: SearchFilter = None) -> Tuple[str, tuple]:
+        """Translate a filter into a condition on the collection's records table."""
+        if search_filter is None or search_filter.is_empty():
+            return "", ()
+
+        conditions = []
+        params = []
+
+        if search_filter.asset_ids is not None:
+            if not search_filter.asset_ids:
+                return "0", ()
+            placeholders = ",".join("?" * len(search_filter.asset_ids))
+            conditions.append(f"asset_id IN ({placeholders})")
+            params.extend(search_filter.asset_ids)
+
+        if search_filter.chunk_order_gte is not None:
+            conditions.append("chunk_order >= ?")
+            params.append(search_filter.chunk_order_gte)
+
+        if search_filter.chunk_order_lte is not None:
+            conditions.append("chunk_order <= ?")
+            params.append(search_filter.chunk_order_lte)
+
+        operators = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+        for condition in search_filter.metadata:
+            path = f'$."{condition.key}"'
+
+            if condition.eq is not None:
+                # json true/false come back from json_extract as 1/0
+                conditions.append("json_extract(metadata, ?) = ?")
+                params.extend([path, condition.eq])
+
+            bounds = condition.range_bounds()
+            if bounds:
+                # sqlite orders any text above any number, skip non-numbers
+                conditions.append("json_type(metadata, ?) IN ('integer', 'real')")
+                params.append(path)
+                for name, value in bounds.items():
+                    conditions.append(f"json_extract(metadata, ?) {operators[name]} ?")
+                    params.extend([path, value])
+
+        return " AND ".join(conditions), tuple(params)
@@ -1,16 +1,112 @@
 from ..VectorDBInterface import VectorDBInterface
+from ..CollectionRegistry import CollectionRegistry, CollectionMetadata
+from ..PgVectorIndexManager import PgVectorIndexManager
 from src.models.db_schemas.retrieved_document import RetrievedDocument
+from src.models.db_schemas.search_filter import SearchFilter
+from src.utils.lexical import unique_lexical_tokens
 from ..VectorDBEnums import (
     PgVectorDistanceMethodEnums,
+    PgVectorDistanceOperatorEnums,
     PgVecotrTableSchemeEnums,
-    PgVectorIndexTypeEnums,
     DistanceMethodEnums,
+    VectorStorageModeEnums,
 )
 import logging
-from typing import List
+from typing import AsyncIterator, Dict, List, Tuple
 from sqlalchemy.sql import text as sql_text
+from pgvector.asyncpg import register_vector
+import numpy as np
+import weakref
+import re
+import math
+import struct
 import json
 
+# Postgres binary COPY framing, see the COPY "Binary Format" docs
+_COPY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+_COPY_TRAILER = struct.pack(">h", -1)
+_COPY_NULL = struct.pack(">i", -1)
+
+# text, vector, metadata, chunk_id, content_hash, embedding_model,
+# asset_id, chunk_order
+_COPY_COLUMNS = [
+    PgVecotrTableSchemeEnums.TEXT.value,
+    PgVecotrTableSchemeEnums.VECTOR.value,
+    PgVecotrTableSchemeEnums.METADATA.value,
+    PgVecotrTableSchemeEnums.CHUNK_ID.value,
+    PgVecotrTableSchemeEnums.CONTENT_HASH.value,
+    PgVecotrTableSchemeEnums.EMBEDDING_MODEL.value,
+    PgVecotrTableSchemeEnums.ASSET_ID.value,
+    PgVecotrTableSchemeEnums.CHUNK_ORDER.value,
+]
+_COPY_FIELD_COUNT = struct.pack(">h", len(_COPY_COLUMNS))
+
+
+def _encode_copy_text(value: str) -> bytes:
+    if value is None:
+        return _COPY_NULL
+    data = value.encode("utf-8")
+    return struct.pack(">i", len(data)) + data
+
+
+def _encode_copy_int4(value: int) -> bytes:
+    if value is None:
+        return _COPY_NULL
+    return struct.pack(">ii", 4, value)
+
+
+def _encode_copy_rows(
+    texts: List[str],
+    vectors: List[list],
+    metadatas: List[dict],
+    record_ids: List[int],
+    content_hashes: List[str],
+    embedding_model: str,
+    asset_ids: List[int],
+    chunk_orders: List[int],
+) -> bytes:
+    # one numpy conversion per batch; pgvector's binary input is
+    # uint16 dim, uint16 unused, then big-endian float32 values
+    vectors = np.asarray(vectors, dtype=">f4")
+    if vectors.ndim != 2:
+        raise ValueError("vectors must all have the same dimension")
+
+    dimension = vectors.shape[1]
+    vector_prefix = struct.pack(">iHH", 4 + 4 * dimension, dimension, 0)
+    vectors_buffer = memoryview(vectors.tobytes())
+    vector_stride = 4 * dimension
+
+    encoded_model = _encode_copy_text(embedding_model)
+
+    parts = []
+    for i, (
+        _text,
+        _metadata,
+        _record_id,
+        _content_hash,
+        _asset_id,
+        _chunk_order,
+    ) in enumerate(
+        zip(texts, metadatas, record_ids, content_hashes, asset_ids, chunk_orders)
+    ):
+        # jsonb binary input is a version byte followed by the json text; no
+        # metadata is stored as {}, like insert_one and the column default
+        metadata = b"\x01" + json.dumps(_metadata or {}).encode("utf-8")
+
+        parts.append(_COPY_FIELD_COUNT)
+        parts.append(_encode_copy_text(_text))
+        parts.append(vector_prefix)
+        parts.append(vectors_buffer[i * vector_stride : (i + 1) * vector_stride])
+        parts.append(struct.pack(">i", len(metadata)))
+        parts.append(metadata)
+        parts.append(_encode_copy_int4(_record_id))
+        parts.append(_encode_copy_text(_content_hash))
+        parts.append(encoded_model)
+        parts.append(_encode_copy_int4(_asset_id))
+        parts.append(_encode_copy_int4(_chunk_order))
+
+    return b"".join(parts)
+
 
 class PgVectorProvider(VectorDBInterface):
     def __init__(
@@ -19,11 +115,50 @@ class PgVectorProvider(VectorDBInterface):
         default_vector_size: int = 384,
         distance_method: str = None,
         index_threshold: int = 100,
+        registry_ttl: float = 30,
+        hnsw_ef_search: int = 40,
+        ivfflat_probes: int = 1,
+        storage_mode: str = VectorStorageModeEnums.FLOAT32.value,
+        rescore_oversampling: float = 4,
+        text_search_config: str = "simple",
+        hnsw_threshold: int = 50000,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 64,
+        rebuild_growth: float = 2,
+        maintenance_workers: int = 2,
+        maintenance_work_mem: str = "512MB",
     ):
         self.db_client = db_client
         self.default_vector_size = default_vector_size
         self.index_threshold = index_threshold
 
+        self.index_manager = PgVectorIndexManager(
+            db_client,
+            index_threshold=index_threshold,
+            hnsw_threshold=hnsw_threshold,
+            hnsw_m=hnsw_m,
+            hnsw_ef_construction=hnsw_ef_construction,
+            rebuild_growth=rebuild_growth,
+            maintenance_workers=maintenance_workers,
+            maintenance_work_mem=maintenance_work_mem,
+        )
+
+        self.storage_mode = storage_mode
+        self.rescore_oversampling = max(rescore_oversampling, 1)
+
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivfflat_probes = ivfflat_probes
+
+        # inlined into the generated column's DDL, so only plain names pass
+        if not re.fullmatch(r"[a-z_]+", text_search_config or ""):
+            raise ValueError(f"Invalid text search config: {text_search_config}")
+        self.text_search_config = text_search_config
+
+        # pooled asyncpg connections that already have the vector codec
+        self.vector_codec_connections = weakref.WeakSet()
+
+        self.collection_registry = CollectionRegistry(ttl_seconds=registry_ttl)
+
         self.pgvector_table_prefix = PgVecotrTableSchemeEnums._PREFIX.value
 
         self.logger = logging.getLogger("uvicorn")
@@ -31,9 +166,44 @@ class PgVectorProvider(VectorDBInterface):
         self.default_index_name = (
             lambda collection_name: f"{collection_name}_vector_idx"
         )
+        self.chunk_id_index_name = (
+            lambda collection_name: f"{collection_name}_chunk_id_idx"
+        )
+        self.asset_index_name = (
+            lambda collection_name: f"{collection_name}_asset_order_idx"
+        )
+        self.metadata_index_name = (
+            lambda collection_name: f"{collection_name}_metadata_idx"
+        )
+        self.text_search_index_name = (
+            lambda collection_name: f"{collection_name}_text_search_idx"
+        )
 
-        if distance_method == DistanceMethodEnums.COSINE.value:
+        if distance_method == DistanceMethodEnums.DOT.value:
+            self.distance_method = PgVectorDistanceMethodEnums.DOT.value
+            self.halfvec_distance_method = PgVectorDistanceMethodEnums.HALFVEC_DOT.value
+            self.distance_operator = PgVectorDistanceOperatorEnums.DOT.value
+        else:
             self.distance_method = PgVectorDistanceMethodEnums.COSINE.value
+            self.halfvec_distance_method = (
+                PgVectorDistanceMethodEnums.HALFVEC_COSINE.value
+            )
+            self.distance_operator = PgVectorDistanceOperatorEnums.COSINE.value
+
+    def _resolve_storage_mode(self, storage_mode: str = None) -> str:
+        storage_mode = storage_mode or self.storage_mode
+        supported = (
+            VectorStorageModeEnums.FLOAT32.value,
+            VectorStorageModeEnums.HALFVEC.value,
+            VectorStorageModeEnums.BINARY.value,
+        )
+        if storage_mode not in supported:
+            self.logger.warning(
+                "Storage mode %s is not supported by pgvector, using float32",
+                storage_mode,
+            )
+            return VectorStorageModeEnums.FLOAT32.value
+        return storage_mode
 
     async def connect(self):
         async with self.db_client() as session:
@@ -44,22 +214,113 @@ class PgVectorProvider(VectorDBInterface):
             await session.commit()
 
     async def disconnect(self) -> None:
-        pass
+        # background rebuilds are restarted by the next insert or finalize
+        await self.index_manager.close()
+
+    async def _register_vector_codec(self, session):
+        # lets asyncpg send and receive vectors in pgvector's binary format
+        # instead of "[...]" strings; done once per pooled connection. Every
+        # query that binds or reads a vector registers it first and passes
+        # numpy arrays, so no text-bound vector parameters are left for the
+        # codec to break; COPY streams are encoded by hand and bypass it
+        connection = await session.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+
+        if driver_connection not in self.vector_codec_connections:
+            await register_vector(driver_connection)
+            self.vector_codec_connections.add(driver_connection)
 
     async def collection_exists(self, collection_name: str) -> bool:
+        metadata = await self.get_collection_metadata(collection_name)
+        return metadata is not None
 
-        record = None
+    async def get_collection_metadata(
+        self, collection_name: str
+    ) -> CollectionMetadata:
+        return await self.collection_registry.get(
+            collection_name, self._load_collection_metadata
+        )
+
+    async def _load_collection_metadata(
+        self, collection_name: str
+    ) -> CollectionMetadata:
+        # existence, dimension, index state and planner row estimate in one
+        # catalog query; reltuples is -1 until the table is first analyzed
         async with self.db_client() as session:
             async with session.begin():
-                list_tbl = sql_text(
-                    f"SELECT * from pg_tables WHERE tablename=:collection_name"
+                metadata_sql = sql_text(
+                    """
+                    SELECT t.schemaname, t.tablename, t.tableowner, t.tablespace,
+                        t.hasindexes,
+                        c.reltuples::bigint AS row_count,
+                        a.atttypmod AS dimension,
+                        obj_description(c.oid, 'pg_class') AS comment,
+                        EXISTS (
+                            SELECT 1 FROM pg_indexes i
+                            WHERE i.schemaname = t.schemaname
+                            AND i.tablename = t.tablename
+                            AND i.indexname = :index_name
+                        ) AS has_index,
+                        ARRAY(
+                            SELECT ca.attname::text FROM pg_attribute ca
+                            WHERE ca.attrelid = c.oid AND ca.attnum > 0
+                            AND NOT ca.attisdropped
+                        ) AS columns,
+                        ARRAY(
+                            SELECT i.indexname::text FROM pg_indexes i
+                            WHERE i.schemaname = t.schemaname
+                            AND i.tablename = t.tablename
+                        ) AS indexes
+                    FROM pg_tables t
+                    JOIN pg_namespace n ON n.nspname = t.schemaname
+                    JOIN pg_class c
+                        ON c.relnamespace = n.oid AND c.relname = t.tablename
+                    LEFT JOIN pg_attribute a
+                        ON a.attrelid = c.oid AND a.attname = :vector_column
+                    WHERE t.tablename = :collection_name
+                    """
                 )
                 result = await session.execute(
-                    list_tbl, {"collection_name": collection_name}
+                    metadata_sql,
+                    {
+                        "collection_name": collection_name,
+                        "index_name": self.default_index_name(collection_name),
+                        "vector_column": PgVecotrTableSchemeEnums.VECTOR.value,
+                    },
                 )
-                record = result.scalar_one_or_none()
+                record = result.fetchone()
 
-        return record is not None
+        if record is None:
+            return None
+
+        # the storage mode is kept in the table comment, tables created
+        # before storage modes existed have none and hold float32 vectors
+        storage_mode = VectorStorageModeEnums.FLOAT32.value
+        if record.comment:
+            try:
+                storage_mode = json.loads(record.comment).get(
+                    "storage_mode", storage_mode
+                )
+            except (ValueError, AttributeError):
+                pass
+
+        return CollectionMetadata(
+            name=collection_name,
+            dimension=record.dimension if record.dimension > 0 else None,
+            row_count=record.row_count if record.row_count >= 0 else None,
+            has_index=record.has_index,
+            storage_mode=storage_mode,
+            details={
+                "schemaname": record.schemaname,
+                "tablename": record.tablename,
+                "tableowner": record.tableowner,
+                "tablespace": record.tablespace,
+                "hasindexes": record.hasindexes,
+                "columns": list(record.columns or []),
+                "indexes": list(record.indexes or []),
+            },
+        )
 
     async def list_all_collections(self) -> List:
         records = []
@@ -77,34 +338,51 @@ class PgVectorProvider(VectorDBInterface):
         return records
 
     async def get_collection_info(self, collection_name: str) -> dict:
+        # not a hot path, report fresh counts rather than the cached ones
+        self.collection_registry.invalidate(collection_name)
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None:
+            return None
+
         async with self.db_client() as session:
             async with session.begin():
-                table_info_sql = sql_text(
-                    f"""
-                    SELECT schemaname, tablename, tableowner, tablespace, hasindexes
-                    FROM pg_tables
-                    WHERE tablename = :collection_name
-                    """
+                size_sql = sql_text(
+                    "SELECT pg_total_relation_size(to_regclass(:table_name)) "
+                    "AS table_bytes, "
+                    "pg_relation_size(to_regclass(:index_name)) AS index_bytes"
                 )
-                count_sql = sql_text(f'SELECT count(*) from "{collection_name}"')
-
-                table_info_result = await session.execute(
-                    table_info_sql, {"collection_name": collection_name}
+                size_result = await session.execute(
+                    size_sql,
+                    {
+                        "table_name": f'"{collection_name}"',
+                        "index_name": f'"{self.default_index_name(collection_name)}"',
+                    },
                 )
+                sizes = size_result.fetchone()
 
-                table_info = table_info_result.fetchone()
-
-                if not table_info:
-                    return None
-
-                count_result = await session.execute(
-                    count_sql,
-                )
+                record_count = metadata.row_count
+                if record_count is None:
+                    # never analyzed, usually a small fresh table
+                    count_sql = sql_text(f'SELECT count(*) from "{collection_name}"')
+                    count_result = await session.execute(count_sql)
+                    record_count = count_result.scalar_one()
 
-                return {
-                    "table_info": dict(table_info._mapping),
-                    "record_count": count_result.scalar_one(),
-                }
+        return {
+            "table_info": metadata.details,
+            "record_count": record_count,
+            "dimension": metadata.dimension,
+            "has_index": metadata.has_index,
+            "storage_mode": metadata.storage_mode,
+            # the table keeps full float32 vectors in every storage mode, for
+            # re-scoring; halfvec and binary only shrink the ANN index
+            "memory": {
+                "table_bytes": sizes.table_bytes,
+                "index_bytes": sizes.index_bytes,
+                "vectors_bytes": (record_count or 0) * (metadata.dimension or 0) * 4,
+                "table_vector_storage": VectorStorageModeEnums.FLOAT32.value,
+                "index_vector_storage": metadata.storage_mode,
+            },
+        }
 
     async def delete_collection(self, collection_name: str):
         async with self.db_client() as session:
@@ -112,19 +390,27 @@ class PgVectorProvider(VectorDBInterface):
                 delete_sql = sql_text(f'DROP TABLE IF EXISTS "{collection_name}";')
                 await session.execute(delete_sql)
             await session.commit()
+        self.collection_registry.invalidate(collection_name)
         self.logger.info("Deleted collection %s", collection_name)
         return True
 
     async def create_collection(
-        self, collection_name: str, embedding_size: int, do_reset: bool = False
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False,
+        storage_mode: str = None,
     ) -> bool:
         if do_reset:
             await self.delete_collection(collection_name)
 
-        collection_exists = await self.collection_exists(collection_name)
+        storage_mode = self._resolve_storage_mode(storage_mode)
+        metadata = await self.get_collection_metadata(collection_name)
 
-        if not collection_exists:
-            self.logger.info("Creating collection %s", collection_name)
+        if metadata is None:
+            self.logger.info(
+                "Creating collection %s with %s storage", collection_name, storage_mode
+            )
             async with self.db_client() as session:
                 async with session.begin():
                     create_sql = sql_text(
@@ -135,15 +421,142 @@ class PgVectorProvider(VectorDBInterface):
                         {PgVecotrTableSchemeEnums.VECTOR.value} VECTOR({embedding_size}),
                         {PgVecotrTableSchemeEnums.METADATA.value} JSONB DEFAULT '{{}}',
                         {PgVecotrTableSchemeEnums.CHUNK_ID.value} INTEGER
-                            REFERENCES chunks(id)
+                            REFERENCES chunks(id),
+                        {PgVecotrTableSchemeEnums.CONTENT_HASH.value} TEXT,
+                        {PgVecotrTableSchemeEnums.EMBEDDING_MODEL.value} TEXT,
+                        {PgVecotrTableSchemeEnums.ASSET_ID.value} INTEGER,
+                        {PgVecotrTableSchemeEnums.CHUNK_ORDER.value} INTEGER,
+                        {self._text_search_column_sql()}
                     );
                     """
                     )
                     await session.execute(create_sql)
 
+                    # full float32 vectors are always stored for re-scoring,
+                    # the mode decides what the ANN index is built on
+                    comment = json.dumps({"storage_mode": storage_mode})
+                    await session.execute(
+                        sql_text(
+                            f'COMMENT ON TABLE "{collection_name}" IS \'{comment}\''
+                        )
+                    )
+
                     await session.commit()
+            await self.index_manager.build_secondary_indexes(
+                collection_name, self._secondary_index_definitions(collection_name)
+            )
+            self.collection_registry.invalidate(collection_name)
             return True
 
+        if metadata.storage_mode != storage_mode:
+            self.logger.warning(
+                "Collection %s keeps its %s storage, reset it to use %s",
+                collection_name,
+                metadata.storage_mode,
+                storage_mode,
+            )
+
+        await self._migrate_collection(collection_name, metadata)
+        return False
+
+    async def _migrate_collection(
+        self, collection_name: str, metadata: CollectionMetadata
+    ):
+        # collections created before fingerprints and filter columns were
+        # stored; the catalog listing in the metadata decides what is missing,
+        # so pushes to an up-to-date collection run no DDL
+        columns = set(metadata.details.get("columns", []))
+        indexes = set(metadata.details.get("indexes", []))
+
+        added_columns = {
+            PgVecotrTableSchemeEnums.CONTENT_HASH.value: "TEXT",
+            PgVecotrTableSchemeEnums.EMBEDDING_MODEL.value: "TEXT",
+            PgVecotrTableSchemeEnums.ASSET_ID.value: "INTEGER",
+            PgVecotrTableSchemeEnums.CHUNK_ORDER.value: "INTEGER",
+        }
+        missing_columns = [
+            f"ADD COLUMN IF NOT EXISTS {column} {column_type}"
+            for column, column_type in added_columns.items()
+            if column not in columns
+        ]
+        if PgVecotrTableSchemeEnums.TEXT_SEARCH.value not in columns:
+            # rewrites the table once, when lexical search is added
+            missing_columns.append(
+                f"ADD COLUMN IF NOT EXISTS {self._text_search_column_sql()}"
+            )
+        missing_indexes = {
+            index_name: definition
+            for index_name, definition in self._secondary_index_definitions(
+                collection_name
+            ).items()
+            if index_name not in indexes
+        }
+
+        if not missing_columns and not missing_indexes:
+            return
+
+        self.logger.info("Migrating collection %s", collection_name)
+        if missing_columns:
+            await self._migrate_columns(collection_name, columns, missing_columns)
+        if missing_indexes:
+            await self.index_manager.build_secondary_indexes(
+                collection_name, missing_indexes
+            )
+        self.collection_registry.invalidate(collection_name)
+
+    async def _migrate_columns(
+        self, collection_name: str, columns: set, missing_columns: List[str]
+    ):
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    sql_text(
+                        f'ALTER TABLE "{collection_name}" ' + ", ".join(missing_columns)
+                    )
+                )
+
+                if PgVecotrTableSchemeEnums.ASSET_ID.value not in columns:
+                    # unchanged chunks are skipped by incremental pushes, so
+                    # fill the filter columns of older rows from the chunks table
+                    backfill_sql = sql_text(
+                        f'UPDATE "{collection_name}" AS v '
+                        f"SET {PgVecotrTableSchemeEnums.ASSET_ID.value} = c.asset_id, "
+                        f'{PgVecotrTableSchemeEnums.CHUNK_ORDER.value} = c."order" '
+                        f"FROM chunks AS c "
+                        f"WHERE c.id = v.{PgVecotrTableSchemeEnums.CHUNK_ID.value} "
+                        f"AND v.{PgVecotrTableSchemeEnums.ASSET_ID.value} IS NULL"
+                    )
+                    await session.execute(backfill_sql)
+            await session.commit()
+
+    def _text_search_column_sql(self) -> str:
+        # kept in sync by postgres, COPY and inserts never write it
+        return (
+            f"{PgVecotrTableSchemeEnums.TEXT_SEARCH.value} tsvector "
+            f"GENERATED ALWAYS AS (to_tsvector('{self.text_search_config}'::regconfig, "
+            f"coalesce({PgVecotrTableSchemeEnums.TEXT.value}, ''))) STORED"
+        )
+
+    def _secondary_index_definitions(self, collection_name: str) -> dict:
+        # b-tree for chunk_id lookups and asset / chunk order filters, GIN
+        # for metadata containment (`metadata @> '{"key": value}'`) and for
+        # lexical search; built concurrently by the index manager
+        return {
+            self.chunk_id_index_name(collection_name): (
+                f"({PgVecotrTableSchemeEnums.CHUNK_ID.value})"
+            ),
+            self.asset_index_name(collection_name): (
+                f"({PgVecotrTableSchemeEnums.ASSET_ID.value}, "
+                f"{PgVecotrTableSchemeEnums.CHUNK_ORDER.value})"
+            ),
+            self.metadata_index_name(collection_name): (
+                f"USING gin ({PgVecotrTableSchemeEnums.METADATA.value} jsonb_path_ops)"
+            ),
+            self.text_search_index_name(collection_name): (
+                f"USING gin ({PgVecotrTableSchemeEnums.TEXT_SEARCH.value})"
+            ),
+        }
+
     async def index_exists(self, collection_name: str) -> bool:
         index_name = self.default_index_name(collection_name)
         async with self.db_client() as session:
@@ -166,52 +579,61 @@ class PgVectorProvider(VectorDBInterface):
         return record is not None
 
     async def create_index(
-        self, collection_name: str, index_type: str = PgVectorIndexTypeEnums.HNSW.value
+        self, collection_name: str, index_type: str = None, background: bool = False
     ):
-        index_exists = await self.index_exists(collection_name)
-        if index_exists:
-            self.logger.info("Index on collection %s already exists", collection_name)
+        """Build or grow the vector index to fit the collection's row count.
+
+        ``index_type`` forces IVFFlat or HNSW instead of choosing by size.
+        With ``background`` the build runs in a task and this returns at once.
+        """
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None:
+            self.logger.error("Collection %s does not exist", collection_name)
             return False
 
-        async with self.db_client() as session:
-            async with session.begin():
-                count_sql = sql_text(f'SELECT COUNT(*) FROM "{collection_name}"')
-                result = await session.execute(count_sql)
-                record_count = result.scalar_one()
-                if record_count < self.index_threshold:
-                    self.logger.info(
-                        "Collection %s has %d records, below threshold %d, skipping index creation",
-                        collection_name,
-                        record_count,
-                        self.index_threshold,
-                    )
-                    return False
-                self.logger.info(
-                    "Creating index on collection %s with %d records",
-                    collection_name,
-                    record_count,
-                )
-                index_name = self.default_index_name(collection_name)
+        index_name = self.default_index_name(collection_name)
+        expression = self._index_expression(metadata.storage_mode, metadata.dimension)
 
-                create_index_sql = sql_text(
-                    f"CREATE INDEX {index_name} ON {collection_name} "
-                    f"USING {index_type} ({PgVecotrTableSchemeEnums.VECTOR.value} "
-                    f"{self.distance_method}) ;"
-                )
-                await session.execute(create_index_sql)
-            await session.commit()
-            self.logger.info("finish creating index %s", index_name)
-        return True
+        if background:
+            task = self.index_manager.schedule(
+                collection_name, index_name, expression, index_type
+            )
+            task.add_done_callback(
+                lambda _: self.collection_registry.invalidate(collection_name)
+            )
+            return True
+
+        action = await self.index_manager.ensure_index(
+            collection_name, index_name, expression, index_type
+        )
+        self.collection_registry.invalidate(collection_name)
+        return action in ("built", "rebuilt")
+
+    def _index_expression(self, storage_mode: str, dimension: int) -> str:
+        vector_column = PgVecotrTableSchemeEnums.VECTOR.value
+
+        if storage_mode == VectorStorageModeEnums.HALFVEC.value:
+            return (
+                f"({vector_column}::halfvec({dimension})) "
+                f"{self.halfvec_distance_method}"
+            )
+        if storage_mode == VectorStorageModeEnums.BINARY.value:
+            return (
+                f"(binary_quantize({vector_column})::bit({dimension})) "
+                f"{PgVectorDistanceMethodEnums.BIT_HAMMING.value}"
+            )
+        return f"{vector_column} {self.distance_method}"
 
     async def reset_vector_index(self, collection_name: str):
 
         async with self.db_client() as session:
             async with session.begin():
                 index_name = self.default_index_name(collection_name)
-                drop_index_sql = sql_text(f"DROP INDEX IF EXISTS {index_name};")
+                drop_index_sql = sql_text(f'DROP INDEX IF EXISTS "{index_name}";')
                 await session.execute(drop_index_sql)
             await session.commit()
             self.logger.info("Dropped index %s", index_name)
+        self.collection_registry.invalidate(collection_name)
 
         created = await self.create_index(collection_name)
         if created:
@@ -242,6 +664,7 @@ class PgVectorProvider(VectorDBInterface):
 
         async with self.db_client() as session:
             async with session.begin():
+                await self._register_vector_codec(session)
                 insert_sql = sql_text(
                     f"INSERT INTO {collection_name} "
                     f"({PgVecotrTableSchemeEnums.TEXT.value}, "
@@ -255,13 +678,13 @@ class PgVectorProvider(VectorDBInterface):
                     insert_sql,
                     {
                         "text": text,
-                        "vector": "[" + ",".join([str(i) for i in vector]) + "]",
+                        "vector": np.asarray(vector, dtype=np.float32),
                         "metadata": json.dumps(metadata) if metadata else "{}",
                         "chunk_id": record_id,
                     },
                 )
             await session.commit()
-            await self.create_index(collection_name)
+        await self.create_index(collection_name, background=True)
 
         self.logger.info("Inserted one record into collection %s", collection_name)
         return True
@@ -274,6 +697,11 @@ class PgVectorProvider(VectorDBInterface):
         metadatas: List[dict] = None,
         record_ids: List[int] = None,
         batch_size: int = 50,
+        content_hashes: List[str] = None,
+        embedding_model: str = None,
+        defer_index: bool = False,
+        asset_ids: List[int] = None,
+        chunk_orders: List[int] = None,
     ):
         collection_exists = await self.collection_exists(collection_name)
         if not collection_exists:
@@ -286,77 +714,664 @@ class PgVectorProvider(VectorDBInterface):
 
         if not metadatas or len(metadatas) == 0:
             metadatas = [None] * len(texts)
+
+        if not content_hashes:
+            content_hashes = [None] * len(texts)
+
+        if not asset_ids:
+            asset_ids = [None] * len(texts)
+
+        if not chunk_orders:
+            chunk_orders = [None] * len(texts)
+
+        async def copy_source() -> AsyncIterator[bytes]:
+            yield _COPY_HEADER
+            for i in range(0, len(texts), batch_size):
+                yield _encode_copy_rows(
+                    texts[i : i + batch_size],
+                    vectors[i : i + batch_size],
+                    metadatas[i : i + batch_size],
+                    record_ids[i : i + batch_size],
+                    content_hashes[i : i + batch_size],
+                    embedding_model,
+                    asset_ids[i : i + batch_size],
+                    chunk_orders[i : i + batch_size],
+                )
+            yield _COPY_TRAILER
+
         try:
             async with self.db_client() as session:
                 async with session.begin():
-                    for i in range(0, len(texts), batch_size):
-                        batch_texts = texts[i : i + batch_size]
-                        batch_vectors = vectors[i : i + batch_size]
-                        batch_metadatas = metadatas[i : i + batch_size]
-                        batch_record_ids = record_ids[i : i + batch_size]
-
-                        values = []
-
-                        for _text, _vector, _metadata, _record_id in zip(
-                            batch_texts,
-                            batch_vectors,
-                            batch_metadatas,
-                            batch_record_ids,
-                        ):
-                            values.append(
-                                {
-                                    "text": _text,
-                                    "vector": "["
-                                    + ",".join([str(i) for i in _vector])
-                                    + "]",
-                                    "metadata": json.dumps(_metadata),
-                                    "chunk_id": _record_id,
-                                }
-                            )
+                    connection = await session.connection()
+                    raw_connection = await connection.get_raw_connection()
 
-                            batch_insert_sql = sql_text(
-                                f"INSERT INTO {collection_name} "
-                                f"({PgVecotrTableSchemeEnums.TEXT.value}, "
-                                f"{PgVecotrTableSchemeEnums.VECTOR.value}, "
-                                f"{PgVecotrTableSchemeEnums.METADATA.value}, "
-                                f"{PgVecotrTableSchemeEnums.CHUNK_ID.value}) "
-                                f"VALUES (:text, :vector, :metadata, :chunk_id)"
-                            )
+                    await raw_connection.driver_connection.copy_to_table(
+                        collection_name,
+                        source=copy_source(),
+                        columns=_COPY_COLUMNS,
+                        format="binary",
+                    )
+                await session.commit()
 
-                        await session.execute(batch_insert_sql, values)
-                    await session.commit()
-            await self.create_index(collection_name)
+            if not defer_index:
+                # builds and growth rebuilds run concurrently with searches
+                await self.create_index(collection_name, background=True)
         except Exception as e:
             self.logger.error("Error inserting records: %s", e)
+            self.collection_registry.invalidate(collection_name)
             return False
 
         return True
 
+    async def finalize_collection(self, collection_name: str) -> bool:
+        """Build the deferred vector index and refresh planner statistics."""
+        if not await self.collection_exists(collection_name):
+            self.logger.error("Collection %s does not exist", collection_name)
+            return False
+
+        # fresh statistics first, the index is sized from the planner's estimate
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(f'ANALYZE "{collection_name}"'))
+            await session.commit()
+
+        await self.create_index(collection_name)
+        self.collection_registry.invalidate(collection_name)
+
+        self.logger.info("Finalized collection %s", collection_name)
+        return True
+
+    async def get_record_fingerprints(
+        self, collection_name: str, record_ids: List[int]
+    ) -> Dict[int, Tuple[str, str]]:
+        if not record_ids:
+            return {}
+
+        async with self.db_client() as session:
+            async with session.begin():
+                fingerprints_sql = sql_text(
+                    f"SELECT {PgVecotrTableSchemeEnums.CHUNK_ID.value} AS chunk_id, "
+                    f"{PgVecotrTableSchemeEnums.CONTENT_HASH.value} AS content_hash, "
+                    f"{PgVecotrTableSchemeEnums.EMBEDDING_MODEL.value} AS embedding_model "
+                    f'FROM "{collection_name}" '
+                    f"WHERE {PgVecotrTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)"
+                )
+                result = await session.execute(
+                    fingerprints_sql, {"record_ids": list(record_ids)}
+                )
+                records = result.fetchall()
+
+        return {
+            record.chunk_id: (record.content_hash, record.embedding_model)
+            for record in records
+        }
+
+    async def list_record_ids(self, collection_name: str) -> List[int]:
+        async with self.db_client() as session:
+            async with session.begin():
+                ids_sql = sql_text(
+                    f"SELECT DISTINCT {PgVecotrTableSchemeEnums.CHUNK_ID.value} "
+                    f'FROM "{collection_name}" '
+                    f"WHERE {PgVecotrTableSchemeEnums.CHUNK_ID.value} IS NOT NULL"
+                )
+                result = await session.execute(ids_sql)
+                record_ids = result.scalars().all()
+
+        return record_ids
+
+    async def delete_records(self, collection_name: str, record_ids: List[int]) -> int:
+        if not record_ids:
+            return 0
+
+        async with self.db_client() as session:
+            async with session.begin():
+                delete_sql = sql_text(
+                    f'DELETE FROM "{collection_name}" '
+                    f"WHERE {PgVecotrTableSchemeEnums.CHUNK_ID.value} = ANY(:record_ids)"
+                )
+                result = await session.execute(
+                    delete_sql, {"record_ids": list(record_ids)}
+                )
+            await session.commit()
+
+        return result.rowcount
+
+    def _search_sql(
+        self,
+        collection_name: str,
+        storage_mode: str = VectorStorageModeEnums.FLOAT32.value,
+        dimension: int = None,
+        where: str = "",
+        query_vector: str = "CAST(:vector AS vector)",
+        with_vectors: bool = False,
+    ):
+        # ORDER BY must be the bare `expression <op> constant` the index was
+        # built on and the operator must match its opclass, otherwise the
+        # planner can't use the HNSW/IVFFlat index and scans the table;
+        # a column of an outer query counts as a constant for each of its rows
+        vector_column = PgVecotrTableSchemeEnums.VECTOR.value
+        distance = f"{vector_column} {self.distance_operator} {query_vector}"
+
+        if self.distance_operator == PgVectorDistanceOperatorEnums.DOT.value:
+            score = f"({distance}) * -1"
+        else:
+            score = f"1 - ({distance})"
+
+        select_columns = (
+            f"{PgVecotrTableSchemeEnums.TEXT.value} AS text, "
+            f"{PgVecotrTableSchemeEnums.CHUNK_ID.value} AS record_id"
+        )
+        # the stored float32 vectors, in every storage mode
+        vector_output = f", {vector_column}" if with_vectors else ""
+
+        if storage_mode == VectorStorageModeEnums.HALFVEC.value:
+            coarse_distance = (
+                f"{vector_column}::halfvec({dimension}) {self.distance_operator} "
+                f"{query_vector}::halfvec({dimension})"
+            )
+        elif storage_mode == VectorStorageModeEnums.BINARY.value:
+            coarse_distance = (
+                f"binary_quantize({vector_column})::bit({dimension}) "
+                f"{PgVectorDistanceOperatorEnums.HAMMING.value} "
+                f"binary_quantize({query_vector})"
+            )
+        elif where:
+            # iterative index scans return matches in relaxed order, the
+            # outer query puts the final rows back in distance order
+            return sql_text(
+                f"SELECT text, record_id, score{vector_output} FROM ("
+                f"SELECT {select_columns}, {score} AS score, {distance} AS distance"
+                f"{vector_output} "
+                f'FROM "{collection_name}" '
+                f"WHERE {where} "
+                f"ORDER BY {distance} "
+                f"LIMIT :limit"
+                f") AS filtered "
+                f"ORDER BY distance"
+            )
+        else:
+            return sql_text(
+                f"SELECT {select_columns}, {score} AS score{vector_output} "
+                f'FROM "{collection_name}" '
+                f"ORDER BY {distance} "
+                f"LIMIT :limit"
+            )
+
+        # coarse pass over the quantized index with oversampling, then exact
+        # re-scoring of the candidates against the stored float32 vectors
+        return sql_text(
+            f"SELECT text, record_id, {score} AS score{vector_output} FROM ("
+            f"SELECT {select_columns}, {vector_column} "
+            f'FROM "{collection_name}" '
+            f"{f'WHERE {where} ' if where else ''}"
+            f"ORDER BY {coarse_distance} "
+            f"LIMIT :candidates"
+            f") AS candidates "
+            f"ORDER BY {distance} "
+            f"LIMIT :limit"
+        )
+
+    def _filter_sql(self, search_filter: SearchFilter = None) -> Tuple[str, dict]:
+        """Translate a filter into a WHERE clause the b-tree and GIN indexes serve."""
+        if search_filter is None or search_filter.is_empty():
+            return "", {}
+
+        conditions = []
+        params = {}
+
+        if search_filter.asset_ids is not None:
+            conditions.append(
+                f"{PgVecotrTableSchemeEnums.ASSET_ID.value} = ANY(:filter_asset_ids)"
+            )
+            params["filter_asset_ids"] = list(search_filter.asset_ids)
+
+        if search_filter.chunk_order_gte is not None:
+            conditions.append(
+                f"{PgVecotrTableSchemeEnums.CHUNK_ORDER.value} >= :filter_order_gte"
+            )
+            params["filter_order_gte"] = search_filter.chunk_order_gte
+
+        if search_filter.chunk_order_lte is not None:
+            conditions.append(
+                f"{PgVecotrTableSchemeEnums.CHUNK_ORDER.value} <= :filter_order_lte"
+            )
+            params["filter_order_lte"] = search_filter.chunk_order_lte
+
+        metadata_equals = search_filter.metadata_equals()
+        if metadata_equals:
+            conditions.append(
+                f"{PgVecotrTableSchemeEnums.METADATA.value} "
+                f"@> CAST(:filter_metadata AS jsonb)"
+            )
+            params["filter_metadata"] = json.dumps(metadata_equals)
+
+        operators = {"gt": ">", "gte": ">=", "lt": "<", "lte": "<="}
+        for i, condition in enumerate(search_filter.metadata_ranges()):
+            # jsonpath comparisons skip non-numeric values instead of
+            # failing the whole query like a ::numeric cast would
+            bounds = condition.range_bounds()
+            predicate = " && ".join(
+                f"@ {operators[name]} ${name}" for name in bounds
+            )
+            conditions.append(
+                f"jsonb_path_exists({PgVecotrTableSchemeEnums.METADATA.value}, "
+                f"CAST(:filter_path_{i} AS jsonpath), "
+                f"CAST(:filter_vars_{i} AS jsonb))"
+            )
+            params[f"filter_path_{i}"] = f'$."{condition.key}" ? ({predicate})'
+            params[f"filter_vars_{i}"] = json.dumps(bounds)
+
+        return " AND ".join(conditions), params
+
+    def _search_candidates(self, storage_mode: str, limit: int) -> int:
+        if storage_mode == VectorStorageModeEnums.FLOAT32.value:
+            return limit
+        return math.ceil(limit * self.rescore_oversampling)
+
+    async def _set_search_params(
+        self,
+        session,
+        candidates: int,
+        ef_search: int = None,
+        probes: int = None,
+        exact: bool = False,
+        filtered: bool = False,
+    ):
+        # transaction-local, so pooled connections keep the server defaults;
+        # an HNSW scan returns at most ef_search rows
+        ef_search = max(ef_search or self.hnsw_ef_search, candidates)
+        probes = probes or self.ivfflat_probes
+
+        await session.execute(
+            sql_text(
+                "SELECT set_config('hnsw.ef_search', :ef_search, true), "
+                "set_config('ivfflat.probes', :probes, true), "
+                "set_config('enable_indexscan', :enable_indexscan, true)"
+            ),
+            {
+                "ef_search": str(ef_search),
+                "probes": str(probes),
+                "enable_indexscan": "off" if exact else "on",
+            },
+        )
+
+        if filtered and not exact:
+            # pgvector >= 0.8 keeps scanning the index until enough rows pass
+            # the filter, instead of filtering a single ef_search/probes batch
+            await session.execute(
+                sql_text(
+                    "SELECT set_config('hnsw.iterative_scan', 'relaxed_order', true), "
+                    "set_config('ivfflat.iterative_scan', 'relaxed_order', true)"
+                )
+            )
+
+    async def _execute_search(
+        self,
+        session,
+        metadata: CollectionMetadata,
+        vector: list,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        exact: bool = False,
+        explain: bool = False,
+        search_filter: SearchFilter = None,
+        with_vectors: bool = False,
+    ):
+        storage_mode = metadata.storage_mode
+        if exact:
+            # brute force over the full vectors, the ground truth for recall
+            storage_mode = VectorStorageModeEnums.FLOAT32.value
+
+        candidates = self._search_candidates(storage_mode, limit)
+
+        where, filter_params = self._filter_sql(search_filter)
+
+        await self._register_vector_codec(session)
+        await self._set_search_params(
+            session, candidates, ef_search, probes, exact, filtered=bool(where)
+        )
+
+        search_sql = self._search_sql(
+            metadata.name,
+            storage_mode,
+            metadata.dimension,
+            where,
+            with_vectors=with_vectors,
+        )
+        if explain:
+            search_sql = sql_text(f"EXPLAIN (FORMAT JSON) {search_sql.text}")
+
+        params = {
+            "vector": np.asarray(vector, dtype=np.float32),
+            "limit": limit,
+            **filter_params,
+        }
+        if storage_mode != VectorStorageModeEnums.FLOAT32.value:
+            params["candidates"] = candidates
+
+        return await session.execute(search_sql, params)
+
+    async def _count_matches(
+        self, session, collection_name: str, search_filter: SearchFilter, limit: int
+    ) -> int:
+        """Rows passing the filter, counted up to ``limit`` on the b-tree/GIN
+        indexes; tells a short result set from a scan that stopped early."""
+        where, filter_params = self._filter_sql(search_filter)
+        count_sql = sql_text(
+            f"SELECT count(*) FROM ("
+            f'SELECT 1 FROM "{collection_name}" WHERE {where} LIMIT :limit'
+            f") AS matches"
+        )
+        result = await session.execute(count_sql, {"limit": limit, **filter_params})
+        return result.scalar_one()
+
     async def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        exact: bool = False,
+        search_filter: SearchFilter = None,
+        with_vectors: bool = False,
     ) -> List[RetrievedDocument]:
 
-        collection_exists = await self.collection_exists(collection_name)
-        if not collection_exists:
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None:
             self.logger.error("Collection %s does not exist", collection_name)
             return []
 
-        vector = "[" + ",".join([str(i) for i in vector]) + "]"
+        filtered = search_filter is not None and not search_filter.is_empty()
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    result = await self._execute_search(
+                        session,
+                        metadata,
+                        vector,
+                        limit,
+                        ef_search,
+                        probes,
+                        exact,
+                        search_filter=search_filter,
+                        with_vectors=with_vectors,
+                    )
+                    records = result.fetchall()
+
+                if filtered and not exact and len(records) < limit:
+                    async with session.begin():
+                        match_count = await self._count_matches(
+                            session, metadata.name, search_filter, limit
+                        )
+                        if match_count > len(records):
+                            # the iterative scan hit its tuple budget before
+                            # finding every match; a filtered scan without the
+                            # vector index is driven by the b-tree/GIN indexes
+                            result = await self._execute_search(
+                                session,
+                                metadata,
+                                vector,
+                                limit,
+                                exact=True,
+                                search_filter=search_filter,
+                                with_vectors=with_vectors,
+                            )
+                            records = result.fetchall()
+        except Exception as e:
+            # the cached entry may be stale, e.g. dropped by another worker
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            self.collection_registry.invalidate(collection_name)
+            return []
+
+        return [
+            RetrievedDocument(
+                text=record.text,
+                score=record.score,
+                record_id=record.record_id,
+                vector=record.vector.tolist() if with_vectors else None,
+            )
+            for record in records
+        ]
+
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        search_filter: SearchFilter = None,
+    ) -> List[List[RetrievedDocument]]:
+        if not vectors:
+            return []
+
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None:
+            self.logger.error("Collection %s does not exist", collection_name)
+            return []
+
+        filtered = search_filter is not None and not search_filter.is_empty()
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    records = await self._execute_batch_search(
+                        session,
+                        metadata,
+                        vectors,
+                        limit,
+                        ef_search,
+                        probes,
+                        search_filter=search_filter,
+                    )
+                results = self._batch_results(records, len(vectors))
+
+                short = [
+                    position
+                    for position, documents in enumerate(results)
+                    if len(documents) < limit
+                ]
+                if filtered and short:
+                    async with session.begin():
+                        match_count = await self._count_matches(
+                            session, metadata.name, search_filter, limit
+                        )
+                        # same fallback as search_by_vector, for the queries
+                        # the iterative scan left short, in one exact statement
+                        short = [
+                            position
+                            for position in short
+                            if match_count > len(results[position])
+                        ]
+                        if short:
+                            records = await self._execute_batch_search(
+                                session,
+                                metadata,
+                                [vectors[position] for position in short],
+                                limit,
+                                exact=True,
+                                search_filter=search_filter,
+                            )
+                            for position, documents in zip(
+                                short, self._batch_results(records, len(short))
+                            ):
+                                results[position] = documents
+        except Exception as e:
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            self.collection_registry.invalidate(collection_name)
+            return []
+
+        return results
+
+    async def _execute_batch_search(
+        self,
+        session,
+        metadata: CollectionMetadata,
+        vectors: List[list],
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        exact: bool = False,
+        search_filter: SearchFilter = None,
+    ):
+        storage_mode = metadata.storage_mode
+        if exact:
+            storage_mode = VectorStorageModeEnums.FLOAT32.value
+
+        where, filter_params = self._filter_sql(search_filter)
+        candidates = self._search_candidates(storage_mode, limit)
+
+        # one statement for every query: the per-query search runs as a
+        # LATERAL subquery over the unnested query vectors, so each one is
+        # still an index scan
+        query_sql = self._search_sql(
+            metadata.name,
+            storage_mode,
+            metadata.dimension,
+            where,
+            query_vector="queries.query_vector",
+        )
+        batch_sql = sql_text(
+            "SELECT queries.position, results.text, results.record_id, results.score "
+            "FROM unnest(CAST(:vectors AS vector[])) WITH ORDINALITY "
+            "AS queries(query_vector, position) "
+            f"CROSS JOIN LATERAL ({query_sql.text}) AS results "
+            "ORDER BY queries.position, results.score DESC"
+        )
+
+        params = {
+            "vectors": [np.asarray(vector, dtype=np.float32) for vector in vectors],
+            "limit": limit,
+            **filter_params,
+        }
+        if storage_mode != VectorStorageModeEnums.FLOAT32.value:
+            params["candidates"] = candidates
+
+        await self._register_vector_codec(session)
+        await self._set_search_params(
+            session, candidates, ef_search, probes, exact, filtered=bool(where)
+        )
+        result = await session.execute(batch_sql, params)
+        return result.fetchall()
+
+    def _batch_results(
+        self, records, query_count: int
+    ) -> List[List[RetrievedDocument]]:
+        results = [[] for _ in range(query_count)]
+        for record in records:
+            results[record.position - 1].append(
+                RetrievedDocument(
+                    text=record.text, score=record.score, record_id=record.record_id
+                )
+            )
+        return results
+
+    async def search_by_text(
+        self,
+        collection_name: str,
+        text: str,
+        limit: int,
+        search_filter: SearchFilter = None,
+    ) -> List[RetrievedDocument]:
+        """Rank records matching any query term by ts_rank_cd, via the GIN index."""
+        tokens = unique_lexical_tokens(text)
+        if not tokens:
+            return []
+
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None:
+            self.logger.error("Collection %s does not exist", collection_name)
+            return []
+
+        where, filter_params = self._filter_sql(search_filter)
+        text_search = PgVecotrTableSchemeEnums.TEXT_SEARCH.value
+
+        # tokens are plain word characters, safe to join as tsquery syntax
+        search_sql = sql_text(
+            f"SELECT {PgVecotrTableSchemeEnums.TEXT.value} AS text, "
+            f"{PgVecotrTableSchemeEnums.CHUNK_ID.value} AS record_id, "
+            f"ts_rank_cd({text_search}, query) AS score "
+            f'FROM "{collection_name}", '
+            f"to_tsquery(CAST(:config AS regconfig), :query) AS query "
+            f"WHERE {text_search} @@ query "
+            f"{f'AND {where} ' if where else ''}"
+            f"ORDER BY score DESC "
+            f"LIMIT :limit"
+        )
+
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    result = await session.execute(
+                        search_sql,
+                        {
+                            "config": self.text_search_config,
+                            "query": " | ".join(tokens),
+                            "limit": limit,
+                            **filter_params,
+                        },
+                    )
+                    records = result.fetchall()
+        except Exception as e:
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            self.collection_registry.invalidate(collection_name)
+            return []
+
+        return [
+            RetrievedDocument(
+                text=record.text, score=record.score, record_id=record.record_id
+            )
+            for record in records
+        ]
+
+    async def explain_search(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        search_filter: SearchFilter = None,
+    ) -> dict:
+        """Run EXPLAIN on the search query and report if the vector index is used.
+
+        Meant for checking a collection above ``index_threshold`` after
+        ``finalize_collection``, e.g. from a shell or an ops script.
+        """
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None:
+            return None
+
+        index_name = self.default_index_name(collection_name)
 
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(
-                    f"select {PgVecotrTableSchemeEnums.TEXT.value} as text,"
-                    f" 1 - ({PgVecotrTableSchemeEnums.VECTOR.value} <=> :vector ) as score "
-                    f"from {collection_name} "
-                    f"order by score desc "
-                    f"limit {limit}"
+                result = await self._execute_search(
+                    session,
+                    metadata,
+                    vector,
+                    limit,
+                    ef_search,
+                    probes,
+                    explain=True,
+                    search_filter=search_filter,
                 )
+                plan = result.scalar_one()
 
-                result = await session.execute(search_sql, {"vector": vector})
-                records = result.fetchall()
-                documents = [
-                    RetrievedDocument(text=record.text, score=record.score)
-                    for record in records
-                ]
-        return documents
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        def find_index_scan(node: dict) -> bool:
+            if node.get("Index Name") == index_name:
+                return True
+            return any(find_index_scan(child) for child in node.get("Plans", []))
+
+        return {
+            "index_name": index_name,
+            "storage_mode": metadata.storage_mode,
+            "index_used": find_index_scan(plan[0]["Plan"]),
+            "plan": plan,
+        }
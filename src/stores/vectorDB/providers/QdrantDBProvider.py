@@ -1,9 +1,16 @@
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnums import DistanceMethodEnums
-from qdrant_client import QdrantClient, models
+from ..CollectionRegistry import CollectionRegistry, CollectionMetadata
+from ..VectorDBEnums import DistanceMethodEnums, VectorStorageModeEnums
+from qdrant_client import AsyncQdrantClient, models
+import asyncio
 import logging
-from typing import List
-from src.models.db_schemas import RetrievedDocument
+import math
+from typing import Dict, List, Optional, Tuple
+from src.models.db_schemas import RetrievedDocument, SearchFilter
+from src.utils.lexical import hashed_term_weights
+
+# the sparse vector of hashed term weights every point carries
+_TEXT_VECTOR = "text"
 
 
 class QdrantDBProvider(VectorDBInterface):
@@ -14,13 +21,30 @@ class QdrantDBProvider(VectorDBInterface):
         default_vector_size: int = 384,
         distance_method: str = None,
         index_threshold: int = 100,
+        registry_ttl: float = 30,
+        hnsw_ef: int = None,
+        upload_parallel: int = 4,
+        storage_mode: str = VectorStorageModeEnums.FLOAT32.value,
+        rescore_oversampling: float = 4,
     ):
 
+        # a local storage path, or the url of a qdrant server
         self.db_client = db_client
         self.client = None
         self.default_vector_size = default_vector_size
         self.index_threshold = index_threshold
 
+        self.hnsw_ef = hnsw_ef
+        self.upload_parallel = max(upload_parallel, 1)
+
+        self.storage_mode = storage_mode
+        self.rescore_oversampling = max(rescore_oversampling, 1)
+
+        self.collection_registry = CollectionRegistry(ttl_seconds=registry_ttl)
+
+        # schemas of the payload fields already indexed, per collection
+        self.payload_indexes: Dict[str, dict] = {}
+
         if distance_method == DistanceMethodEnums.COSINE.value:
             self.distance_method = models.Distance.COSINE
         elif distance_method == DistanceMethodEnums.DOT.value:
@@ -31,47 +55,271 @@ class QdrantDBProvider(VectorDBInterface):
         self.logger = logging.getLogger("uvicorn")
 
     async def connect(self) -> None:
-        self.client = QdrantClient(path=self.db_client)
+        if str(self.db_client).startswith(("http://", "https://")):
+            self.client = AsyncQdrantClient(url=self.db_client)
+        else:
+            self.client = AsyncQdrantClient(path=self.db_client)
         self.logger.info("Connected to QdrantDB at %s", self.db_client)
 
     async def disconnect(self) -> None:
+        if self.client is not None:
+            await self.client.close()
         self.client = None
         self.logger.info("Disconnected from QdrantDB")
 
     async def collection_exists(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name)
+        metadata = await self.get_collection_metadata(collection_name)
+        return metadata is not None
+
+    async def get_collection_metadata(
+        self, collection_name: str
+    ) -> CollectionMetadata:
+        return await self.collection_registry.get(
+            collection_name, self._load_collection_metadata
+        )
+
+    async def _load_collection_metadata(
+        self, collection_name: str
+    ) -> CollectionMetadata:
+        if not await self.client.collection_exists(collection_name):
+            return None
+
+        collection = await self.client.get_collection(collection_name)
+
+        vectors_config = collection.config.params.vectors
+        dimension = None
+        datatype = None
+        if isinstance(vectors_config, models.VectorParams):
+            dimension = vectors_config.size
+            datatype = vectors_config.datatype
+
+        quantization_config = collection.config.quantization_config
+        if isinstance(quantization_config, models.ScalarQuantization):
+            storage_mode = VectorStorageModeEnums.SCALAR.value
+        elif isinstance(quantization_config, models.BinaryQuantization):
+            storage_mode = VectorStorageModeEnums.BINARY.value
+        elif datatype == models.Datatype.FLOAT16:
+            storage_mode = VectorStorageModeEnums.HALFVEC.value
+        else:
+            storage_mode = VectorStorageModeEnums.FLOAT32.value
+
+        return CollectionMetadata(
+            name=collection_name,
+            dimension=dimension,
+            row_count=collection.points_count,
+            has_index=bool(collection.indexed_vectors_count),
+            storage_mode=storage_mode,
+            details={
+                **collection.model_dump(),
+                "has_text_vectors": _TEXT_VECTOR
+                in (collection.config.params.sparse_vectors or {}),
+            },
+        )
 
     async def list_all_collections(self) -> List:
-        return self.client.get_collections()
+        return await self.client.get_collections()
 
     async def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name).model_dump()
+        # not a hot path, report fresh counts rather than the cached ones
+        self.collection_registry.invalidate(collection_name)
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None:
+            return None
+
+        return {
+            **metadata.details,
+            "storage_mode": metadata.storage_mode,
+            "memory": self.estimate_vector_memory(metadata),
+        }
+
+    def estimate_vector_memory(self, metadata: CollectionMetadata) -> dict:
+        # qdrant does not report memory per collection, estimate it from the
+        # point count; quantized modes keep only the quantized copy in RAM
+        points = metadata.row_count or 0
+        dimension = metadata.dimension or 0
+        original_bytes_per_dim = 4
+        if metadata.storage_mode == VectorStorageModeEnums.HALFVEC.value:
+            original_bytes_per_dim = 2
+        ram_bytes_per_dim = {
+            VectorStorageModeEnums.SCALAR.value: 1,
+            VectorStorageModeEnums.BINARY.value: 1 / 8,
+        }.get(metadata.storage_mode, original_bytes_per_dim)
+
+        return {
+            "vectors_bytes": points * dimension * original_bytes_per_dim,
+            "vectors_ram_bytes": math.ceil(points * dimension * ram_bytes_per_dim),
+        }
 
     async def delete_collection(self, collection_name: str):
-        if self.collection_exists(collection_name):
-            return self.client.delete_collection(collection_name)
+        if await self.collection_exists(collection_name):
+            self.collection_registry.invalidate(collection_name)
+            self.payload_indexes.pop(collection_name, None)
+            return await self.client.delete_collection(collection_name)
 
         return None
 
+    def _resolve_storage_mode(self, storage_mode: str = None) -> str:
+        storage_mode = storage_mode or self.storage_mode
+        supported = [mode.value for mode in VectorStorageModeEnums]
+        if storage_mode not in supported:
+            self.logger.warning(
+                "Storage mode %s is not supported by Qdrant, using float32",
+                storage_mode,
+            )
+            return VectorStorageModeEnums.FLOAT32.value
+        return storage_mode
+
     async def create_collection(
-        self, collection_name: str, embedding_size: int, do_reset: bool = False
+        self,
+        collection_name: str,
+        embedding_size: int,
+        do_reset: bool = False,
+        storage_mode: str = None,
     ) -> bool:
         if do_reset:
-            self.delete_collection(collection_name)
+            await self.delete_collection(collection_name)
 
-        if not self.collection_exists(collection_name):
-            self.client.create_collection(
+        storage_mode = self._resolve_storage_mode(storage_mode)
+        metadata = await self.get_collection_metadata(collection_name)
+
+        if metadata is None:
+            await self.client.create_collection(
                 collection_name=collection_name,
-                vectors_config=models.VectorParams(
-                    size=embedding_size, distance=self.distance_method
-                ),
+                vectors_config=self._vectors_config(embedding_size, storage_mode),
+                # BM25-style lexical search: the client sends term weights,
+                # qdrant keeps document frequencies and applies IDF
+                sparse_vectors_config={
+                    _TEXT_VECTOR: models.SparseVectorParams(
+                        modifier=models.Modifier.IDF
+                    )
+                },
+                quantization_config=self._quantization_config(storage_mode),
+            )
+            await self.index_payload_fields(collection_name)
+            self.collection_registry.invalidate(collection_name)
+            self.logger.info(
+                "Created collection on Qdrant %s with %s storage",
+                collection_name,
+                storage_mode,
             )
-            self.logger.info("Created collection on Qdrant %s", collection_name)
             return True
         else:
+            if metadata.storage_mode != storage_mode:
+                self.logger.warning(
+                    "Collection %s keeps its %s storage, reset it to use %s",
+                    collection_name,
+                    metadata.storage_mode,
+                    storage_mode,
+                )
+            if not metadata.details.get("has_text_vectors"):
+                self.logger.warning(
+                    "Collection %s has no lexical index, reset it to search it by text",
+                    collection_name,
+                )
             self.logger.info("Collection %s already exists", collection_name)
             return False
 
+    async def create_payload_index(
+        self, collection_name: str, field_name: str, field_schema
+    ) -> bool:
+        """Index a payload field once, so filtered searches stay on the HNSW graph."""
+        indexed = self.payload_indexes.setdefault(collection_name, {})
+        if indexed.get(field_name) == field_schema:
+            return False
+
+        try:
+            await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+            )
+        except Exception as e:
+            self.logger.error(
+                "Error indexing payload field %s of %s: %s",
+                field_name,
+                collection_name,
+                e,
+            )
+            return False
+
+        indexed[field_name] = field_schema
+        return True
+
+    async def index_payload_fields(
+        self, collection_name: str, metadatas: List[dict] = None
+    ):
+        """Index the filterable payload fields before points are written.
+
+        ``asset_id`` and ``chunk_order`` are always indexed; metadata keys
+        get a schema from the type of the values being written, so searches
+        never build an index and never guess a type from a query value.
+        """
+        field_schemas = {
+            "asset_id": models.PayloadSchemaType.INTEGER,
+            "chunk_order": models.PayloadSchemaType.INTEGER,
+        }
+        indexed = self.payload_indexes.get(collection_name, {})
+        for metadata in metadatas or []:
+            for key, value in (metadata or {}).items():
+                field_schema = self._payload_schema(value)
+                if field_schema is None:
+                    continue
+                key = f"metadata.{key}"
+                previous = field_schemas.get(key, indexed.get(key))
+                # a key holding both ints and floats is indexed as floats
+                if {previous, field_schema} == {
+                    models.PayloadSchemaType.INTEGER,
+                    models.PayloadSchemaType.FLOAT,
+                }:
+                    field_schema = models.PayloadSchemaType.FLOAT
+                field_schemas[key] = field_schema
+
+        for field_name, field_schema in field_schemas.items():
+            await self.create_payload_index(collection_name, field_name, field_schema)
+
+    @staticmethod
+    def _payload_schema(value):
+        if isinstance(value, bool):
+            return models.PayloadSchemaType.BOOL
+        if isinstance(value, int):
+            return models.PayloadSchemaType.INTEGER
+        if isinstance(value, float):
+            return models.PayloadSchemaType.FLOAT
+        if isinstance(value, str):
+            return models.PayloadSchemaType.KEYWORD
+        # nested values are not filterable
+        return None
+
+    def _vectors_config(self, embedding_size: int, storage_mode: str):
+        if storage_mode == VectorStorageModeEnums.HALFVEC.value:
+            return models.VectorParams(
+                size=embedding_size,
+                distance=self.distance_method,
+                datatype=models.Datatype.FLOAT16,
+            )
+        if storage_mode in (
+            VectorStorageModeEnums.SCALAR.value,
+            VectorStorageModeEnums.BINARY.value,
+        ):
+            # originals move to disk and are only read to re-score candidates
+            return models.VectorParams(
+                size=embedding_size, distance=self.distance_method, on_disk=True
+            )
+        return models.VectorParams(size=embedding_size, distance=self.distance_method)
+
+    def _quantization_config(self, storage_mode: str):
+        if storage_mode == VectorStorageModeEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            )
+        if storage_mode == VectorStorageModeEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(always_ram=True)
+            )
+        return None
+
     async def insert_one(
         self,
         collection_name: str,
@@ -80,15 +328,21 @@ class QdrantDBProvider(VectorDBInterface):
         metadata: dict = None,
         record_id: int = None,
     ):
-        if not self.collection_exists(collection_name):
+        collection_metadata = await self.get_collection_metadata(collection_name)
+        if collection_metadata is None:
             self.logger.error("Collection %s does not exist", collection_name)
             return False
 
+        await self.index_payload_fields(collection_name, [metadata])
+
+        if collection_metadata.details.get("has_text_vectors"):
+            vector = {"": vector, _TEXT_VECTOR: self._text_vector(text or "")}
+
         try:
-            _ = self.client.upload_records(
+            _ = await self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
+                points=[
+                    models.PointStruct(
                         id=record_id,
                         vector=vector,
                         payload={"text": text, "metadata": metadata},
@@ -108,8 +362,14 @@ class QdrantDBProvider(VectorDBInterface):
         metadatas: List[dict] = None,
         record_ids: List[int] = None,
         batch_size: int = 50,
+        content_hashes: List[str] = None,
+        embedding_model: str = None,
+        defer_index: bool = False,
+        asset_ids: List[int] = None,
+        chunk_orders: List[int] = None,
     ):
-        if not self.collection_exists(collection_name):
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None:
             self.logger.error("Collection %s does not exist", collection_name)
             return False
 
@@ -119,44 +379,348 @@ class QdrantDBProvider(VectorDBInterface):
         if record_ids is None:
             record_ids = [None] * len(texts)
 
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i : i + batch_size]
-            batch_vectors = vectors[i : i + batch_size]
-            batch_metadatas = metadatas[i : i + batch_size]
-            batch_record_ids = record_ids[i : i + batch_size]
-
-            records = [
-                models.Record(
-                    id=batch_record_ids[j],
-                    vector=batch_vectors[j],
-                    payload={"text": batch_texts[j], "metadata": batch_metadatas[j]},
-                )
-                for j in range(len(batch_texts))
-            ]
-            try:
-                _ = self.client.upload_records(
-                    collection_name=collection_name,
-                    records=records,
+        if content_hashes is None:
+            content_hashes = [None] * len(texts)
+
+        if asset_ids is None:
+            asset_ids = [None] * len(texts)
+
+        if chunk_orders is None:
+            chunk_orders = [None] * len(texts)
+
+        await self.index_payload_fields(collection_name, metadatas)
+
+        # AsyncQdrantClient.upload_points is blocking and forks a process
+        # pool when parallel > 1, so batches are upserted concurrently instead
+        semaphore = asyncio.Semaphore(self.upload_parallel)
+
+        async def upsert_batch(start: int):
+            batch = models.Batch(
+                ids=record_ids[start : start + batch_size],
+                vectors=self._batch_vectors(
+                    metadata,
+                    texts[start : start + batch_size],
+                    vectors[start : start + batch_size],
+                ),
+                payloads=[
+                    {
+                        "text": _text,
+                        "metadata": _metadata,
+                        "content_hash": _content_hash,
+                        "embedding_model": embedding_model,
+                        "asset_id": _asset_id,
+                        "chunk_order": _chunk_order,
+                    }
+                    for _text, _metadata, _content_hash, _asset_id, _chunk_order in zip(
+                        texts[start : start + batch_size],
+                        metadatas[start : start + batch_size],
+                        content_hashes[start : start + batch_size],
+                        asset_ids[start : start + batch_size],
+                        chunk_orders[start : start + batch_size],
+                    )
+                ],
+            )
+            async with semaphore:
+                await self.client.upsert(
+                    collection_name=collection_name, points=batch, wait=True
                 )
-            except Exception as e:
-                self.logger.error("Error inserting batch: %s", e)
-                return False
+
+        try:
+            await asyncio.gather(
+                *(upsert_batch(start) for start in range(0, len(texts), batch_size))
+            )
+        except Exception as e:
+            self.logger.error("Error inserting batch: %s", e)
+            self.collection_registry.invalidate(collection_name)
+            return False
 
         return True
 
-    async def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
-    ) -> List[RetrievedDocument]:
-        results = self.client.search(
+    def _batch_vectors(
+        self, metadata: CollectionMetadata, texts: List[str], vectors: List[list]
+    ):
+        # collections created before lexical search only hold the dense vector
+        if not metadata.details.get("has_text_vectors"):
+            return vectors
+
+        # a batch takes named vectors column-wise, one list per name
+        return {
+            "": vectors,
+            _TEXT_VECTOR: [self._text_vector(text or "") for text in texts],
+        }
+
+    def _text_vector(self, text: str, query: bool = False) -> models.SparseVector:
+        weights = hashed_term_weights(text, query=query)
+        return models.SparseVector(
+            indices=list(weights.keys()), values=list(weights.values())
+        )
+
+    async def finalize_collection(self, collection_name: str) -> bool:
+        # qdrant's optimizer builds the HNSW graph in the background
+        return True
+
+    async def get_record_fingerprints(
+        self, collection_name: str, record_ids: List[int]
+    ) -> Dict[int, Tuple[str, str]]:
+        if not record_ids:
+            return {}
+
+        records = await self.client.retrieve(
             collection_name=collection_name,
-            query_vector=vector,
-            limit=limit,
+            ids=list(record_ids),
+            with_payload=["content_hash", "embedding_model"],
+            with_vectors=False,
         )
 
-        if not results or len(results) == 0:
-            return None
+        return {
+            record.id: (
+                record.payload.get("content_hash"),
+                record.payload.get("embedding_model"),
+            )
+            for record in records
+        }
+
+    async def list_record_ids(self, collection_name: str) -> List[int]:
+        record_ids = []
+        offset = None
+
+        while True:
+            records, offset = await self.client.scroll(
+                collection_name=collection_name,
+                limit=1000,
+                offset=offset,
+                with_payload=False,
+                with_vectors=False,
+            )
+            record_ids.extend(record.id for record in records)
+
+            if offset is None:
+                break
+
+        return record_ids
+
+    async def delete_records(self, collection_name: str, record_ids: List[int]) -> int:
+        if not record_ids:
+            return 0
+
+        # qdrant's delete does not report a count, so only delete the ids
+        # that exist and count those
+        records = await self.client.retrieve(
+            collection_name=collection_name,
+            ids=list(record_ids),
+            with_payload=False,
+            with_vectors=False,
+        )
+        existing_ids = [record.id for record in records]
+        if not existing_ids:
+            return 0
+
+        await self.client.delete(
+            collection_name=collection_name,
+            points_selector=models.PointIdsList(points=existing_ids),
+        )
+        return len(existing_ids)
+
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        exact: bool = False,
+        search_filter: SearchFilter = None,
+        with_vectors: bool = False,
+    ) -> List[RetrievedDocument]:
+        # probes only applies to IVFFlat, qdrant indexes are always HNSW
+        try:
+            response = await self.client.query_points(
+                collection_name=collection_name,
+                query=vector,
+                limit=limit,
+                query_filter=self._query_filter(search_filter),
+                search_params=self._search_params(ef_search, exact),
+                # only the fields RetrievedDocument needs cross the wire,
+                # the dense vector without the sparse text one
+                with_payload=["text"],
+                with_vectors=[""] if with_vectors else False,
+            )
+        except Exception as e:
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            self.collection_registry.invalidate(collection_name)
+            return []
+
+        return [
+            RetrievedDocument(
+                score=point.score,
+                text=point.payload["text"],
+                record_id=point.id,
+                vector=self._dense_vector(point) if with_vectors else None,
+            )
+            for point in response.points
+        ]
+
+    @staticmethod
+    def _dense_vector(point) -> Optional[list]:
+        # named vectors come back as a dict, the dense one under ""
+        if isinstance(point.vector, dict):
+            return point.vector.get("")
+        return point.vector
+
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        search_filter: SearchFilter = None,
+    ) -> List[List[RetrievedDocument]]:
+        if not vectors:
+            return []
+
+        query_filter = self._query_filter(search_filter)
+        search_params = self._search_params(ef_search)
+
+        try:
+            responses = await self.client.query_batch_points(
+                collection_name=collection_name,
+                requests=[
+                    models.QueryRequest(
+                        query=vector,
+                        limit=limit,
+                        filter=query_filter,
+                        params=search_params,
+                        with_payload=["text"],
+                        with_vector=False,
+                    )
+                    for vector in vectors
+                ],
+            )
+        except Exception as e:
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            self.collection_registry.invalidate(collection_name)
+            return []
 
         return [
-            RetrievedDocument(**{"score": record.score, "text": record.payload["text"]})
-            for record in results
+            [
+                RetrievedDocument(
+                    score=point.score, text=point.payload["text"], record_id=point.id
+                )
+                for point in response.points
+            ]
+            for response in responses
         ]
+
+    async def search_by_text(
+        self,
+        collection_name: str,
+        text: str,
+        limit: int,
+        search_filter: SearchFilter = None,
+    ) -> List[RetrievedDocument]:
+        query_vector = self._text_vector(text, query=True)
+        if not query_vector.indices:
+            return []
+
+        metadata = await self.get_collection_metadata(collection_name)
+        if metadata is None or not metadata.details.get("has_text_vectors"):
+            return []
+
+        try:
+            response = await self.client.query_points(
+                collection_name=collection_name,
+                query=query_vector,
+                using=_TEXT_VECTOR,
+                limit=limit,
+                query_filter=self._query_filter(search_filter),
+                with_payload=["text"],
+                with_vectors=False,
+            )
+        except Exception as e:
+            self.logger.error("Error searching collection %s: %s", collection_name, e)
+            self.collection_registry.invalidate(collection_name)
+            return []
+
+        return [
+            RetrievedDocument(
+                score=point.score, text=point.payload["text"], record_id=point.id
+            )
+            for point in response.points
+        ]
+
+    def _search_params(self, ef_search: int = None, exact: bool = False):
+        if exact:
+            # brute force over the original vectors, the ground truth for recall
+            return models.SearchParams(
+                exact=True, quantization=models.QuantizationSearchParams(ignore=True)
+            )
+
+        # quantized collections score candidates on the in-RAM copy, then
+        # re-score the oversampled top hits with the original vectors
+        return models.SearchParams(
+            hnsw_ef=ef_search or self.hnsw_ef,
+            quantization=models.QuantizationSearchParams(
+                rescore=True, oversampling=self.rescore_oversampling
+            ),
+        )
+
+    def _query_filter(self, search_filter: SearchFilter = None):
+        """Translate a filter into qdrant conditions on indexed payload fields.
+
+        Qdrant's query planner checks the filter while walking the HNSW graph
+        (or switches to the payload index for very selective filters), so
+        filtered searches still return ``limit`` points when enough match.
+        The fields are indexed when points are written, see
+        ``index_payload_fields``.
+        """
+        if search_filter is None or search_filter.is_empty():
+            return None
+
+        conditions = []
+
+        if search_filter.asset_ids is not None:
+            conditions.append(
+                models.FieldCondition(
+                    key="asset_id", match=models.MatchAny(any=search_filter.asset_ids)
+                )
+            )
+
+        if (
+            search_filter.chunk_order_gte is not None
+            or search_filter.chunk_order_lte is not None
+        ):
+            conditions.append(
+                models.FieldCondition(
+                    key="chunk_order",
+                    range=models.Range(
+                        gte=search_filter.chunk_order_gte,
+                        lte=search_filter.chunk_order_lte,
+                    ),
+                )
+            )
+
+        for condition in search_filter.metadata:
+            key = f"metadata.{condition.key}"
+
+            if condition.eq is not None:
+                if isinstance(condition.eq, float):
+                    # MatchValue has no float variant
+                    match_range = models.Range(gte=condition.eq, lte=condition.eq)
+                    conditions.append(
+                        models.FieldCondition(key=key, range=match_range)
+                    )
+                else:
+                    conditions.append(
+                        models.FieldCondition(
+                            key=key, match=models.MatchValue(value=condition.eq)
+                        )
+                    )
+
+            bounds = condition.range_bounds()
+            if bounds:
+                conditions.append(
+                    models.FieldCondition(key=key, range=models.Range(**bounds))
+                )
+
+        return models.Filter(must=conditions)
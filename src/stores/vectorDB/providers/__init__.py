@@ -1,2 +1,3 @@
 from .QdrantDBProvider import QdrantDBProvider
 from .PgVectorProvider import PgVectorProvider
+from .EmbeddedVectorProvider import EmbeddedVectorProvider
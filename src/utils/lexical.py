@@ -0,0 +1,30 @@
+from collections import Counter
+from typing import Dict, List
+import re
+import zlib
+
+# letters, digits and underscore in any script, so Arabic words and the
+# parts of identifiers like "AB-1234" become separate terms
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+# BM25 term-frequency saturation; document length is not normalized
+_BM25_K1 = 1.2
+
+
+def lexical_tokens(text: str) -> List[str]:
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+def unique_lexical_tokens(text: str) -> List[str]:
+    return list(dict.fromkeys(lexical_tokens(text)))
+
+
+def hashed_term_weights(text: str, query: bool = False) -> Dict[int, float]:
+    """Sparse vector of hashed terms; the index applies IDF on its side."""
+    counts = Counter(lexical_tokens(text))
+    return {
+        zlib.crc32(term.encode("utf-8")): (
+            1.0 if query else count * (_BM25_K1 + 1) / (count + _BM25_K1)
+        )
+        for term, count in counts.items()
+    }
@@ -12,6 +12,40 @@ REQUEST_LATENCY = Histogram(
     "http_request_duration_seconds", "HTTP Request Latency", ["method", "endpoint"]
 )
 
+EMBEDDING_CACHE_HITS = Counter(
+    "embedding_cache_hits_total", "Embedding Cache Hits", ["tier"]
+)
+
+EMBEDDING_CACHE_MISSES = Counter(
+    "embedding_cache_misses_total", "Embedding Cache Misses"
+)
+
+ANSWER_CACHE_HITS = Counter("answer_cache_hits_total", "Answer Cache Hits", ["level"])
+
+ANSWER_CACHE_MISSES = Counter("answer_cache_misses_total", "Answer Cache Misses")
+
+RAG_CONTEXT_TOKENS = Histogram(
+    "rag_context_tokens",
+    "Tokens of Retrieved Text Packed into an Answer Prompt",
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384),
+)
+
+RAG_CONTEXT_DROPPED = Counter(
+    "rag_context_dropped_total", "Retrieved Documents Left Out of a Prompt", ["reason"]
+)
+
+EMBEDDING_BATCH_SIZE = Histogram(
+    "embedding_batch_size",
+    "Texts per Coalesced Embedding Call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+
+EMBEDDING_BATCH_QUEUE_DELAY = Histogram(
+    "embedding_batch_queue_delay_seconds",
+    "Time a Text Waits Before its Embedding Batch is Sent",
+    buckets=(0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25),
+)
+
 
 class PrometheusMiddleware(BaseHTTPMiddleware):
     async def dispatch(self, request: Request, call_next):
@@ -0,0 +1,75 @@
+from typing import Optional
+import logging
+import re
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# used for models tiktoken has no mapping for, e.g. Cohere's
+_FALLBACK_ENCODING = "cl100k_base"
+
+# without tiktoken: words, and every other symbol alone, much like BPE splits
+_ESTIMATE_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+# BPE vocabularies average about four characters of English per token
+_CHARACTERS_PER_TOKEN = 4
+
+
+class TokenCounter:
+    """Counts and truncates text in the generation model's tokens.
+
+    Uses the model's tiktoken encoding when one is known, ``cl100k_base``
+    for other models, and an estimate when tiktoken is unavailable.
+    ``name`` identifies the tokenizer, so stored counts from another one
+    are not reused.
+    """
+
+    def __init__(self, model_id: str = None):
+        self.encoding = self._load_encoding(model_id)
+        self.name = f"tiktoken:{self.encoding.name}" if self.encoding else "estimate"
+
+    @staticmethod
+    def _load_encoding(model_id: Optional[str]):
+        if tiktoken is None:
+            return None
+
+        try:
+            try:
+                return tiktoken.encoding_for_model(model_id or "")
+            except KeyError:
+                return tiktoken.get_encoding(_FALLBACK_ENCODING)
+        except Exception as e:
+            # the encodings are downloaded on first use
+            logging.getLogger("uvicorn").warning(
+                "Could not load a tiktoken encoding, estimating tokens: %s", e
+            )
+            return None
+
+    def count(self, text: str) -> int:
+        if self.encoding is not None:
+            return len(self.encoding.encode_ordinary(text))
+
+        # long words are split into several tokens
+        return sum(
+            -(-len(piece) // _CHARACTERS_PER_TOKEN)
+            for piece in _ESTIMATE_PATTERN.findall(text)
+        )
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+
+        if self.encoding is not None:
+            tokens = self.encoding.encode_ordinary(text)
+            if len(tokens) <= max_tokens:
+                return text
+            return self.encoding.decode(tokens[:max_tokens])
+
+        count = 0
+        for match in _ESTIMATE_PATTERN.finditer(text):
+            count += -(-len(match.group()) // _CHARACTERS_PER_TOKEN)
+            if count > max_tokens:
+                return text[: match.start()].rstrip()
+        return text
@@ -0,0 +1,224 @@
+from src.helpers.config import Settings
+from src.helpers.resources import setup_resources, close_resources
+from src.helpers.extraction_executor import ExtractionExecutor
+from src.controllers import NLPController, ProcessController, IngestController
+from src.models import (
+    ProjectModel,
+    ChunkModel,
+    JobModel,
+    JobTypeEnums,
+)
+from src.models.db_schemas import Job
+import asyncio
+import logging
+import os
+import socket
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class JobWorker:
+    """Claims queued jobs from Postgres and runs them.
+
+    Any number of worker processes can run against the same database; each
+    one runs ``concurrency`` claim loops, heartbeats the jobs it holds and
+    requeues jobs whose worker stopped heartbeating.
+    """
+
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}"
+
+        self.stop_event = asyncio.Event()
+
+        self.handlers = {
+            JobTypeEnums.PROCESS.value: self.run_process_job,
+            JobTypeEnums.INDEX.value: self.run_index_job,
+        }
+
+    def stop(self):
+        self.stop_event.set()
+
+    async def run(self):
+        await setup_resources(self, self.settings)
+        # only workers parse files, the API just enqueues process jobs
+        self.extraction_executor = ExtractionExecutor(
+            max_workers=self.settings.EXTRACTION_MAX_WORKERS,
+            pages_per_task=self.settings.EXTRACTION_PAGES_PER_TASK,
+        )
+        self.job_model = await JobModel.create_instance(self.db_client)
+
+        logger.info(
+            f"Worker {self.worker_id} started with "
+            f"{self.settings.JOB_WORKER_CONCURRENCY} job slots"
+        )
+
+        try:
+            async with asyncio.TaskGroup() as tg:
+                tg.create_task(self.requeue_stale_jobs())
+                for _ in range(self.settings.JOB_WORKER_CONCURRENCY):
+                    tg.create_task(self.claim_loop())
+        finally:
+            self.extraction_executor.shutdown()
+            await close_resources(self)
+            logger.info(f"Worker {self.worker_id} stopped")
+
+    async def claim_loop(self):
+        while not self.stop_event.is_set():
+            try:
+                job = await self.job_model.claim_next_job(self.worker_id)
+            except Exception as e:
+                logger.error(f"Error claiming job: {e}")
+                job = None
+
+            if job is None:
+                await self.wait(self.settings.JOB_POLL_INTERVAL)
+                continue
+
+            await self.run_job(job)
+
+    async def run_job(self, job: Job):
+        logger.info(f"Running {job.type} job {job.id} (attempt {job.attempts})")
+
+        handler = self.handlers.get(job.type)
+        if handler is None:
+            await self.job_model.fail_job(job.id, f"unknown job type: {job.type}")
+            return
+
+        heartbeat = asyncio.create_task(self.heartbeat(job.id))
+        try:
+            result = await handler(job)
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            await self.job_model.fail_job(job.id, str(e))
+            return
+        finally:
+            heartbeat.cancel()
+
+        if result is None:
+            await self.job_model.fail_job(job.id, "job returned no result")
+            return
+
+        await self.job_model.complete_job(job.id, result)
+        logger.info(f"Job {job.id} succeeded")
+
+    async def run_process_job(self, job: Job):
+        payload = job.payload
+
+        project_model = await ProjectModel.create_instance(self.db_client)
+        chunk_model = await ChunkModel.create_instance(self.db_client)
+
+        project = await project_model.get_project_or_create_one(job.project_id)
+
+        if payload.get("do_reset"):
+            nlp_controller = self.create_nlp_controller()
+            _ = await nlp_controller.reset_vector_db_collection(project)
+            await project_model.bump_index_version(project.id)
+
+            deleted_count = await chunk_model.delete_chunks_by_project(project.id)
+            logger.info(
+                f"Reset: Deleted {deleted_count} chunks for project_id: {project.id}"
+            )
+
+        # JSON object keys are strings, asset ids are ints
+        project_files_ids = {
+            int(asset_id): file_id
+            for asset_id, file_id in payload["project_files_ids"].items()
+        }
+
+        if job.attempts > 1 and not payload.get("do_reset"):
+            # a requeued job: drop what earlier attempts inserted, so running
+            # it again does not duplicate their chunks; vectors go first, the
+            # pgvector tables reference the chunks
+            chunk_ids = await chunk_model.get_chunk_ids_by_job(project.id, job.id)
+            if chunk_ids:
+                _ = await self.create_nlp_controller().delete_vectors(
+                    project, chunk_ids
+                )
+            deleted_count = await chunk_model.delete_chunks_by_job(project.id, job.id)
+            logger.info(
+                f"Retry: Deleted {deleted_count} chunks of job {job.id} "
+                f"from an earlier attempt"
+            )
+
+        ingest_controller = IngestController(
+            ProcessController(project.id),
+            chunk_model,
+            self.extraction_executor,
+            job_id=job.id,
+        )
+
+        return await ingest_controller.ingest_files(
+            project.id,
+            project_files_ids,
+            chunk_size=payload["chunk_size"],
+            overlap_size=payload["overlap_size"],
+            min_chunk_size=payload["min_chunk_size"],
+            on_progress=self.progress_callback(job.id),
+        )
+
+    async def run_index_job(self, job: Job):
+        payload = job.payload
+
+        project_model = await ProjectModel.create_instance(self.db_client)
+        chunk_model = await ChunkModel.create_instance(self.db_client)
+
+        project = await project_model.get_project_or_create_one(job.project_id)
+
+        try:
+            return await self.create_nlp_controller().push_project_index(
+                project,
+                chunk_model,
+                do_reset=bool(payload.get("do_reset")),
+                page_size=payload["page_size"],
+                incremental=bool(payload.get("incremental")),
+                on_progress=self.progress_callback(job.id),
+                storage_mode=payload.get("storage_mode"),
+            )
+        finally:
+            # even a failed push may have changed the index, drop cached answers
+            await project_model.bump_index_version(project.id)
+
+    def create_nlp_controller(self) -> NLPController:
+        return NLPController(
+            vector_db_client=self.vector_db_client,
+            embedding_client=self.embedding_client,
+            generation_client=self.generation_client,
+            template_parser=self.template_parser,
+        )
+
+    def progress_callback(self, job_id: int):
+        async def on_progress(processed: int, total: int):
+            await self.job_model.update_job_progress(job_id, processed, total)
+
+        return on_progress
+
+    async def heartbeat(self, job_id: int):
+        while True:
+            await asyncio.sleep(self.settings.JOB_HEARTBEAT_INTERVAL)
+            try:
+                await self.job_model.touch_job(job_id)
+            except Exception as e:
+                logger.error(f"Error sending heartbeat for job {job_id}: {e}")
+
+    async def requeue_stale_jobs(self):
+        while not self.stop_event.is_set():
+            try:
+                requeued, failed = await self.job_model.requeue_stale_jobs(
+                    self.settings.JOB_STALE_AFTER,
+                    self.settings.JOB_MAX_ATTEMPTS,
+                )
+                if requeued or failed:
+                    logger.warning(
+                        f"Requeued {requeued} and failed {failed} stale jobs"
+                    )
+            except Exception as e:
+                logger.error(f"Error requeueing stale jobs: {e}")
+
+            await self.wait(self.settings.JOB_HEARTBEAT_INTERVAL)
+
+    async def wait(self, seconds: float):
+        try:
+            await asyncio.wait_for(self.stop_event.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
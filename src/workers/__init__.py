@@ -0,0 +1 @@
+from .JobWorker import JobWorker
@@ -0,0 +1,21 @@
+from src.helpers.config import get_settings
+from src.workers import JobWorker
+import asyncio
+import logging
+import signal
+
+
+async def main():
+    worker = JobWorker(get_settings())
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    await worker.run()
+
+
+# the extraction pool spawns fresh interpreters that re-import this module
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
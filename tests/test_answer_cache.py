@@ -0,0 +1,82 @@
+from src.stores.LLM.AnswerCache import AnswerCache
+import asyncio
+
+
+def test_concurrent_identical_calls_run_the_loader_once():
+    cache = AnswerCache()
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "answer", [1.0, 0.0]
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                cache.get_or_load(1, 0, "scope", query, loader)
+                for query in ["What is RAG?", "what is  rag?", "WHAT IS RAG?"]
+            )
+        )
+
+    assert asyncio.run(run()) == ["answer"] * 3
+    assert len(calls) == 1
+
+
+def test_a_cancelled_loader_hands_the_work_to_the_next_waiter():
+    cache = AnswerCache()
+    started = asyncio.Event()
+
+    async def stalled_loader():
+        started.set()
+        await asyncio.sleep(10)
+        return "never", None
+
+    async def loader():
+        return "answer", None
+
+    async def run():
+        first = asyncio.create_task(
+            cache.get_or_load(1, 0, "scope", "query", stalled_loader)
+        )
+        await started.wait()
+        second = asyncio.create_task(cache.get_or_load(1, 0, "scope", "query", loader))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        results = await asyncio.gather(first, second, return_exceptions=True)
+        return results, cache.in_flight
+
+    (first, second), in_flight = asyncio.run(run())
+
+    assert isinstance(first, asyncio.CancelledError)
+    assert second == "answer"
+    assert not in_flight
+
+
+def test_a_bumped_index_version_stops_stale_answers():
+    cache = AnswerCache()
+    answers = iter(["old", "new"])
+
+    async def loader():
+        return next(answers), [1.0, 0.0]
+
+    async def run():
+        await cache.get_or_load(1, 0, "scope", "query", loader)
+        fresh = await cache.get_or_load(1, 1, "scope", "query", loader)
+        return fresh, cache.get_exact(1, 0, ("scope", "query"))
+
+    fresh, stale = asyncio.run(run())
+
+    assert fresh == "new"
+    assert stale is None
+    assert cache.get_similar(1, 0, "scope", [1.0, 0.0]) is None
+
+
+def test_similar_queries_reuse_an_answer_above_the_threshold():
+    cache = AnswerCache(similarity_threshold=0.95)
+    cache.put(1, 0, ("scope", "query"), "answer", [1.0, 0.0])
+
+    assert cache.get_similar(1, 0, "scope", [1.0, 0.1]) == "answer"
+    assert cache.get_similar(1, 0, "scope", [1.0, 1.0]) is None
+    assert cache.get_similar(1, 0, "other scope", [1.0, 0.1]) is None
@@ -0,0 +1,26 @@
+from src.models.db_schemas import RetrievedDocument
+from src.stores.LLM.ContextPacker import ContextPacker
+import asyncio
+
+
+class WordCounter:
+    name = "words"
+
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        return " ".join(text.split()[:max_tokens])
+
+
+def test_pack_keeps_the_retrieval_order():
+    documents = [
+        RetrievedDocument(text="alpha beta", score=0.01),
+        RetrievedDocument(text="gamma delta", score=0.9),
+        RetrievedDocument(text="epsilon zeta", score=0.5),
+    ]
+    packer = ContextPacker(WordCounter(), max_tokens=4, min_fragment_tokens=1)
+
+    packed = asyncio.run(packer.pack(documents))
+
+    assert [document.text for document in packed] == ["alpha beta", "gamma delta"]
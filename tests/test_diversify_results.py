@@ -0,0 +1,50 @@
+from src.controllers.NLPController import NLPController
+from src.models.db_schemas import RetrievedDocument
+import numpy as np
+
+
+def document(text: str, score: float, vector: list = None) -> RetrievedDocument:
+    return RetrievedDocument(text=text, score=score, vector=vector)
+
+
+def test_lexical_only_hits_keep_their_fused_ranks():
+    rng = np.random.default_rng(0)
+    query = rng.standard_normal(8).tolist()
+    dense = [
+        document(f"v{i}", 1 - i / 100, (rng.standard_normal(8) + query).tolist())
+        for i in range(12)
+    ]
+    lexical = [document(f"lex{i}", 0.5 - i / 100) for i in range(8)]
+    # hybrid fusion keeps the vector hits' copies first
+    fused = dense[:3] + [lexical[0]] + dense[3:] + lexical[1:]
+
+    results = NLPController.diversify_results(fused, query, limit=5, mmr_lambda=0.5)
+
+    texts = [doc.text for doc in results]
+    assert len(texts) == 5
+    assert texts[3] == "lex0"
+    assert all(not text.startswith("lex") for text in texts[:3] + texts[4:])
+    assert all(doc.vector is None for doc in results)
+
+
+def test_near_duplicates_are_passed_over():
+    query = [1.0, 0.0, 0.0]
+    fused = [
+        document("a", 0.9, [1.0, 0.1, 0.0]),
+        document("a copy", 0.89, [1.0, 0.1, 0.0]),
+        document("b", 0.8, [1.0, -0.1, 0.0]),
+    ]
+
+    results = NLPController.diversify_results(fused, query, limit=2, mmr_lambda=0.5)
+
+    assert [doc.text for doc in results] == ["a", "b"]
+
+
+def test_only_lexical_hits_keep_the_input_order():
+    fused = [document(f"lex{i}", 1 - i / 10) for i in range(4)]
+
+    results = NLPController.diversify_results(
+        fused, [1.0, 0.0], limit=3, mmr_lambda=0.5
+    )
+
+    assert [doc.text for doc in results] == ["lex0", "lex1", "lex2"]
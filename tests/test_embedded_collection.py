@@ -0,0 +1,44 @@
+from src.stores.vectorDB.EmbeddedCollection import EmbeddedCollection
+import numpy as np
+
+
+def make_collection(path, count: int = 20, dimension: int = 4) -> tuple:
+    collection = EmbeddedCollection.create(str(path), dimension, "cosine")
+    vectors = np.random.default_rng(0).standard_normal((count, dimension)).tolist()
+    collection.append(
+        vectors,
+        texts=[f"text {i}" for i in range(count)],
+        metadatas=[{}] * count,
+        record_ids=list(range(count)),
+        content_hashes=[None] * count,
+    )
+    return collection, vectors
+
+
+def test_search_returns_the_text_of_each_scored_record(tmp_path):
+    collection, vectors = make_collection(tmp_path)
+
+    (text, record_id, score), *_ = collection.search(vectors[7], limit=3)
+
+    assert (text, record_id) == ("text 7", 7)
+    assert score > 0.99
+    collection.close()
+
+
+def test_search_retries_when_rows_are_renumbered_mid_search(tmp_path):
+    reader, vectors = make_collection(tmp_path)
+    stale = reader.refresh()
+
+    # another process compacts: rows after the deleted ones move down
+    writer = EmbeddedCollection.open(str(tmp_path))
+    assert writer.delete([0, 1, 2, 3, 4]) == 5
+    assert writer.finalize(index_threshold=1000)["compacted"]
+    writer.close()
+
+    # a search that scored against the old snapshot must not pair its rows
+    # with the renumbered records
+    assert reader._search_state(stale, [vectors[10]], limit=1) is None
+
+    ((text, record_id, _),) = reader.search(vectors[10], limit=1)
+    assert (text, record_id) == ("text 10", 10)
+    reader.close()
@@ -0,0 +1,58 @@
+from src.stores.LLM.EmbeddingBatcher import EmbeddingBatcher
+import asyncio
+
+
+class FakeEmbeddingClient:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    async def embed_text_async(self, texts: list, document_type: str):
+        self.calls.append((document_type, list(texts)))
+        if self.fail:
+            raise RuntimeError("provider down")
+        return [[float(len(text)), float(ord(text[0]))] for text in texts]
+
+
+def embed_all(batcher: EmbeddingBatcher, requests: list) -> list:
+    async def run():
+        calls = [batcher.embed(text, document_type) for text, document_type in requests]
+        return await asyncio.wait_for(asyncio.gather(*calls), timeout=1)
+
+    return asyncio.run(run())
+
+
+def test_a_full_batch_is_sent_without_waiting_for_the_timer():
+    client = FakeEmbeddingClient()
+    batcher = EmbeddingBatcher(client, max_wait_ms=60_000, max_batch_size=3)
+
+    embed_all(batcher, [("a", "query"), ("bb", "query"), ("ccc", "query")])
+
+    assert client.calls == [("query", ["a", "bb", "ccc"])]
+
+
+def test_a_partial_batch_is_sent_when_the_timer_fires():
+    client = FakeEmbeddingClient()
+    batcher = EmbeddingBatcher(client, max_wait_ms=10, max_batch_size=100)
+
+    embed_all(batcher, [("a", "query"), ("bb", "query")])
+
+    assert client.calls == [("query", ["a", "bb"])]
+
+
+def test_each_caller_gets_its_own_vector():
+    client = FakeEmbeddingClient()
+    batcher = EmbeddingBatcher(client, max_wait_ms=10, max_batch_size=100)
+
+    vectors = embed_all(batcher, [("a", "query"), ("bbb", "document"), ("cc", "query")])
+
+    assert vectors == [[1.0, 97.0], [3.0, 98.0], [2.0, 99.0]]
+    assert sorted(client.calls) == [("document", ["bbb"]), ("query", ["a", "cc"])]
+
+
+def test_a_failed_call_resolves_every_caller_with_none():
+    batcher = EmbeddingBatcher(
+        FakeEmbeddingClient(fail=True), max_wait_ms=10, max_batch_size=100
+    )
+
+    assert embed_all(batcher, [("a", "query"), ("b", "query")]) == [None, None]
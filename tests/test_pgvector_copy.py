@@ -0,0 +1,33 @@
+from src.stores.vectorDB.providers.PgVectorProvider import _encode_copy_rows
+import json
+import struct
+
+
+def read_fields(row: bytes) -> list:
+    (field_count,) = struct.unpack_from(">h", row)
+    position = 2
+    fields = []
+    for _ in range(field_count):
+        (length,) = struct.unpack_from(">i", row, position)
+        position += 4
+        fields.append(row[position : position + length] if length >= 0 else None)
+        position += max(length, 0)
+    return fields
+
+
+def test_missing_metadata_is_copied_as_an_empty_object():
+    row = _encode_copy_rows(
+        texts=["text"],
+        vectors=[[0.5, 1.0]],
+        metadatas=[None],
+        record_ids=[1],
+        content_hashes=["hash"],
+        embedding_model="model",
+        asset_ids=[1],
+        chunk_orders=[1],
+    )
+
+    metadata = read_fields(row)[2]
+
+    assert metadata[:1] == b"\x01"
+    assert json.loads(metadata[1:]) == {}
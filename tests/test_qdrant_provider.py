@@ -0,0 +1,67 @@
+from src.models.db_schemas import SearchFilter
+from src.stores.vectorDB.providers.QdrantDBProvider import QdrantDBProvider
+from qdrant_client import models
+import asyncio
+
+
+def test_insert_one_stores_the_record_metadata(tmp_path):
+    async def run():
+        provider = QdrantDBProvider(str(tmp_path), default_vector_size=4)
+        await provider.connect()
+        try:
+            await provider.create_collection("chunks", embedding_size=4)
+            inserted = await provider.insert_one(
+                "chunks",
+                text="hello",
+                vector=[0.1, 0.2, 0.3, 0.4],
+                metadata={"page": 3},
+                record_id=7,
+            )
+            (record,) = await provider.client.retrieve("chunks", ids=[7])
+            return inserted, record.payload
+        finally:
+            await provider.disconnect()
+
+    inserted, payload = asyncio.run(run())
+
+    assert inserted
+    assert payload == {"text": "hello", "metadata": {"page": 3}}
+
+
+def test_payload_fields_are_indexed_on_write_not_on_search(tmp_path):
+    async def run():
+        provider = QdrantDBProvider(str(tmp_path), default_vector_size=2)
+        await provider.connect()
+        try:
+            await provider.create_collection("chunks", embedding_size=2)
+            await provider.insert_many(
+                "chunks",
+                texts=["a", "b", "c"],
+                vectors=[[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]],
+                metadatas=[{"page": 1, "lang": "en"}, {"page": 2.5}, {"tags": []}],
+                record_ids=[1, 2, 3],
+                asset_ids=[1, 1, 2],
+                chunk_orders=[1, 2, 1],
+            )
+            indexed = dict(provider.payload_indexes["chunks"])
+
+            search_filter = SearchFilter(
+                asset_ids=[1], metadata=[{"key": "page", "gte": 2}]
+            )
+            documents = await provider.search_by_vector(
+                "chunks", [0.0, 1.0], limit=3, search_filter=search_filter
+            )
+            return indexed, provider.payload_indexes["chunks"], documents
+        finally:
+            await provider.disconnect()
+
+    indexed, after_search, documents = asyncio.run(run())
+
+    assert indexed == {
+        "asset_id": models.PayloadSchemaType.INTEGER,
+        "chunk_order": models.PayloadSchemaType.INTEGER,
+        "metadata.page": models.PayloadSchemaType.FLOAT,
+        "metadata.lang": models.PayloadSchemaType.KEYWORD,
+    }
+    assert after_search == indexed
+    assert [document.record_id for document in documents] == [2]
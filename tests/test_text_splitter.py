@@ -0,0 +1,51 @@
+from src.helpers.text_splitter import OffsetTextSplitter
+import random
+
+
+def make_text(lines: int = 400, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    words = [
+        "".join(rng.choices("abcdefghij", k=rng.randint(2, 9))) for _ in range(300)
+    ]
+    return "\n".join(
+        " ".join(rng.choices(words, k=rng.randint(1, 30))) for _ in range(lines)
+    )
+
+
+def test_chunks_cover_the_whole_text():
+    text = make_text()
+    splitter = OffsetTextSplitter(120, overlap_size=30)
+
+    covered = set()
+    for start, end in splitter.compute_boundaries(text):
+        covered.update(range(start, end))
+
+    assert all(i in covered for i, char in enumerate(text) if not char.isspace())
+
+
+def test_overlap_starts_on_a_word_boundary():
+    text = make_text()
+    overlap_size = 30
+    splitter = OffsetTextSplitter(120, overlap_size=overlap_size)
+    boundaries = splitter.compute_boundaries(text)
+
+    for (_, previous_end), (start, end) in zip(boundaries, boundaries[1:]):
+        assert text[start - 1].isspace() and not text[start].isspace()
+        assert end == len(text) or text[end].isspace()
+        assert 0 < previous_end - start <= 2 * overlap_size
+
+
+def test_streamed_pages_split_like_the_joined_text():
+    text = make_text()
+    lines = text.split("\n")
+    pages = ["\n".join(lines[i : i + 7]) for i in range(0, len(lines), 7)]
+
+    for chunk_size, overlap_size, min_chunk_size in [(120, 30, 0), (500, 0, 200)]:
+        streaming = OffsetTextSplitter(chunk_size, overlap_size, min_chunk_size)
+        chunks = []
+        for page in pages:
+            chunks.extend(streaming.feed(page))
+        chunks.extend(streaming.flush())
+
+        one_shot = OffsetTextSplitter(chunk_size, overlap_size, min_chunk_size)
+        assert chunks == one_shot.split_text("\n".join(pages))